@@ -0,0 +1,73 @@
+"""
+Benchmark of the numeric backends (CalcHandler(backend=...)) on the same corpora, through the whole calculator and
+in the evaluator alone on token streams and postfix lists that were converted once
+run with: python -m Benchmarks.Backends_bench
+"""
+from ErrorParts.ErrorHandler import ErrorHandler
+from CalcHandler import CalcHandler
+from CalcParts.Tokenizer import Tokenizer
+from CalcParts.Converter import Converter
+from CalcParts.Evaluator import Evaluator
+from CalcParts.NumericBackends import NumericBackend
+from Benchmarks.BenchUtils import build_corpus, best_time
+from Benchmarks.ExpressionGenerator import ExpressionGenerator
+
+
+def convert_corpus(corpus: list) -> list:
+    """
+    Func that converts every valid expression of the corpus once
+    :param corpus:
+    :return: list of (token stream, postfix list, max depth)
+    """
+    error_handler = ErrorHandler()
+    tokenizer = Tokenizer(error_handler)
+    converter = Converter(error_handler)
+    converted = []
+    for expression in corpus:
+        error_handler.clear_errors()
+        tokenizer.clear_tokenizer()
+        converter.clear_converter()
+        try:
+            tokenizer.tokenize_expression(expression)
+            converter.convert(tokenizer.get_token_stream())
+        except StopIteration:
+            continue
+        converted.append((tokenizer.get_token_stream().copy(), converter.get_post_fix()[:], converter.get_max_depth()))
+    return converted
+
+
+def main():
+    int_generator = ExpressionGenerator(0, op_mix={'+': 3, '-': 3, '*': 3, '%': 1, '$': 1, '&': 1, '!': 1, '#': 1},
+                                        paren_ratio=0.2, decimal_ratio=0)
+    corpora = {
+        "templates": build_corpus(5000),
+        "20 ops": ExpressionGenerator(0, paren_ratio=0.2).build_corpus(2000, 20),
+        "int only 20 ops": int_generator.build_corpus(2000, 20),
+        "200 ops": ExpressionGenerator(0, paren_ratio=0.2).build_corpus(200, 200, max_depth=8),
+    }
+    for name, corpus in corpora.items():
+        converted = convert_corpus(corpus)
+        line = f"{name}:"
+        for backend in NumericBackend.NAMES:
+            calc_handler = CalcHandler(cache_size=0, backend=backend)
+            total = best_time(lambda: [calc_handler.run_single_exp(expression) for expression in corpus])
+            error_handler = ErrorHandler()
+            evaluator = Evaluator(error_handler, NumericBackend.create(backend))
+
+            def evaluate():
+                for token_stream, post_fix, max_depth in converted:
+                    error_handler.clear_errors()
+                    evaluator.clear_evaluator()
+                    try:
+                        evaluator.eval(token_stream, post_fix, max_depth)
+                        evaluator.get_final()
+                    except StopIteration:
+                        pass
+
+            eval_time = best_time(evaluate)
+            line += f" {backend} {total / len(corpus) * 1e6:.1f} us/exp (eval {eval_time / len(corpus) * 1e6:.1f}),"
+        print(line.rstrip(','))
+
+
+if __name__ == '__main__':
+    main()
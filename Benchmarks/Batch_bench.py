@@ -0,0 +1,49 @@
+"""
+Throughput benchmark of CalcHandler.evaluate_many against a loop over run_single_exp
+run with: python -m Benchmarks.Batch_bench
+"""
+import tracemalloc
+from CalcHandler import CalcHandler
+from Benchmarks.BenchUtils import build_corpus, best_time
+
+
+def run_single_loop(calc_handler: CalcHandler, corpus: list):
+    for input_exp in corpus:
+        calc_handler.run_single_exp(input_exp)
+
+
+def run_evaluate_many(calc_handler: CalcHandler, corpus: list):
+    for _ in calc_handler.evaluate_many(iter(corpus)):
+        pass
+
+
+def streaming_peak_memory(size: int) -> int:
+    """
+    Func that streams a lazily created corpus through evaluate_many and returns the peak traced memory
+    :param size:
+    :return: peak memory in bytes
+    """
+    calc_handler = CalcHandler()
+    tracemalloc.start()
+    for _ in calc_handler.evaluate_many(f"{index % 997}*2+3/4-5" for index in range(size)):
+        pass
+    peak = tracemalloc.get_traced_memory()[1]
+    tracemalloc.stop()
+    return peak
+
+
+def main(size: int = 20000):
+    corpus = build_corpus(size)
+    for cache_size in (0, 128):
+        calc_handler = CalcHandler(cache_size=cache_size)
+        loop_time = best_time(lambda: run_single_loop(calc_handler, corpus))
+        many_time = best_time(lambda: run_evaluate_many(calc_handler, corpus))
+        print(f"cache_size={cache_size}: run_single_exp loop {size / loop_time:,.0f} exp/s, "
+              f"evaluate_many {size / many_time:,.0f} exp/s, speedup {loop_time / many_time:.2f}x")
+    for stream_size in (size, size * 10):
+        print(f"evaluate_many peak memory over {stream_size:,} streamed expressions: "
+              f"{streaming_peak_memory(stream_size) / 1024:,.1f} KiB")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,35 @@
+import time
+
+# expression templates that are filled with a running number so the result cache doesn't hide the work
+EXPRESSION_TEMPLATES = (
+    "(({n}+1*3^-2)$8*9!+~--3)%3@2",
+    "(91#*21^3---2!+{n})@1/19",
+    "((12#-3!)$23)^(2*{n}+~26)%3",
+    "((5!+6^3)@((7%2)$9))#-~3^2+{n}",
+    "{n}*2+3/4-5",
+)
+
+
+def build_corpus(size: int) -> list:
+    """
+    Func that creates a list of different valid expressions
+    :param size:
+    :return: list of expression strings
+    """
+    return [EXPRESSION_TEMPLATES[index % len(EXPRESSION_TEMPLATES)].format(n=index % 997)
+            for index in range(size)]
+
+
+def best_time(func, repeat: int = 3) -> float:
+    """
+    Func that runs a function a few times and returns the fastest run
+    :param func:
+    :param repeat:
+    :return: the fastest run time in seconds
+    """
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        func()
+        best = min(best, time.perf_counter() - start)
+    return best
@@ -0,0 +1,59 @@
+"""
+Benchmark of the batch mode of main.py against piping the same expressions into the interactive loop
+run with: python -m Benchmarks.Cli_bench [size]
+"""
+import os
+import subprocess
+import sys
+import tempfile
+import time
+from Benchmarks.BenchUtils import build_corpus
+
+MAIN_PATH = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "main.py")
+
+
+def time_command(args: list, input_path: str) -> float:
+    """
+    Func that runs main.py with the input file as its stdin and its stdout thrown away
+    :param args: the args of main.py
+    :param input_path:
+    :return: the run time in seconds
+    """
+    with open(input_path) as input_file:
+        start = time.perf_counter()
+        subprocess.run([sys.executable, MAIN_PATH] + args, stdin=input_file, stdout=subprocess.DEVNULL, check=True)
+        return time.perf_counter() - start
+
+
+def write_input(input_path: str, expressions):
+    """
+    Func that writes the input file of main.py, every tenth expression is made invalid so errors are also written
+    :param input_path:
+    :param expressions:
+    """
+    with open(input_path, 'w') as input_file:
+        for index, input_exp in enumerate(expressions):
+            input_file.write(input_exp + ("+" if index % 10 == 0 else "") + "\n")
+        input_file.write("exit\n")
+
+
+def main(size: int = 100000):
+    corpora = {
+        # a few thousand different expressions that repeat, like most bulk input
+        "repeating": build_corpus(size),
+        # every expression is different so the result cache can't help
+        "unique": (f"{index}*2+3/4-5" for index in range(size)),
+    }
+    with tempfile.TemporaryDirectory() as temp_dir:
+        input_path = os.path.join(temp_dir, "expressions.txt")
+        for name, corpus in corpora.items():
+            write_input(input_path, corpus)
+            repl_time = time_command([], input_path)
+            print(f"{name} interactive loop: {repl_time:.2f}s, {size / repl_time:,.0f} exp/s")
+            for args in (["--batch"], ["--batch", "--format", "tsv"], ["--batch", input_path, "--fail-fast"]):
+                batch_time = time_command(args, input_path)
+                print(f"{name} {' '.join(args).replace(input_path, 'FILE')}: {batch_time:.2f}s, "
+                      f"{size / batch_time:,.0f} exp/s, x{repl_time / batch_time:.1f} faster")
+
+if __name__ == '__main__':
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else 100000)
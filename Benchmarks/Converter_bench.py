@@ -0,0 +1,36 @@
+"""
+Scaling benchmark of the Converter for depth, length and operator density up to 100k
+run with: python -m Benchmarks.Converter_bench
+"""
+from ErrorParts.ErrorHandler import ErrorHandler
+from CalcParts.Tokenizer import Tokenizer
+from CalcParts.Converter import Converter
+from Benchmarks.BenchUtils import best_time
+
+SHAPES = {
+    "depth": lambda size: "(" * size + "1" + ")" * size,
+    "length": lambda size: "1+" * size + "1",
+    "density": lambda size: "1*" + "-" * size + "1",
+}
+
+
+def main():
+    error_handler = ErrorHandler()
+    tokenizer = Tokenizer(error_handler)
+    converter = Converter(error_handler)
+    for shape, build_expression in SHAPES.items():
+        for size in (1000, 10000, 100000):
+            tokenizer.clear_tokenizer()
+            tokenizer.tokenize_expression(build_expression(size))
+            tokens = tokenizer.get_token_stream()
+
+            def convert():
+                converter.clear_converter()
+                converter.convert(tokens)
+
+            run_time = best_time(convert)
+            print(f"{shape}={size:>7,}: {run_time:.4f}s, {run_time / len(tokens) * 1e9:.0f} ns/token")
+
+
+if __name__ == '__main__':
+    main()
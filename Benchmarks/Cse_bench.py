@@ -0,0 +1,71 @@
+"""
+Benchmark of the common subexpression elimination of the prepared expressions on corpora with a growing amount of
+repeated subterms, and on the regular corpus that has almost no repetition. The postfix evaluator (every copy of a
+subterm is evaluated) is timed against the DAG evaluator and the compiled DAG (every subterm is evaluated once)
+run with: python -m Benchmarks.Cse_bench
+"""
+from array import array
+from CalcHandler import CalcHandler
+from CalcParts.ExpressionDag import ExpressionDag
+from Benchmarks.BenchUtils import build_corpus, best_time
+from Benchmarks.ExpressionGenerator import ExpressionGenerator
+
+
+def build_repeated_corpus(size: int, copies: int, length: int, seed: int = 0) -> list:
+    """
+    Func that creates expressions that use the same generated subterm many times, ie (big)^2+(big)*3
+    :param size: amount of expressions
+    :param copies: amount of copies of the subterm in every expression
+    :param length: amount of operators in the subterm
+    :param seed:
+    :return: list of expression strings
+    """
+    generator = ExpressionGenerator(seed, op_mix={'+': 3, '-': 3, '*': 3, '/': 1, '@': 1, '$': 1, '&': 1, '#': 1})
+    corpus = []
+    for _ in range(size):
+        sub_term = generator.generate(length)
+        corpus.append("+".join(f"({sub_term})*{num}" for num in range(copies)))
+    return corpus
+
+
+def main():
+    corpora = {
+        "no repetition": build_corpus(2000),
+        "2 copies of 20 ops": build_repeated_corpus(500, 2, 20),
+        "4 copies of 20 ops": build_repeated_corpus(500, 4, 20),
+        "16 copies of 20 ops": build_repeated_corpus(200, 16, 20),
+        "8 copies of 100 ops": build_repeated_corpus(100, 8, 100),
+    }
+    calc_handler = CalcHandler(cache_size=0)
+    for name, corpus in corpora.items():
+        prepared = [calc_handler.prepare(exp) for exp in corpus]
+        # the parts of the prepared expressions are timed directly so only the evaluation is measured
+        parts = [(expression._token_stream, expression._post_fix, expression._max_depth, expression._evaluator)
+                 for expression in prepared]
+
+        def eval_post_fix():
+            for token_stream, post_fix, max_depth, evaluator in parts:
+                evaluator.clear_evaluator()
+                try:
+                    evaluator.eval(token_stream, post_fix, max_depth)
+                except StopIteration:
+                    pass
+
+        post_fix_time = best_time(eval_post_fix)
+        build_time = best_time(lambda: [ExpressionDag.build(token_stream, post_fix)
+                                        for token_stream, post_fix, _, _ in parts])
+        dag_time = best_time(lambda: [expression._interpret() for expression in prepared])
+        for expression in prepared:
+            expression.evaluate()
+            expression.evaluate()
+        compiled_time = best_time(lambda: [expression.evaluate() for expression in prepared])
+        nodes = sum(len(expression._dag) for expression in prepared)
+        items = sum(len(array('i', post_fix)) for _, post_fix, _, _ in parts)
+        print(f"{name}: {nodes / items:.0%} of the postfix items are unique, postfix eval "
+              f"{post_fix_time / len(corpus) * 1e6:.1f} us/exp, DAG build {build_time / len(corpus) * 1e6:.1f} "
+              f"us/exp, DAG eval {dag_time / len(corpus) * 1e6:.1f} us/exp (x{post_fix_time / dag_time:.2f}), "
+              f"compiled DAG {compiled_time / len(corpus) * 1e6:.1f} us/exp")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,242 @@
+import random
+from CalcParts.Operators import OpData, IUnaryOperator, ILeftSidedOp
+
+
+class ExpressionGenerator:
+    """
+    Seeded random expression generator that is driven by the operator data.
+    The expressions are generated as a tree of operators, every operator is written by its placement (left / right /
+    mid) and parentheses are only added where the precedence of the operators needs them, so a generated expression
+    always has the meaning of the generated tree.
+    The length of an expression is the amount of operators in it and the depth is the max nesting of parentheses,
+    an invalid expression is a valid one with a single mutation that always makes the tokenizer or converter fail
+    """
+    # the mutations that make a valid expression invalid
+    MUTATIONS = ("drop_number", "double_op", "drop_paren", "invalid_char", "bad_number", "empty_paren")
+
+    def __init__(self, seed: int = 0, op_mix: dict = None, paren_ratio: float = 0.0, decimal_ratio: float = 0.2):
+        """
+        :param seed:
+        :param op_mix: dict of op key to its weight, ie {'+': 3, '!': 1}, the default is all the ops with the same
+        weight
+        :param paren_ratio: chance to wrap a sub expression in parentheses that aren't needed, used for deep corpora
+        :param decimal_ratio: chance of a number to have a decimal part
+        """
+        self._random = random.Random(seed)
+        if op_mix is None:
+            op_mix = {op_key: 1 for op_key in OpData.get_op_keys()}
+        self._ops = []
+        self._weights = []
+        for op_key, weight in op_mix.items():
+            if weight > 0:
+                self._ops.append((op_key, OpData.get_op_class(op_key)))
+                self._weights.append(weight)
+        self._paren_ratio = paren_ratio
+        self._decimal_ratio = decimal_ratio
+
+    def generate(self, length: int, max_depth: int = 3) -> str:
+        """
+        Func that generates a valid expression
+        :param length: the amount of operators, it can have less operators if max_depth doesn't leave room for them
+        :param max_depth: max nesting of parentheses
+        :return: expression string
+        """
+        return self.generate_with_value(length, max_depth)[0]
+
+    def generate_with_value(self, length: int, max_depth: int = 3) -> tuple:
+        """
+        Func that generates a valid expression and the value of its tree
+        :param length:
+        :param max_depth:
+        :return: (expression, value), the value is None if the evaluation of the tree fails
+        """
+        text, value, used, kind, precedence, nesting = self._generate_node(length, "root", 0, 0, max_depth)
+        # the root takes the rest of the operators with mid ops that don't need parentheses around the root
+        while used < length:
+            candidates = [(op_key, op) for op_key, op in self._get_mid_ops()
+                          if not self._needs_parens("left", kind, precedence, op.get_precedence())]
+            if not candidates:
+                if not self._get_mid_ops() or nesting >= max_depth:
+                    break
+                # the root needs parentheses to be the left operand of a mid op
+                text, kind, precedence, nesting = '(' + text + ')', "paren", None, nesting + 1
+                continue
+            op_key, op = self._random.choice(candidates)
+            right = self._generate_node(length - used - 1, "right", op.get_precedence(), 0, max_depth)
+            text = text + op_key + right[0]
+            value = self._apply(op, value, right[1])
+            used += 1 + right[2]
+            kind, precedence, nesting = "mid", op.get_precedence(), max(nesting, right[5])
+        return text, value
+
+    def generate_invalid(self, length: int, max_depth: int = 3) -> str:
+        """
+        Func that generates an invalid expression, a valid expression with a single random mutation
+        :param length:
+        :param max_depth:
+        :return: expression string
+        """
+        expression = self.generate(length, max_depth)
+        mutation = self._random.choice(self.MUTATIONS)
+        if mutation == "drop_paren" and '(' not in expression:
+            mutation = "invalid_char"
+        if mutation == "drop_number":
+            numbers = []
+            start = 0
+            while start < len(expression):
+                end = start
+                while end < len(expression) and (expression[end].isdigit() or expression[end] == '.'):
+                    end += 1
+                # a minus after the dropped number would become a unary minus and keep the expression valid
+                if end > start and not expression.startswith('-', end):
+                    numbers.append((start, end))
+                start = max(end, start + 1)
+            start, end = self._random.choice(numbers)
+            return expression[:start] + expression[end:]
+        if mutation == "drop_paren":
+            index = self._random.choice([index for index, char in enumerate(expression) if char in "()"])
+            return expression[:index] + expression[index + 1:]
+        mid_ops = [op_key for op_key, _ in self._get_mid_ops() if op_key != '-'] or ['*']
+        insert = {
+            # a binary minus would become a unary minus so it isn't used to double an op
+            "double_op": self._random.choice(mid_ops) * 2,
+            "invalid_char": self._random.choice("abcxyz?"),
+            "bad_number": "1..2",
+            "empty_paren": "()",
+        }[mutation]
+        if mutation == "double_op":
+            # two mid ops between two numbers
+            return expression + insert + "1" if self._random.random() < 0.5 else "1" + insert + expression
+        index = self._random.randint(0, len(expression))
+        return expression[:index] + insert + expression[index:]
+
+    def build_corpus(self, size: int, length: int, max_depth: int = 3, invalid_ratio: float = 0.0) -> list:
+        """
+        Func that creates a list of expressions
+        :param size: amount of expressions
+        :param length: amount of operators in every expression
+        :param max_depth: max nesting of parentheses
+        :param invalid_ratio: the part of the expressions that are invalid
+        :return: list of expression strings
+        """
+        return [self.generate_invalid(length, max_depth) if self._random.random() < invalid_ratio
+                else self.generate(length, max_depth) for _ in range(size)]
+
+    def _generate_node(self, budget: int, position: str, parent_precedence: float, depth: int,
+                       max_depth: int) -> tuple:
+        """
+        Func that generates a sub expression in a position of its parent operator
+        :param budget: the max amount of operators in the sub expression
+        :param position: root, left / right operand of a mid op or operand of a left / right op
+        :param parent_precedence:
+        :param depth: the nesting of parentheses of the sub expression
+        :param max_depth:
+        :return: (text, value, used ops, kind, precedence, max nesting)
+        """
+        choice = None
+        if budget > 0:
+            candidates = []
+            weights = []
+            for (op_key, op), weight in zip(self._ops, self._weights):
+                kind = self._get_kind(op)
+                if depth >= max_depth and (budget > 1 and kind != "mid" or
+                                           self._needs_parens(position, kind, op.get_precedence(),
+                                                              parent_precedence)):
+                    # without room for parentheses a unary op can only take a number
+                    continue
+                candidates.append((op_key, op, kind))
+                weights.append(weight)
+            if candidates:
+                choice = self._random.choices(candidates, weights)[0]
+        if choice is None:
+            return self._generate_number()
+        op_key, op, kind = choice
+        precedence = op.get_precedence()
+        wrap = self._needs_parens(position, kind, precedence, parent_precedence) or \
+            (depth < max_depth and self._random.random() < self._paren_ratio)
+        inner_depth = depth + 1 if wrap else depth
+        if kind == "mid":
+            left = self._generate_node(self._random.randint(0, budget - 1), "left", precedence, inner_depth,
+                                       max_depth)
+            right = self._generate_node(budget - 1 - left[2], "right", precedence, inner_depth, max_depth)
+            text = left[0] + op_key + right[0]
+            value = self._apply(op, left[1], right[1])
+            used = 1 + left[2] + right[2]
+            nesting = max(left[5], right[5])
+        else:
+            operand = self._generate_node(budget - 1, kind + "_operand", precedence, inner_depth, max_depth)
+            # the U- key is written as a minus
+            text = '-' + operand[0] if kind == "left" and op_key == 'U-' else \
+                (op_key + operand[0] if kind == "left" else operand[0] + op_key)
+            value = self._apply(op, operand[1])
+            used = 1 + operand[2]
+            nesting = operand[5]
+        if wrap:
+            return '(' + text + ')', value, used, "paren", None, max(nesting, depth + 1)
+        return text, value, used, kind, precedence, max(nesting, depth)
+
+    def _generate_number(self) -> tuple:
+        """
+        Func that generates a non negative number literal
+        :return: (text, value, used ops, kind, precedence, max nesting)
+        """
+        text = str(self._random.randint(0, 99))
+        if self._random.random() < self._decimal_ratio:
+            text += '.' + str(self._random.randint(1, 9))
+        return text, float(text), 0, "number", None, 0
+
+    def _get_mid_ops(self) -> list:
+        """
+        :return: list of (op key, op class) of the mid ops in the op mix
+        """
+        return [(op_key, op) for op_key, op in self._ops if self._get_kind(op) == "mid"]
+
+    @staticmethod
+    def _get_kind(op) -> str:
+        """
+        :param op:
+        :return: the placement kind of an operator, left / right / mid
+        """
+        if not isinstance(op, IUnaryOperator):
+            return "mid"
+        return "left" if isinstance(op, ILeftSidedOp) else "right"
+
+    @staticmethod
+    def _needs_parens(position: str, kind: str, precedence: float, parent_precedence: float) -> bool:
+        """
+        Func that checks if a sub expression needs parentheses in a position of its parent, all the mid ops are
+        evaluated from left to right and a unary op only takes a number or parentheses as its operand (besides
+        a right op after another right op)
+        :param position:
+        :param kind: the kind of the top operator of the sub expression
+        :param precedence: the precedence of the top operator of the sub expression
+        :param parent_precedence:
+        :return: True if parentheses are needed
+        """
+        if position == "root" or kind in ("number", "paren"):
+            return False
+        if position == "left":
+            return kind == "left" or (kind == "mid" and precedence < parent_precedence)
+        if position == "right":
+            return kind == "mid" and precedence <= parent_precedence
+        if position == "right_operand":
+            return kind != "right"
+        # operand of a left op
+        return True
+
+    @staticmethod
+    def _apply(op, *operands):
+        """
+        Func that evaluates an operator of the tree the same way the evaluator does
+        :param op:
+        :param operands:
+        :return: the value, None if an operand is None or the operator fails
+        """
+        if None in operands:
+            return None
+        try:
+            if isinstance(op, IUnaryOperator):
+                return op.unary_evaluate(*operands)
+            return op.binary_evaluate(*operands)
+        except Exception:
+            return None
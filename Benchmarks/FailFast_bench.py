@@ -0,0 +1,45 @@
+"""
+Benchmark of the fail fast mode against the default collect all errors mode on error heavy corpora
+run with: python -m Benchmarks.FailFast_bench
+"""
+import random
+from CalcHandler import CalcHandler
+from Benchmarks.BenchUtils import build_corpus, best_time
+
+# pieces that are glued together at random to create garbage input
+GARBAGE_PIECES = ("1", "2.5", "(", ")", "+", "*", "-", "!", "~", "#", "^", "a", "1..2", " ")
+
+
+def build_garbage_corpus(size: int, length: int, seed: int = 0) -> list:
+    """
+    Func that creates a list of random expressions that are almost all invalid
+    :param size: amount of expressions
+    :param length: amount of pieces in every expression
+    :param seed:
+    :return: list of expression strings
+    """
+    rand = random.Random(seed)
+    return [''.join(rand.choice(GARBAGE_PIECES) for _ in range(length)) for _ in range(size)]
+
+
+def main():
+    corpora = {
+        "garbage 20 pieces": build_garbage_corpus(5000, 20),
+        "garbage 500 pieces": build_garbage_corpus(500, 500),
+        # a valid expression with a single error at the start
+        "early error": ["+" + expression * 20 for expression in build_corpus(500)],
+        "valid": build_corpus(5000),
+    }
+    # the cache is disabled so every expression goes through all the stages
+    collect_all_handler = CalcHandler(cache_size=0)
+    fail_fast_handler = CalcHandler(cache_size=0, fail_fast=True)
+    for name, corpus in corpora.items():
+        collect_all_time = best_time(lambda: [collect_all_handler.run_single_exp(exp) for exp in corpus])
+        fail_fast_time = best_time(lambda: [fail_fast_handler.run_single_exp(exp) for exp in corpus])
+        print(f"{name}: collect all {collect_all_time / len(corpus) * 1e6:.1f} us/exp, "
+              f"fail fast {fail_fast_time / len(corpus) * 1e6:.1f} us/exp, "
+              f"speedup x{collect_all_time / fail_fast_time:.2f}")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,34 @@
+"""
+Benchmark of an expression that is built term by term like in the interactive loop, every step appends a term and
+runs the whole expression again, with and without the incremental pipeline
+run with: python -m Benchmarks.Incremental_bench [terms]
+"""
+import sys
+from CalcHandler import CalcHandler
+from Benchmarks.BenchUtils import best_time
+
+
+def build_steps(terms: int) -> list:
+    expression = "(1"
+    steps = []
+    for num in range(2, terms + 2):
+        expression += f"+{num}*{num % 7}.5-({num}%3)^2"
+        steps.append(expression + ")")
+    return steps
+
+
+def main(terms: int = 400):
+    steps = build_steps(terms)
+    times = {}
+    for incremental in (False, True):
+        # the cache is disabled so every step goes through the stages
+        calc_handler = CalcHandler(cache_size=0, incremental=incremental)
+        times[incremental] = best_time(lambda: [calc_handler.run_single_exp(step) for step in steps])
+        last_time = best_time(lambda: (calc_handler.run_single_exp(steps[-2]), calc_handler.run_single_exp(steps[-1])))
+        print(f"incremental={incremental}: {terms} steps {times[incremental] * 1000:.1f} ms, "
+              f"last 2 steps ({len(steps[-1])} chars) {last_time * 1e6:.0f} us")
+    print(f"speedup x{times[False] / times[True]:.2f}")
+
+
+if __name__ == '__main__':
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else 400)
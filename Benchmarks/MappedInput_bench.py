@@ -0,0 +1,79 @@
+"""
+Benchmark of the memory mapped ingestion of a batch file against reading the same file as str lines, both the
+ingestion alone (read and tokenize) and the whole batch run are timed
+run with: python -m Benchmarks.MappedInput_bench [size]
+"""
+import io
+import os
+import sys
+import tempfile
+from Benchmarks.BenchUtils import build_corpus, best_time
+from CalcParts.BatchRunner import BatchRunner
+from CalcParts.MappedInput import MappedInput
+from CalcParts.Tokenizer import Tokenizer
+from ErrorParts.ErrorHandler import ErrorHandler
+
+
+def tokenize_lines(input_path: str):
+    """
+    Func that reads the file as str lines and tokenizes every line
+    :param input_path:
+    """
+    tokenizer = Tokenizer(ErrorHandler())
+    with open(input_path, encoding="utf-8", errors="replace") as input_file:
+        for input_exp in BatchRunner.read_expressions(input_file):
+            tokenizer.clear_tokenizer()
+            tokenizer.tokenize_expression(input_exp)
+
+
+def tokenize_mapped(input_path: str):
+    """
+    Func that maps the file and tokenizes every line as bytes
+    :param input_path:
+    """
+    tokenizer = Tokenizer(ErrorHandler())
+    with MappedInput(input_path) as mapped_input:
+        buffer = mapped_input.get_buffer()
+        start, end = 0, len(buffer)
+        while start < end:
+            line_end = buffer.find(b"\n", start, end)
+            tokenizer.clear_tokenizer()
+            tokenizer.tokenize_bytes(buffer[start:line_end])
+            start = line_end + 1
+
+
+def compare(name: str, lines_func, mapped_func, rounds: int = 5):
+    """
+    Func that times the str lines path against the mapped path in turns, so a noisy machine affects both the same way
+    :param name:
+    :param lines_func:
+    :param mapped_func:
+    :param rounds:
+    """
+    lines_time = mapped_time = float("inf")
+    for _ in range(rounds):
+        lines_time = min(lines_time, best_time(lines_func, 1))
+        mapped_time = min(mapped_time, best_time(mapped_func, 1))
+    print(f"{name} str lines: {lines_time:.2f}s, mapped: {mapped_time:.2f}s, x{lines_time / mapped_time:.2f} faster")
+
+
+def main(size: int = 200000):
+    with tempfile.TemporaryDirectory() as temp_dir:
+        input_path = os.path.join(temp_dir, "expressions.txt")
+        with open(input_path, 'w') as input_file:
+            input_file.writelines(input_exp + "\n" for input_exp in build_corpus(size))
+        print(f"{size} expressions, {os.path.getsize(input_path) / 1e6:.1f} MB")
+        compare("tokenize", lambda: tokenize_lines(input_path), lambda: tokenize_mapped(input_path))
+        for cache_size in (0, BatchRunner.DEFAULT_CACHE_SIZE):
+            batch_runner = BatchRunner(cache_size=cache_size)
+
+            def run_lines():
+                with open(input_path, encoding="utf-8", errors="replace") as input_file:
+                    batch_runner.run(input_file, io.StringIO())
+
+            compare(f"batch run cache_size={cache_size}", run_lines,
+                    lambda: batch_runner.run_file(input_path, io.StringIO()))
+
+
+if __name__ == '__main__':
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else 200000)
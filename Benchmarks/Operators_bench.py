@@ -0,0 +1,47 @@
+"""
+Per operator microbenchmarks, the kernel backed ops (! and #) are also compared to their plain implementations
+run with: python -m Benchmarks.Operators_bench
+"""
+import timeit
+from CalcParts.Operators import OpData, IUnaryOperator
+
+# operands for every op, the values are valid for the op
+OPERANDS = {
+    '+': (3.5, 2.0), '-': (3.5, 2.0), '*': (3.5, 2.0), '/': (3.5, 2.0), '^': (3.5, 2.0), '%': (17.0, 5.0),
+    '&': (3.5, 2.0), '$': (3.5, 2.0), '@': (3.5, 2.0), 'U-': (3.5,), '~': (3.5,), '!': (150.0,), '#': (123456.0,),
+}
+NUMBER = 200000
+
+
+def plain_factorial(num):
+    factorial = 1
+    for i in range(1, int(num + 1)):
+        factorial = factorial * i
+    return factorial
+
+
+def plain_digit_sum(num):
+    output = 0
+    for char in str(num).split('e')[0]:
+        if char.isdigit():
+            output = output + int(char)
+    return output
+
+
+def time_per_call(func, args) -> float:
+    """
+    :return: the best time of a single call in ns
+    """
+    return min(timeit.repeat(lambda: func(*args), number=NUMBER, repeat=3)) / NUMBER * 1e9
+
+
+def main():
+    for op_key, op_class in OpData.get_op_classes():
+        func = op_class.unary_evaluate if isinstance(op_class, IUnaryOperator) else op_class.binary_evaluate
+        print(f"{op_key:>2} {OPERANDS[op_key]}: {time_per_call(func, OPERANDS[op_key]):.0f} ns")
+    print(f"plain ! (150.0,): {time_per_call(plain_factorial, OPERANDS['!']):.0f} ns")
+    print(f"plain # (123456.0,): {time_per_call(plain_digit_sum, OPERANDS['#']):.0f} ns")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,34 @@
+"""
+Scaling benchmark of the ParallelExecutor over 1..N worker processes
+run with: python -m Benchmarks.Parallel_bench [max_workers]
+"""
+import multiprocessing
+import sys
+import time
+from CalcHandler import CalcHandler
+from CalcParts.ParallelExecutor import ParallelExecutor
+from Benchmarks.BenchUtils import build_corpus
+
+
+def main(max_workers: int = None, size: int = 200000):
+    max_workers = max_workers or multiprocessing.cpu_count()
+    corpus = build_corpus(size)
+    calc_handler = CalcHandler(cache_size=0)
+    start = time.perf_counter()
+    for _ in calc_handler.evaluate_many(corpus):
+        pass
+    base_time = time.perf_counter() - start
+    print(f"single process: {size / base_time:,.0f} exp/s")
+    for workers in range(1, max_workers + 1):
+        with ParallelExecutor(workers=workers, chunk_size=2000, cache_size=0) as executor:
+            # warm up the workers before timing
+            list(executor.map(corpus[:workers * 2000]))
+            start = time.perf_counter()
+            for _ in executor.map(corpus):
+                pass
+            run_time = time.perf_counter() - start
+        print(f"workers={workers}: {size / run_time:,.0f} exp/s, speedup {base_time / run_time:.2f}x")
+
+
+if __name__ == '__main__':
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else None)
@@ -0,0 +1,52 @@
+"""
+Benchmark of the two front ends, the shunting yard Converter and the PrattParser, on the same token streams and
+through the whole calculator (CalcHandler(engine=...))
+run with: python -m Benchmarks.Pratt_bench
+"""
+from ErrorParts.ErrorHandler import ErrorHandler
+from CalcHandler import CalcHandler
+from CalcParts.Tokenizer import Tokenizer
+from CalcParts.Converter import Converter
+from CalcParts.PrattParser import PrattParser
+from Benchmarks.BenchUtils import build_corpus, best_time
+from Benchmarks.ExpressionGenerator import ExpressionGenerator
+
+
+def main():
+    generator = ExpressionGenerator(0, paren_ratio=0.2)
+    corpora = {
+        "short": build_corpus(5000),
+        "20 ops": generator.build_corpus(2000, 20),
+        "200 ops": generator.build_corpus(200, 200, max_depth=8),
+        "length 10000": ["1+" * 10000 + "1"],
+    }
+    error_handler = ErrorHandler()
+    tokenizer = Tokenizer(error_handler)
+    front_ends = {"shunting yard": Converter(error_handler), "pratt": PrattParser(error_handler)}
+    for name, corpus in corpora.items():
+        token_streams = []
+        for expression in corpus:
+            tokenizer.clear_tokenizer()
+            tokenizer.tokenize_expression(expression)
+            token_streams.append(tokenizer.get_token_stream().copy())
+        token_count = sum(len(token_stream) for token_stream in token_streams)
+        line = f"{name}:"
+        for front_end_name, front_end in front_ends.items():
+
+            def convert():
+                for token_stream in token_streams:
+                    front_end.clear_converter()
+                    front_end.convert(token_stream)
+
+            run_time = best_time(convert)
+            line += f" {front_end_name} {run_time / token_count * 1e9:.0f} ns/token,"
+        for engine in ("shunting_yard", "pratt"):
+            # the cache is disabled so every expression goes through all the stages
+            calc_handler = CalcHandler(cache_size=0, engine=engine)
+            run_time = best_time(lambda: [calc_handler.run_single_exp(expression) for expression in corpus])
+            line += f" {engine} calc {run_time / len(corpus) * 1e6:.1f} us/exp,"
+        print(line.rstrip(","))
+
+
+if __name__ == '__main__':
+    main()
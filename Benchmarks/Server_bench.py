@@ -0,0 +1,85 @@
+"""
+Load test of the json lines server, the server runs in its own process (python main.py --serve 0) and every client
+is a connection that sends its requests one after the other, or a few at once with --pipeline, the throughput and
+the latency percentiles are reported for every amount of concurrent clients
+run with: python -m Benchmarks.Server_bench [--requests 4000] [--concurrency 1 4 16 64] [--pipeline 1] [--workers 1]
+"""
+import argparse
+import asyncio
+import json
+import os
+import statistics
+import subprocess
+import sys
+import time
+from Benchmarks.BenchUtils import build_corpus
+
+MAIN_PATH = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "main.py")
+
+
+async def run_client(host: str, port: int, expressions: list, pipeline: int, latencies: list):
+    """
+    Func that sends the expressions on a single connection, pipeline requests are sent before waiting for their
+    responses
+    :param host:
+    :param port:
+    :param expressions:
+    :param pipeline: amount of requests that are sent at once
+    :param latencies: the latency of every request in seconds is added to it
+    """
+    reader, writer = await asyncio.open_connection(host, port)
+    for start in range(0, len(expressions), pipeline):
+        chunk = expressions[start:start + pipeline]
+        sent = time.perf_counter()
+        writer.write(''.join(json.dumps({"exp": input_exp}) + "\n" for input_exp in chunk).encode())
+        await writer.drain()
+        for _ in chunk:
+            await reader.readline()
+            latencies.append(time.perf_counter() - sent)
+    writer.close()
+    await writer.wait_closed()
+
+
+async def run_level(host: str, port: int, corpus: list, concurrency: int, pipeline: int) -> dict:
+    """
+    Func that runs the whole corpus split between concurrent clients
+    :param host:
+    :param port:
+    :param corpus:
+    :param concurrency: amount of clients
+    :param pipeline:
+    :return: dict with the throughput and the latency percentiles in milli seconds
+    """
+    latencies = []
+    start = time.perf_counter()
+    await asyncio.gather(*(run_client(host, port, corpus[index::concurrency], pipeline, latencies)
+                           for index in range(concurrency)))
+    run_time = time.perf_counter() - start
+    percentiles = statistics.quantiles(latencies, n=100)
+    return {"req_per_sec": len(latencies) / run_time, "p50_ms": percentiles[49] * 1e3,
+            "p99_ms": percentiles[98] * 1e3}
+
+
+def main():
+    parser = argparse.ArgumentParser(description="OmegaCalc server load test")
+    parser.add_argument("--requests", type=int, default=4000, help="amount of requests of every concurrency level")
+    parser.add_argument("--concurrency", type=int, nargs='+', default=[1, 4, 16, 64])
+    parser.add_argument("--pipeline", type=int, default=1, help="amount of requests a client sends at once")
+    parser.add_argument("--workers", type=int, default=1, help="amount of worker processes of the server")
+    args = parser.parse_args()
+    server = subprocess.Popen([sys.executable, MAIN_PATH, "--serve", "0", "--workers", str(args.workers)],
+                              stdout=subprocess.PIPE, text=True)
+    try:
+        host, port = server.stdout.readline().split()[-1].rsplit(':', 1)
+        corpus = build_corpus(args.requests)
+        for concurrency in args.concurrency:
+            stats = asyncio.run(run_level(host, int(port), corpus, concurrency, args.pipeline))
+            print(f"concurrency {concurrency}: {stats['req_per_sec']:,.0f} req/s, p50 {stats['p50_ms']:.2f} ms, "
+                  f"p99 {stats['p99_ms']:.2f} ms")
+    finally:
+        server.terminate()
+        server.wait()
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,56 @@
+"""
+Benchmark of the latency from starting the interpreter to the result of a single expression (main.py -e), against
+an interpreter that does nothing and one that only imports the calculator
+run with: python -m Benchmarks.Startup_bench [runs]
+"""
+import compileall
+import os
+import statistics
+import subprocess
+import sys
+import time
+
+ROOT_PATH = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+MAIN_PATH = os.path.join(ROOT_PATH, "main.py")
+
+COMMANDS = {
+    "bare interpreter": ["-c", "pass"],
+    "import CalcHandler": ["-c", "import CalcHandler"],
+    "main.py -e 2+3*4": [MAIN_PATH, "-e", "2+3*4"],
+    "main.py -e 200! --backend exact": [MAIN_PATH, "-e", "200!", "--backend", "exact"],
+    "main.py -e 1/0": [MAIN_PATH, "-e", "1/0"],
+}
+
+
+def time_command(args: list, runs: int) -> list:
+    """
+    Func that runs a new interpreter with the args a few times
+    :param args: the args of the interpreter
+    :param runs:
+    :return: the run time of every run in seconds
+    """
+    env = dict(os.environ, PYTHONPATH=ROOT_PATH)
+    times = []
+    for _ in range(runs):
+        start = time.perf_counter()
+        subprocess.run([sys.executable] + args, env=env, cwd=ROOT_PATH, stdout=subprocess.DEVNULL,
+                       stderr=subprocess.DEVNULL)
+        times.append(time.perf_counter() - start)
+    return times
+
+
+def main(runs: int = 30):
+    # the runs load the compiled files instead of compiling the sources
+    compileall.compile_dir(ROOT_PATH, quiet=1)
+    bare_time = None
+    for name, args in COMMANDS.items():
+        times = time_command(args, runs)
+        best = min(times)
+        if bare_time is None:
+            bare_time = best
+        print(f"{name}: best {best * 1e3:.1f} ms, median {statistics.median(times) * 1e3:.1f} ms, "
+              f"+{(best - bare_time) * 1e3:.1f} ms over the bare interpreter")
+
+
+if __name__ == '__main__':
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else 30)
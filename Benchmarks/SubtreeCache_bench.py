@@ -0,0 +1,47 @@
+"""
+Benchmark of the subtree cache on traffic where many different expressions share big groups, ie the same
+(12#-3!)$23 with different suffixes, the whole expression cache misses all of them
+run with: python -m Benchmarks.SubtreeCache_bench
+"""
+import random
+from CalcHandler import CalcHandler
+from Benchmarks.BenchUtils import build_corpus, best_time
+from Benchmarks.ExpressionGenerator import ExpressionGenerator
+
+
+def build_shared_corpus(size: int, shared_count: int, length: int, seed: int = 0) -> list:
+    """
+    Func that creates different expressions that start with one of a few shared groups
+    :param size: amount of expressions
+    :param shared_count: amount of different shared groups
+    :param length: amount of operators in every shared group
+    :param seed:
+    :return: list of expression strings
+    """
+    generator = ExpressionGenerator(seed, op_mix={'+': 3, '-': 3, '*': 3, '/': 1, '@': 1, '$': 1, '&': 1})
+    rand = random.Random(seed)
+    shared = [f"({generator.generate(length)})" for _ in range(shared_count)]
+    return [f"{rand.choice(shared)}*{num}+{generator.generate(2)}" for num in range(size)]
+
+
+def main():
+    corpora = {
+        "templates": build_corpus(5000),
+        "10 groups of 10 ops": build_shared_corpus(5000, 10, 10),
+        "100 groups of 30 ops": build_shared_corpus(2000, 100, 30),
+        "1000 groups of 30 ops": build_shared_corpus(2000, 1000, 30),
+        "no shared groups": build_shared_corpus(2000, 2000000, 10),
+    }
+    for name, corpus in corpora.items():
+        times = []
+        for subtree_cache_size in (0, 4096):
+            calc_handler = CalcHandler(subtree_cache_size=subtree_cache_size)
+            # the first run fills the caches, the expressions are all different so the result cache never hits
+            times.append(best_time(lambda: [calc_handler.run_single_exp(expression) for expression in corpus]))
+        stats = calc_handler.get_subtree_cache_stats()
+        print(f"{name}: {times[0] / len(corpus) * 1e6:.1f} -> {times[1] / len(corpus) * 1e6:.1f} us/exp "
+              f"(x{times[0] / times[1]:.2f}), subtree cache hit rate {stats['hit_rate']:.0%}")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,137 @@
+"""
+Benchmark suite that times every stage (tokenize / convert / eval) and the end to end run_single_exp on generated
+corpora, the report is printed (or saved) as json with the ops/sec and the latency percentiles of every stage
+run with: python -m Benchmarks.Suite_bench [--size 2000] [--seed 0] [--output report.json]
+"""
+import argparse
+import json
+import platform
+import statistics
+import time
+from CalcHandler import CalcHandler
+from ErrorParts.ErrorHandler import ErrorHandler
+from CalcParts.Tokenizer import Tokenizer
+from CalcParts.Converter import Converter
+from CalcParts.Evaluator import Evaluator
+from Benchmarks.ExpressionGenerator import ExpressionGenerator
+
+# every corpus is generated with its own generator args and corpus args
+CORPORA = {
+    "short": ({}, {"length": 5, "max_depth": 2}),
+    "long": ({}, {"length": 200, "max_depth": 3}),
+    "deep": ({"paren_ratio": 0.8}, {"length": 60, "max_depth": 30}),
+    "arithmetic": ({"op_mix": {'+': 1, '-': 1, '*': 1, '/': 1}}, {"length": 20, "max_depth": 3}),
+    "unary_heavy": ({"op_mix": {'+': 1, 'U-': 2, '~': 2, '!': 1, '#': 2}}, {"length": 20, "max_depth": 3}),
+    "mixed_invalid": ({}, {"length": 20, "max_depth": 3, "invalid_ratio": 0.3}),
+    "invalid": ({}, {"length": 20, "max_depth": 3, "invalid_ratio": 1.0}),
+}
+STAGES = ("tokenize", "convert", "eval", "run_single_exp")
+
+
+def summarize(times_ns: list) -> dict:
+    """
+    Func that creates the report of a single stage
+    :param times_ns: the run time of every expression that reached the stage
+    :return: dict with the count, ops/sec, mean and percentiles in micro seconds
+    """
+    if not times_ns:
+        return {"count": 0}
+    total = sum(times_ns)
+    percentiles = statistics.quantiles(times_ns, n=100) if len(times_ns) > 1 else [times_ns[0]] * 99
+    return {
+        "count": len(times_ns),
+        "ops_per_sec": round(len(times_ns) / total * 1e9, 1) if total else None,
+        "mean_us": round(total / len(times_ns) / 1e3, 3),
+        "p50_us": round(percentiles[49] / 1e3, 3),
+        "p90_us": round(percentiles[89] / 1e3, 3),
+        "p99_us": round(percentiles[98] / 1e3, 3),
+        "max_us": round(max(times_ns) / 1e3, 3),
+    }
+
+
+def time_stages(corpus: list) -> dict:
+    """
+    Func that times every stage for every expression, a stage that fails is still timed but the expression doesn't
+    reach the next stages
+    :param corpus:
+    :return: dict of stage name to list of run times in nano seconds
+    """
+    error_handler = ErrorHandler()
+    tokenizer = Tokenizer(error_handler)
+    converter = Converter(error_handler)
+    evaluator = Evaluator(error_handler)
+
+    def convert(_):
+        converter.convert(tokenizer.get_token_stream())
+
+    def evaluate(_):
+        evaluator.eval(tokenizer.get_token_stream(), converter.get_post_fix(), converter.get_max_depth())
+        evaluator.get_final()
+
+    stage_funcs = (("tokenize", tokenizer.tokenize_expression), ("convert", convert), ("eval", evaluate))
+    times = {stage: [] for stage in STAGES}
+    perf_counter_ns = time.perf_counter_ns
+    for input_exp in corpus:
+        tokenizer.clear_tokenizer()
+        error_handler.clear_errors()
+        converter.clear_converter()
+        evaluator.clear_evaluator()
+        for stage, stage_func in stage_funcs:
+            start = perf_counter_ns()
+            try:
+                stage_func(input_exp)
+            except StopIteration:
+                times[stage].append(perf_counter_ns() - start)
+                break
+            times[stage].append(perf_counter_ns() - start)
+    # the cache is disabled so every expression goes through all the stages
+    calc_handler = CalcHandler(cache_size=0)
+    for input_exp in corpus:
+        start = perf_counter_ns()
+        calc_handler.run_single_exp(input_exp)
+        times["run_single_exp"].append(perf_counter_ns() - start)
+    return times
+
+
+def run_suite(size: int, seed: int) -> dict:
+    """
+    Func that generates all the corpora and times them
+    :param size: amount of expressions in every corpus
+    :param seed:
+    :return: the report dict
+    """
+    report = {
+        "python": platform.python_version(),
+        "implementation": platform.python_implementation(),
+        "size": size,
+        "seed": seed,
+        "corpora": {},
+    }
+    for name, (generator_args, corpus_args) in CORPORA.items():
+        corpus = ExpressionGenerator(seed, **generator_args).build_corpus(size, **corpus_args)
+        times = time_stages(corpus)
+        report["corpora"][name] = {
+            "generator": generator_args,
+            "corpus": corpus_args,
+            "chars_mean": round(sum(map(len, corpus)) / len(corpus), 1),
+            "stages": {stage: summarize(times[stage]) for stage in STAGES},
+        }
+    return report
+
+
+def main():
+    parser = argparse.ArgumentParser(description="OmegaCalc benchmark suite")
+    parser.add_argument("--size", type=int, default=2000, help="amount of expressions in every corpus")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--output", help="path of the json report, the report is printed if it isn't passed")
+    args = parser.parse_args()
+    report = json.dumps(run_suite(args.size, args.seed), indent=2)
+    if args.output:
+        with open(args.output, "w") as output_file:
+            output_file.write(report + "\n")
+    else:
+        print(report)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,28 @@
+"""
+Scaling benchmark of a single CalcHandler that is shared by a pool of threads, the same corpus is evaluated with a
+growing amount of threads. With the GIL the threads take turns so there is no speedup, on a free threaded python
+build (python3.13t and up) the threads run on different cores
+run with: python -m Benchmarks.Threads_bench [size]
+"""
+import os
+import sys
+from CalcParts.ParallelExecutor import ThreadExecutor
+from Benchmarks.BenchUtils import build_corpus, best_time
+
+
+def main(size: int = 100000):
+    corpus = build_corpus(size)
+    # sys._is_gil_enabled only exists from python 3.13
+    gil_enabled = getattr(sys, "_is_gil_enabled", lambda: True)()
+    print(f"python {sys.version.split()[0]}, gil {'enabled' if gil_enabled else 'disabled'}, {os.cpu_count()} cores")
+    base_time = None
+    for workers in (1, 2, 4, 8):
+        # the cache is disabled so every expression goes through the stages
+        with ThreadExecutor(workers, cache_size=0) as executor:
+            run_time = best_time(lambda: sum(1 for _ in executor.map(corpus)))
+        base_time = base_time or run_time
+        print(f"{workers} threads: {size / run_time:,.0f} exp/s, x{base_time / run_time:.2f}")
+
+
+if __name__ == '__main__':
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else 100000)
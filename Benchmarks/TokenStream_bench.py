@@ -0,0 +1,61 @@
+"""
+Memory and time benchmark of the token stream, measures the peak memory of tokenizing a long expression and the
+allocations of a full run of a single short expression.
+The numbers of the old Token object list are shown next to it by building a Token for every token of the stream
+run with: python -m Benchmarks.TokenStream_bench
+"""
+import tracemalloc
+from CalcHandler import CalcHandler
+from ErrorParts.ErrorHandler import ErrorHandler
+from CalcParts.Tokenizer import Tokenizer
+from Benchmarks.BenchUtils import build_corpus, best_time
+from Benchmarks.Tokenizer_bench import build_expression
+
+
+def peak_memory(func) -> int:
+    """
+    Func that returns the peak amount of bytes allocated while running a function
+    :param func:
+    :return: peak bytes
+    """
+    tracemalloc.start()
+    func()
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return peak
+
+
+def main():
+    tokenizer = Tokenizer(ErrorHandler())
+    expression = build_expression(10 ** 6)
+
+    def tokenize():
+        tokenizer.clear_tokenizer()
+        tokenizer.tokenize_expression(expression)
+
+    tokenize()
+    token_amount = len(tokenizer.get_token_stream())
+    tokenizer.clear_tokenizer()
+    stream_peak = peak_memory(tokenize)
+    token_list_peak = peak_memory(tokenizer.get_tokens)
+    print(f"tokens={token_amount:,}")
+    print(f"token stream: {stream_peak / token_amount:.1f} bytes/token peak")
+    print(f"Token objects: {token_list_peak / token_amount:.1f} bytes/token peak")
+
+    # the arrays of the calc parts are reused so a warm run only allocates the final value and temporary floats
+    calc_handler = CalcHandler(cache_size=0)
+    corpus = build_corpus(10000)
+    for input_exp in corpus:
+        calc_handler.run_single_exp(input_exp)
+
+    def run_corpus():
+        for input_exp in corpus:
+            calc_handler.run_single_exp(input_exp)
+
+    print(f"warm run_single_exp of {len(corpus):,} expressions: {peak_memory(run_corpus):,} bytes peak")
+    run_time = best_time(run_corpus)
+    print(f"run_single_exp: {run_time / len(corpus) * 1e6:.2f} us/expression")
+
+
+if __name__ == '__main__':
+    main()
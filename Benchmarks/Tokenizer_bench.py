@@ -0,0 +1,47 @@
+"""
+Scaling benchmark of the Tokenizer on very long machine generated expressions, the time per char should stay flat.
+Every size is also timed with the garbage collector paused, because millions of live tokens make the python gc
+passes themselves grow with the size
+run with: python -m Benchmarks.Tokenizer_bench [max_chars]
+"""
+import gc
+import sys
+from ErrorParts.ErrorHandler import ErrorHandler
+from CalcParts.Tokenizer import Tokenizer
+from Benchmarks.BenchUtils import best_time
+
+# a piece of an expression with spaces, every size is made of copies of it
+EXPRESSION_PIECE = "(12.5 * 3 ^ 2 - ~4)@7! + "
+
+
+def build_expression(size: int) -> str:
+    """
+    Func that creates a valid expression with about size chars
+    :param size:
+    :return: expression string
+    """
+    return EXPRESSION_PIECE * (size // len(EXPRESSION_PIECE)) + "1"
+
+
+def main(max_chars: int = 10 ** 7):
+    tokenizer = Tokenizer(ErrorHandler())
+
+    def tokenize(expression):
+        tokenizer.clear_tokenizer()
+        tokenizer.tokenize_expression(expression)
+
+    size = 10 ** 3
+    while size <= max_chars:
+        expression = build_expression(size)
+        repeat = 3 if size < 10 ** 6 else 1
+        run_time = best_time(lambda: tokenize(expression), repeat)
+        gc.disable()
+        no_gc_time = best_time(lambda: tokenize(expression), repeat)
+        gc.enable()
+        print(f"chars={len(expression):>10,}: {run_time:.4f}s, {run_time / len(expression) * 1e9:.1f} ns/char, "
+              f"without gc {no_gc_time / len(expression) * 1e9:.1f} ns/char")
+        size *= 10
+
+
+if __name__ == '__main__':
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else 10 ** 7)
@@ -0,0 +1,31 @@
+"""
+Overhead benchmark of the stage tracing, the default handler without a tracer against a SamplingCollector that
+traces every expression and one that samples 1 of 100 expressions
+run with: python -m Benchmarks.Tracing_bench
+"""
+from CalcHandler import CalcHandler
+from CalcParts.Tracer import SamplingCollector
+from Benchmarks.BenchUtils import build_corpus, best_time
+
+
+def main(size: int = 20000):
+    corpus = build_corpus(size)
+    tracers = {
+        "no tracer": None,
+        "SamplingCollector(sample_every=100)": SamplingCollector(100),
+        "SamplingCollector(sample_every=1)": SamplingCollector(1),
+    }
+    # the cache is disabled so every expression goes through the stages
+    calc_handlers = {name: CalcHandler(cache_size=0, tracer=tracer) for name, tracer in tracers.items()}
+    best_times = dict.fromkeys(tracers, float("inf"))
+    # the tracers are timed in turns so a noisy machine affects all of them the same way
+    for _ in range(7):
+        for name, calc_handler in calc_handlers.items():
+            run_time = best_time(lambda: [calc_handler.run_single_exp(input_exp) for input_exp in corpus], 1)
+            best_times[name] = min(best_times[name], run_time)
+    base_time = best_times["no tracer"]
+    for name, run_time in best_times.items():
+        print(f"{name}: {run_time / size * 1e6:.2f} us/exp, overhead {(run_time / base_time - 1) * 100:+.1f}%")
+
+if __name__ == '__main__':
+    main()
@@ -1,20 +1,61 @@
-from CalcParts.Converter import Converter
-from ErrorParts.ErrorHandler import ErrorHandler
-from CalcParts.Tokenizer import Tokenizer
-from CalcParts.Evaluator import Evaluator
+from CalcParts.CostModel import EvalLimits
+from CalcParts.EvalPipeline import EvalPipeline
+from CalcParts.NumericBackends import NumericBackend
 from CalcParts.OutputHandler import OutputHandler
 
 
 class CalcHandler:
     """
-    This class runs the calc it is only created once in main and ran by using run_calc
+    This class runs the calc it is only created once in main and ran by using run_calc.
+    Every evaluation takes a pipeline (the calculator parts) from a pool and gives it back when it is done, so a
+    single handler can be used by many threads at once, a new pipeline is only created when all the pipelines in the
+    pool are in use.
+    The parts that not every handler uses (the caches, the incremental pipeline, the compiler and the tracers) are
+    only imported when they are used, so a handler for a single expression starts fast
     """
 
-    def __init__(self):
-        self._error_handler = ErrorHandler()
-        self._tokenizer = Tokenizer(self._error_handler)
-        self._converter = Converter(self._error_handler)
-        self._evaluator = Evaluator(self._error_handler)
+    def __init__(self, cache_size: int = 128, cache_max_bytes: int = None, compile_threshold: int = 2,
+                 fail_fast: bool = False, tracer=None, incremental: bool = False,
+                 engine: str = "shunting_yard", subtree_cache_size: int = 0, backend: str = "float",
+                 precision: int = 28, max_digits: float = None, max_operations: int = None,
+                 time_limit: float = None):
+        # in fail fast mode the calc stops at the first error of any stage and returns only that error
+        self._fail_fast = fail_fast
+        # the front end of the pipelines, see EvalPipeline.ENGINES
+        self._engine = engine
+        # the type of the values of all the pipelines, see NumericBackend.NAMES, the backends don't hold any state of
+        # an evaluation so a single backend is shared, the precision is the amount of digits of the decimal backend
+        self._backend = NumericBackend.create(backend, precision)
+        # the budget of the estimated digits of the values and the limits of every evaluation, see EvalLimits
+        self._limits = EvalLimits(max_digits, max_operations, time_limit) \
+            if (max_digits, max_operations, time_limit) != (None, None, None) else None
+        # cache of the values of the groups in parentheses that is shared by all the pipelines, None if the size is 0,
+        # it is only used with the float backend
+        self._subtree_cache = None
+        if subtree_cache_size != 0:
+            from CalcParts.SubtreeCache import SubtreeCache
+            self._subtree_cache = SubtreeCache(subtree_cache_size)
+        # the pipelines that aren't used right now, popping and appending to a list is thread safe
+        self._pipelines = [self._create_pipeline()]
+        # an edited expression reuses the work on the text it shares with the last expression, see IncrementalPipeline
+        # (only the shunting yard engine can be incremental)
+        self._incremental_pipeline = None
+        self._incremental_lock = None
+        if incremental:
+            import threading
+            from CalcParts.IncrementalPipeline import IncrementalPipeline
+            self._incremental_pipeline = IncrementalPipeline(fail_fast, self._backend, self._limits, engine,
+                                                             self._subtree_cache)
+            self._incremental_lock = threading.Lock()
+        # cache of whole expression outcomes, None if a size of 0 disables the cache
+        self._result_cache = None
+        if cache_size != 0 and cache_max_bytes != 0:
+            from CalcParts.ResultCache import ResultCache
+            self._result_cache = ResultCache(cache_size, cache_max_bytes)
+        # amount of evaluations before a prepared expression is compiled
+        self._compile_threshold = compile_threshold
+        # the StageTracer that gets the stage callbacks, None doesn't trace anything
+        self._tracer = tracer
 
     def run_calc(self):
         """
@@ -30,10 +71,14 @@ class CalcHandler:
                     break
                 elif input_exp.lower() == "op":
                     OutputHandler.output_op_data()
+                elif input_exp.lower() == "stats":
+                    OutputHandler.output_stage_stats(self.get_stage_stats())
                 else:
                     result, error_list = self.run_single_exp(input_exp)
                     if error_list:
-                        self._error_handler.show_errors()
+                        # show the returned errors, a cached outcome doesn't go through the error handler
+                        for error in error_list:
+                            OutputHandler.output_error(error)
                     else:
                         OutputHandler.output_data(result)
             except EOFError:
@@ -44,29 +89,191 @@ class CalcHandler:
                 print("\nThe program was forcefully closed, goodbye")
                 break
 
-    def run_single_exp(self, input_exp):
+    def run_single_exp(self, input_exp, fail_fast: bool = None):
         """
         This func runs a single expression through the calculator and returns the final result or the
         errors it encountered
+        :param input_exp: the expression string, or its encoded bytes (see Tokenizer.tokenize_bytes)
+        :param fail_fast: stop at the first error and return only it, None uses the mode of the handler
         :return: returns the final value or the errors the calc ran into
         """
-        # clear the prev values
-        self._clear_values()
+        if fail_fast is None:
+            fail_fast = self._fail_fast
+        if self._result_cache is None:
+            return self._run_stages(input_exp, fail_fast)
+        key = self._result_cache.normalize_key(input_exp, fail_fast)
+        cached = self._result_cache.get(key, input_exp)
+        if cached is not None:
+            # a cache hit skips all the stages and leaves the error handler untouched
+            return cached
+        result, errors = self._run_stages(input_exp, fail_fast)
+        self._result_cache.put(key, result, errors, input_exp)
+        return result, errors
+
+    def evaluate_many(self, expressions, fail_fast: bool = None):
+        """
+        Generator that lazily runs every expression of an iterable through the calculator, the same calculator parts
+        are reused for all the expressions so the memory use doesn't grow with the amount of expressions
+        :param expressions: any iterable of expression strings
+        :param fail_fast: stop at the first error of every expression, None uses the mode of the handler
+        :return: yields (index, result, error_list) for every expression, same values as run_single_exp
+        """
+        run_single_exp = self.run_single_exp
+        for index, input_exp in enumerate(expressions):
+            result, error_list = run_single_exp(input_exp, fail_fast)
+            yield index, result, error_list
+
+    def evaluate_buffer(self, buffer, start: int = 0, end: int = None, fail_fast: bool = None):
+        """
+        Generator that runs every line of a range of an encoded buffer through the calculator, ie a memory mapped
+        file. Every line is sliced out as bytes and tokenized without decoding it when it is ascii, lines are split on
+        line breaks only and the carriage return of a windows line break is dropped
+        :param buffer: bytes or mmap with an expression per line
+        :param start: the offset of the first line
+        :param end: the offset after the last line, defaults to the end of the buffer
+        :param fail_fast: stop at the first error of every expression, None uses the mode of the handler
+        :return: yields (index, result, error_list) for every line of the range, same values as run_single_exp
+        """
+        if end is None:
+            end = len(buffer)
+        run_single_exp = self.run_single_exp
+        find = buffer.find
+        index = 0
+        while start < end:
+            line_end = find(b"\n", start, end)
+            next_start = line_end + 1
+            if line_end == -1:
+                line_end = next_start = end
+            if line_end > start and buffer[line_end - 1] == 13:
+                line_end -= 1
+            result, error_list = run_single_exp(buffer[start:line_end], fail_fast)
+            yield index, result, error_list
+            index += 1
+            start = next_start
+
+    def evaluate_columns(self, input_exp, columns: dict):
+        """
+        This func evaluates an expression with named variables once over whole columns of values, it needs numpy
+        :param input_exp: expression that can use the names in columns as variables, ie a*b@c!
+        :param columns: dict of variable name to a numpy array (or any array like value)
+        :return: ((values, error_codes), None) where error_codes holds the error code of every element
+        (see VectorEvaluator.get_error_type), or (None, errors) if the expression itself is invalid
+        """
+        from CalcParts.VectorEvaluator import VectorEvaluator
+        vector_evaluator = VectorEvaluator()
+        pipeline = self._acquire_pipeline()
+        try:
+            errors = pipeline.convert(input_exp, columns.keys())
+            if errors is not None:
+                return None, errors
+            return vector_evaluator.eval(pipeline.get_token_stream(), pipeline.get_post_fix(), columns), None
+        finally:
+            self._pipelines.append(pipeline)
+
+    def prepare(self, input_exp):
+        """
+        This func runs the expression through the tokenizer and converter once so it can be evaluated again and again
+        :param input_exp:
+        :return: a PreparedExpression that holds the postfix list or the errors the calc ran into
+        """
+        from CalcParts.Compiler import PreparedExpression
+        pipeline = self._acquire_pipeline()
+        try:
+            errors = pipeline.convert(input_exp)
+            if errors is not None:
+                return PreparedExpression(None, None, 0, errors, self._compile_threshold, self._backend, self._limits)
+            # the prepared expression copies the token stream and the postfix list
+            return PreparedExpression(pipeline.get_token_stream(), pipeline.get_post_fix(), pipeline.get_max_depth(),
+                                      None, self._compile_threshold, self._backend, self._limits)
+        finally:
+            self._pipelines.append(pipeline)
+
+    def set_tracer(self, tracer):
+        """
+        Func that sets the StageTracer that gets the stage callbacks, None doesn't trace anything
+        :param tracer:
+        """
+        self._tracer = tracer
+
+    def get_tracer(self):
+        """
+        :return: the StageTracer of the handler, a NullTracer if the handler doesn't trace anything
+        """
+        if self._tracer is None:
+            from CalcParts.Tracer import NullTracer
+            return NullTracer()
+        return self._tracer
+
+    def get_stage_stats(self):
+        """
+        :return: the stage breakdown of the tracer if it is a SamplingCollector, else None
+        """
+        if self._tracer is None:
+            return None
+        from CalcParts.Tracer import SamplingCollector
+        if isinstance(self._tracer, SamplingCollector):
+            return self._tracer.get_stats()
+        return None
+
+    def get_cache_stats(self) -> dict:
+        """
+        :return: dict with the hit / miss / eviction counters of the result cache, all 0 if it is disabled
+        """
+        if self._result_cache is None:
+            from CalcParts.ResultCache import ResultCache
+            return ResultCache(0).get_stats()
+        return self._result_cache.get_stats()
+
+    def get_subtree_cache_stats(self) -> dict:
+        """
+        :return: dict with the hit / miss / eviction counters of the subtree cache, all 0 if it is disabled
+        """
+        if self._subtree_cache is None:
+            from CalcParts.SubtreeCache import SubtreeCache
+            return SubtreeCache(0).get_stats()
+        return self._subtree_cache.get_stats()
+
+    def clear_cache(self):
+        """
+        Func that removes all the cached expression outcomes and group values
+        """
+        if self._result_cache is not None:
+            self._result_cache.clear()
+        if self._subtree_cache is not None:
+            self._subtree_cache.clear()
+
+    def _run_stages(self, input_exp, fail_fast: bool):
+        """
+        Func that runs the expression through the tokenizer, converter and evaluator of a free pipeline
+        :param input_exp:
+        :param fail_fast:
+        :return: returns the final value or the errors the calc ran into
+        """
+        # the incremental pipeline only remembers a single expression, a call that runs while it is busy uses the pool
+        if self._incremental_pipeline is not None and isinstance(input_exp, str) and \
+                self._incremental_lock.acquire(blocking=False):
+            try:
+                return self._incremental_pipeline.run(input_exp, fail_fast, self._tracer)
+            finally:
+                self._incremental_lock.release()
+        pipeline = self._acquire_pipeline()
         try:
-            self._tokenizer.tokenize_expression(input_exp)
-            self._converter.convert(self._tokenizer.get_tokens())
-            self._evaluator.eval(self._converter.get_post_fix())
-            return self._evaluator.get_final(), None
-        except StopIteration:
-            # if we get a stopIteration then we had an error and we show all the errors
-            errors = self._error_handler.get_errors()
-            return None, errors
-
-    def _clear_values(self):
-        """
-        Func to clear all the old values in the calculator parts
-        """
-        self._tokenizer.clear_tokenizer()
-        self._error_handler.clear_errors()
-        self._converter.clear_converter()
-        self._evaluator.clear_evaluator()
+            return pipeline.run(input_exp, fail_fast, self._tracer)
+        finally:
+            self._pipelines.append(pipeline)
+
+    def _acquire_pipeline(self) -> EvalPipeline:
+        """
+        Func that takes a free pipeline from the pool, the caller must give it back by appending it to the pool
+        :return: a pipeline that no other call uses
+        """
+        try:
+            return self._pipelines.pop()
+        except IndexError:
+            return self._create_pipeline()
+
+    def _create_pipeline(self) -> EvalPipeline:
+        """
+        :return: a new pipeline with the settings of the handler
+        """
+        return EvalPipeline(self._fail_fast, self._engine, self._subtree_cache, self._backend, self._limits)
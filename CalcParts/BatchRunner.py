@@ -0,0 +1,133 @@
+import json
+from math import isfinite
+from CalcHandler import CalcHandler
+from CalcParts.MappedInput import MappedInput
+
+
+class BatchRunner:
+    """
+    Class that runs a stream of expressions, one per line, through the calculator without the interactive loop.
+    The input is read line by line and the results are written in a machine readable format in blocks of lines, so
+    neither the input nor the output is ever fully held in memory.
+    The formats are:
+    jsonl - a json object per line, {"line": 1, "value": 3} or {"line": 2, "errors": [{"type": ..., "msg": ...}]},
+    the values that json numbers can't hold are strings so every line is strict json
+    tsv - a line per value or per error, line<TAB>value<TAB>3 or line<TAB>error type<TAB>error msg
+    """
+    FORMATS = ("jsonl", "tsv")
+    # bulk input often repeats expressions so the batch mode uses a larger result cache than the interactive loop
+    DEFAULT_CACHE_SIZE = 16384
+
+    def __init__(self, output_format: str = "jsonl", buffer_lines: int = 1000, workers: int = 1,
+                 **handler_kwargs):
+        """
+        :param output_format: jsonl or tsv
+        :param buffer_lines: amount of output lines that are written at once
+        :param workers: amount of worker processes, 1 runs the expressions in the current process
+        :param handler_kwargs: args that are passed to the CalcHandler, ie fail_fast=True
+        """
+        handler_kwargs.setdefault("cache_size", self.DEFAULT_CACHE_SIZE)
+        if output_format not in self.FORMATS:
+            raise ValueError(f"Unknown output format: {output_format}, the formats are: {', '.join(self.FORMATS)}")
+        self._format_func = self.format_jsonl if output_format == "jsonl" else self.format_tsv
+        self._buffer_lines = buffer_lines
+        self._workers = workers
+        self._handler_kwargs = handler_kwargs
+
+    def run(self, input_file, output_file) -> int:
+        """
+        Func that evaluates every line of the input and writes the results to the output
+        :param input_file: text file like object with an expression per line
+        :param output_file: text file like object
+        :return: the amount of evaluated lines
+        """
+        expressions = self.read_expressions(input_file)
+        if self._workers > 1:
+            from CalcParts.ParallelExecutor import ParallelExecutor
+            with ParallelExecutor(self._workers, **self._handler_kwargs) as executor:
+                return self._write_results(executor.map(expressions), output_file)
+        return self._write_results(CalcHandler(**self._handler_kwargs).evaluate_many(expressions), output_file)
+
+    def run_file(self, path: str, output_file) -> int:
+        """
+        Func that evaluates every line of a file and writes the results to the output, the file is memory mapped and
+        the lines are tokenized as bytes, the results are the same as the ones of run
+        :param path: path of a regular file with an expression per line
+        :param output_file: text file like object
+        :return: the amount of evaluated lines
+        """
+        if self._workers > 1:
+            from CalcParts.ParallelExecutor import ParallelExecutor
+            with ParallelExecutor(self._workers, **self._handler_kwargs) as executor:
+                return self._write_results(executor.map_file(path), output_file)
+        with MappedInput(path) as mapped_input:
+            return self._write_results(CalcHandler(**self._handler_kwargs).evaluate_buffer(mapped_input.get_buffer()),
+                                       output_file)
+
+    def _write_results(self, results, output_file) -> int:
+        """
+        Func that formats the results and writes them in blocks of lines
+        :param results: iterable of (index, result, error_list)
+        :param output_file:
+        :return: the amount of written results
+        """
+        format_func = self._format_func
+        buffer = []
+        count = 0
+        for index, result, error_list in results:
+            buffer.append(format_func(index + 1, result, error_list))
+            count += 1
+            if len(buffer) >= self._buffer_lines:
+                output_file.write(''.join(buffer))
+                buffer.clear()
+        output_file.write(''.join(buffer))
+        output_file.flush()
+        return count
+
+    @staticmethod
+    def read_expressions(input_file):
+        """
+        Generator that lazily reads the expressions of a file, one per line
+        :param input_file:
+        :return: yields every line without its line break
+        """
+        for line in input_file:
+            yield line.rstrip("\r\n")
+
+    @staticmethod
+    def format_jsonl(line_number: int, result, error_list) -> str:
+        """
+        :param line_number:
+        :param result:
+        :param error_list:
+        :return: the json line of a single result
+        """
+        return json.dumps({"line": line_number, **BatchRunner.result_to_dict(result, error_list)}, allow_nan=False) + \
+            "\n"
+
+    @staticmethod
+    def result_to_dict(result, error_list) -> dict:
+        """
+        :param result:
+        :param error_list:
+        :return: the json fields of a single result, {"value": 3} or {"errors": [{"type": ..., "msg": ...}]}, the
+        Fractions and Decimals of the exact and decimal backends and the floats that aren't finite (json has no inf
+        and nan) are written as strings, ie {"value": "inf"}
+        """
+        if error_list:
+            return {"errors": [{"type": error.get_error_type(), "msg": str(error.get_msg())} for error in error_list]}
+        if result.__class__ is int or (result.__class__ is float and isfinite(result)):
+            return {"value": result}
+        return {"value": str(result)}
+
+    @staticmethod
+    def format_tsv(line_number: int, result, error_list) -> str:
+        """
+        :param line_number:
+        :param result:
+        :param error_list:
+        :return: the tsv lines of a single result, a line for every error
+        """
+        if error_list:
+            return ''.join(f"{line_number}\t{error.get_error_type()}\t{error.get_msg()}\n" for error in error_list)
+        return f"{line_number}\tvalue\t{result}\n"
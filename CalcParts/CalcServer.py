@@ -0,0 +1,249 @@
+import asyncio
+import json
+from concurrent.futures import ProcessPoolExecutor
+from CalcHandler import CalcHandler
+from CalcParts.BatchRunner import BatchRunner
+
+# the calc handler of the current worker process, it is created once when the worker starts
+_worker_calc_handler = None
+
+
+def _init_worker(handler_kwargs: dict):
+    """
+    Func that runs once in every worker process and creates its calc handler
+    :param handler_kwargs:
+    """
+    global _worker_calc_handler
+    _worker_calc_handler = CalcHandler(**handler_kwargs)
+
+
+def _reject_constant(constant: str):
+    """
+    Func that rejects the NaN and Infinity constants that json.loads accepts but aren't valid json
+    :param constant:
+    """
+    raise ValueError(f"Invalid json constant: {constant}")
+
+
+def _eval_requests(requests: list, calc_handler: CalcHandler = None) -> list:
+    """
+    Func that evaluates the expressions of a frame, the results are turned into json fields here so only plain data
+    is sent back from a worker process
+    :param requests: list of (expression, fail_fast)
+    :param calc_handler: the handler to use, defaults to the handler of the worker process
+    :return: list of the json fields of every result
+    """
+    calc_handler = calc_handler or _worker_calc_handler
+    return [BatchRunner.result_to_dict(*calc_handler.run_single_exp(input_exp, fail_fast))
+            for input_exp, fail_fast in requests]
+
+
+class CalcServer:
+    """
+    Asyncio tcp server that evaluates expressions sent as json lines, every line of a connection is a frame.
+    A frame is a single request {"id": 1, "exp": "1+2", "fail_fast": false} (only exp is needed) or a json list of
+    requests, the response of a frame is a single line with the response or the list of the responses in the same
+    order, {"id": 1, "value": 3} or {"id": 1, "errors": [{"type": ..., "msg": ...}]}. The frames and the responses
+    are strict json, a value that a json number can't hold is sent as a string (see BatchRunner.result_to_dict).
+    Frames can be pipelined, a client can send many frames without waiting and the responses of a connection are
+    always written in the order of its frames. Only max_pending frames of a connection are handled at once, after
+    that the server stops reading from the connection until responses are written, so a fast client can't make the
+    server hold an unbounded amount of work.
+    With workers=0 the frames are evaluated in the event loop by a single calc handler, an evaluation never awaits
+    so two frames never share the handler at once, and a big frame is cut into slices so other connections can run
+    between them. With workers > 0 the frames are evaluated on a pool of worker processes and every worker holds its
+    own calc handler, a pool of handlers in the same process wouldn't add anything as the evaluation is cpu bound
+    """
+    # clients often send the same expressions so the server uses a larger result cache than the interactive loop
+    DEFAULT_CACHE_SIZE = 16384
+
+    def __init__(self, host: str = "127.0.0.1", port: int = 8765, workers: int = 0, max_pending: int = 32,
+                 max_frame_bytes: int = 1 << 24, slice_size: int = 256, **handler_kwargs):
+        """
+        :param host:
+        :param port: 0 picks a free port, see get_address
+        :param workers: amount of worker processes, 0 evaluates the frames in the event loop
+        :param max_pending: max amount of frames of a connection that are handled or waiting to be written
+        :param max_frame_bytes: max length of a frame, a longer frame closes the connection
+        :param slice_size: amount of expressions that are evaluated between switches to other connections
+        :param handler_kwargs: args that are passed to the CalcHandler, ie fail_fast=True
+        """
+        self._host = host
+        self._port = port
+        self._workers = workers
+        self._max_pending = max_pending
+        self._max_frame_bytes = max_frame_bytes
+        self._slice_size = slice_size
+        self._handler_kwargs = handler_kwargs
+        self._calc_handler = CalcHandler(**handler_kwargs) if workers == 0 else None
+        self._executor = None
+        self._server = None
+
+    async def start(self):
+        """
+        Func that starts listening, the worker processes are started with it
+        """
+        if self._workers > 0:
+            self._executor = ProcessPoolExecutor(self._workers, initializer=_init_worker,
+                                                 initargs=(self._handler_kwargs,))
+        self._server = await asyncio.start_server(self._handle_connection, self._host, self._port,
+                                                  limit=self._max_frame_bytes)
+
+    async def serve_forever(self):
+        """
+        Func that starts the server if needed and serves until it is cancelled
+        """
+        if self._server is None:
+            await self.start()
+        try:
+            await self._server.serve_forever()
+        finally:
+            await self.close()
+
+    async def close(self):
+        """
+        Func that stops listening and stops the worker processes
+        """
+        if self._server is not None:
+            self._server.close()
+            await self._server.wait_closed()
+            self._server = None
+        if self._executor is not None:
+            self._executor.shutdown()
+            self._executor = None
+
+    def get_address(self) -> tuple:
+        """
+        :return: (host, port) the server listens on
+        """
+        return self._server.sockets[0].getsockname()[:2]
+
+    async def _handle_connection(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter):
+        """
+        Func that reads the frames of a connection, every frame is handled in its own task and the tasks are queued
+        in order for the writer, the bounded queue stops the reading when too many frames are pending
+        :param reader:
+        :param writer:
+        """
+        responses = asyncio.Queue(self._max_pending)
+        writer_task = asyncio.create_task(self._write_responses(responses, writer))
+        try:
+            while True:
+                try:
+                    line = await reader.readline()
+                except ValueError:
+                    # the frame is longer than the limit, the rest of the stream can't be read as frames
+                    await responses.put(self._create_error_task(f"The frame is longer than {self._max_frame_bytes}"))
+                    break
+                except ConnectionError:
+                    break
+                if not line:
+                    break
+                if line.strip():
+                    await responses.put(asyncio.create_task(self._handle_frame(line)))
+        finally:
+            await responses.put(None)
+            await writer_task
+            writer.close()
+            try:
+                await writer.wait_closed()
+            except ConnectionError:
+                pass
+
+    @staticmethod
+    async def _write_responses(responses: asyncio.Queue, writer: asyncio.StreamWriter):
+        """
+        Func that writes the responses in the order of the frames until it gets None, after the client is gone the
+        responses are still taken from the queue so the reader never waits on a full queue
+        :param responses: queue of the tasks of the frames
+        :param writer:
+        """
+        connected = True
+        while True:
+            task = await responses.get()
+            if task is None:
+                return
+            response = await task
+            if connected:
+                try:
+                    writer.write(response)
+                    # waits while the client doesn't read its responses
+                    await writer.drain()
+                except ConnectionError:
+                    connected = False
+
+    async def _handle_frame(self, line: bytes) -> bytes:
+        """
+        Func that parses a frame, evaluates its requests and creates its response line
+        :param line:
+        :return: the response line
+        """
+        try:
+            frame = json.loads(line, parse_constant=_reject_constant)
+        except ValueError:
+            return self._dump_response(self._create_error_response(None, "The frame isn't valid json"))
+        requests = frame if isinstance(frame, list) else [frame]
+        default_fail_fast = self._handler_kwargs.get("fail_fast", False)
+        responses = [None] * len(requests)
+        # the valid requests by their place in the frame
+        valid_requests = {}
+        for index, request in enumerate(requests):
+            if not isinstance(request, dict) or not isinstance(request.get("exp"), str):
+                responses[index] = self._create_error_response(
+                    request.get("id") if isinstance(request, dict) else None,
+                    "A request must be an object with an exp string")
+            elif request.get("fail_fast", default_fail_fast).__class__ is not bool:
+                # a string like "false" isn't taken as a bool
+                responses[index] = self._create_error_response(request.get("id"),
+                                                               "The fail_fast of a request must be true or false")
+            else:
+                valid_requests[index] = (request["exp"], request.get("fail_fast", default_fail_fast))
+        results = await self._evaluate(list(valid_requests.values()))
+        for index, result in zip(valid_requests, results):
+            if "id" in requests[index]:
+                result = {"id": requests[index]["id"], **result}
+            responses[index] = result
+        return self._dump_response(responses if isinstance(frame, list) else responses[0])
+
+    async def _evaluate(self, requests: list) -> list:
+        """
+        Func that evaluates the requests of a frame in the event loop or on the worker pool
+        :param requests: list of (expression, fail_fast)
+        :return: list of the json fields of every result
+        """
+        if self._executor is not None:
+            return await asyncio.get_running_loop().run_in_executor(self._executor, _eval_requests, requests)
+        results = []
+        for start in range(0, len(requests), self._slice_size):
+            if start:
+                # let the other connections run between the slices of a big frame
+                await asyncio.sleep(0)
+            results.extend(_eval_requests(requests[start:start + self._slice_size], self._calc_handler))
+        return results
+
+    def _create_error_task(self, msg: str) -> asyncio.Future:
+        """
+        :param msg:
+        :return: a finished future with the response line of a frame error
+        """
+        future = asyncio.get_running_loop().create_future()
+        future.set_result(self._dump_response(self._create_error_response(None, msg)))
+        return future
+
+    @staticmethod
+    def _create_error_response(request_id, msg: str) -> dict:
+        """
+        :param request_id: the id of the request, None if it has no id
+        :param msg:
+        :return: the response of a request that can't be evaluated
+        """
+        response = {"errors": [{"type": "Request_Error", "msg": msg}]}
+        return response if request_id is None else {"id": request_id, **response}
+
+    @staticmethod
+    def _dump_response(response) -> bytes:
+        """
+        :param response:
+        :return: the response as a json line
+        """
+        return (json.dumps(response, allow_nan=False) + "\n").encode()
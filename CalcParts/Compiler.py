@@ -0,0 +1,140 @@
+from array import array
+from ErrorParts.ErrorHandler import ErrorHandler
+from CalcParts.CostModel import EvalLimits
+from CalcParts.Evaluator import Evaluator
+from CalcParts.ExpressionDag import ExpressionDag
+from CalcParts.NumericBackends import NumericBackend, FloatBackend
+from CalcParts.Operators import Plus, Minus, Multiplication
+from CalcParts.TokenStream import TokenStream
+
+
+class PostfixCompiler:
+    """
+    Class that turns a postfix list into a python function, the postfix list is first turned into an ExpressionDag
+    and every node of the DAG becomes a local variable of the generated function, so a repeated subterm is computed
+    once and evaluating the function doesn't need any isinstance checks or list pops.
+    The simple arithmetic ops are written inline and the rest of the ops are called directly through their
+    operator class so they raise the same exceptions as in the evaluator
+    """
+    # ops that are written inline in the generated code
+    _inline_ops = {Plus: '+', Minus: '-', Multiplication: '*'}
+
+    @staticmethod
+    def compile(token_stream: TokenStream, post_fix: array, dag: ExpressionDag = None):
+        """
+        Func that generates the python function of a postfix list
+        :param token_stream: the token stream the postfix indexes point into
+        :param post_fix: the indexes of the tokens in postfix order
+        :param dag: the DAG of the postfix list if it was already built
+        :return: function that returns the raw final value, None if the postfix can't be compiled
+        """
+        if dag is None:
+            dag = ExpressionDag.build(token_stream, post_fix)
+        if dag is None:
+            return None
+        args = []
+        lines = []
+        ops = {}
+        # the local variable of every node
+        names = []
+        for node, node_data in enumerate(dag.nodes):
+            if isinstance(node_data, float):
+                # constants are passed as default args so they are loaded as fast locals
+                names.append(f"_k{node}")
+                args.append(f"_k{node}={node_data!r}")
+                continue
+            names.append(f"n{node}")
+            op = ops[node] = TokenStream.OP_CLASSES[node_data[0]]
+            left = names[node_data[1]]
+            if len(node_data) == 2:
+                lines.append(f"    n{node} = _f{node}({left})")
+                args.append(f"_f{node}=_ops[{node}].unary_evaluate")
+                continue
+            right = names[node_data[2]]
+            inline_op = PostfixCompiler._inline_ops.get(type(op))
+            if inline_op is not None:
+                lines.append(f"    n{node} = {left} {inline_op} {right}")
+            else:
+                lines.append(f"    n{node} = _f{node}({left}, {right})")
+                args.append(f"_f{node}=_ops[{node}].binary_evaluate")
+        lines.append(f"    return {names[dag.root]}")
+        source = f"def _compiled({', '.join(args)}):\n" + "\n".join(lines) + "\n"
+        namespace = {"_ops": ops, "inf": float("inf")}
+        exec(compile(source, "<prepared expression>", "exec"), namespace)
+        return namespace["_compiled"]
+
+
+class PreparedExpression:
+    """
+    Class that holds an expression that already went through the tokenizer and converter.
+    The evaluation is tiered, the first evaluations walk the DAG of the expression (see ExpressionDag) with an
+    evaluator and only once the expression was evaluated compile_threshold times the DAG is compiled into a python
+    function, on both tiers a repeated subterm is evaluated once.
+    The DAG and the compiled function compute with floats and aren't limited, with any other numeric backend or with
+    evaluation limits the postfix list is always walked by an evaluator
+    """
+
+    def __init__(self, token_stream: TokenStream, post_fix: array, max_depth: int, errors: list,
+                 compile_threshold: int = 2, backend: NumericBackend = None, limits: EvalLimits = None):
+        # the prepared expression holds its own copies, the calc reuses its stream and postfix for the next expression
+        self._token_stream = token_stream.copy() if token_stream is not None else None
+        self._post_fix = array('i', post_fix) if post_fix is not None else None
+        self._max_depth = max_depth
+        self._errors = errors
+        self._eval_count = 0
+        self._compiled_func = None
+        self._error_handler = ErrorHandler(raise_errors=False)
+        self._evaluator = Evaluator(self._error_handler, backend, limits)
+        uses_tiers = isinstance(self._evaluator.get_backend(), FloatBackend) and limits is None
+        self._compile_threshold = compile_threshold if uses_tiers else float("inf")
+        # the postfix list is walked instead if the DAG can't be built
+        self._dag = ExpressionDag.build(self._token_stream, self._post_fix) if post_fix is not None and uses_tiers \
+            else None
+
+    def evaluate(self):
+        """
+        Func that evaluates the prepared expression
+        :return: returns the final value or the errors the calc ran into, same as CalcHandler.run_single_exp
+        """
+        if self._errors:
+            # the expression didn't pass the tokenizer or converter
+            return None, list(self._errors)
+        if self._compiled_func is None:
+            self._eval_count += 1
+            if self._eval_count < self._compile_threshold:
+                return self._interpret()
+            self._compiled_func = PostfixCompiler.compile(self._token_stream, self._post_fix, self._dag)
+            if self._compiled_func is None:
+                # never try to compile the expression again
+                self._compile_threshold = float("inf")
+                return self._interpret()
+        try:
+            return Evaluator.format_final(self._compiled_func()), None
+        except Exception as e:
+            return None, [Evaluator.exception_to_error(e)]
+
+    def is_compiled(self) -> bool:
+        """
+        :return: True if the expression was compiled into a python function
+        """
+        return self._compiled_func is not None
+
+    def get_post_fix(self) -> list:
+        """
+        :return: the postfix list of the expression as Token objects
+        """
+        return [self._token_stream.get_token(index) for index in self._post_fix]
+
+    def _interpret(self):
+        """
+        Func that evaluates the DAG or the postfix list with the evaluator
+        :return: returns the final value or the errors the calc ran into
+        """
+        self._error_handler.clear_errors()
+        self._evaluator.clear_evaluator()
+        evaluated = self._evaluator.eval_dag(self._dag) if self._dag is not None else \
+            self._evaluator.eval(self._token_stream, self._post_fix, self._max_depth)
+        final = self._evaluator.get_final() if evaluated else None
+        if self._error_handler.has_errors():
+            return None, self._error_handler.get_errors()
+        return final, None
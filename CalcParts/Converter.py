@@ -1,12 +1,13 @@
+from array import array
 from ErrorParts.ErrorHandler import ErrorHandler
-from CalcParts.Operators import Operator, UMinus, ILeftSidedOp, IRightSidedOp
 from ErrorParts.Errors import BaseCalcError
-from CalcParts.Tokenizer import Token
+from CalcParts.TokenStream import TokenStream
+from CalcParts.OpRegistry import OpRegistry
 
 
 class Converter:
     """
-    Class that converts an infix token list into a postfix token list
+    Class that converts an infix token stream into a postfix list
     The possible errors to get while converting are:
     1. Invalid parentheses, missing ( to a ) token or missing ) to a (
     2. Invalid operator usage (double operators / invalid unary op usage)
@@ -15,379 +16,439 @@ class Converter:
     4. Empty parenthesis
     5. Missing operands / operand for binary and unary ops
     6. Invalid usage of unary ops (according to the rules)
-    The output list will be a list of tokens in postfix so that
+    The output list will be a list of the indexes of the tokens in the token stream in postfix so that
     I can give better errors in the evaluator (get the position of the error)
+    Every token is handled in constant amortized time, the open parentheses in the op stack are counted instead of
+    searched for so the conversion stays linear for very long and deeply nested expressions.
+    While converting, the converter also counts the max amount of values the evaluator will hold at once
     """
+    # sign minus with the highest priority
+    _sign_minus_precedence = OpRegistry.MAX_PRECEDENCE
+    # min amount of tokens between the saved states of an incremental conversion
+    CHECKPOINT_EVERY = 16
 
     def __init__(self, error_handler: ErrorHandler):
         self._error_handler = error_handler
-        self._output_lst = []
+        self._output_lst = array('i')
+        # stack of token indexes
         self._op_stack = []
         self._hit_missing_operands_error = False
-        self._signed_minus_indexes = []
-        # sign minus with the highest priority
-        self._unary_sign_token = Token("U-", UMinus(7, '-', "left", ""), -1, -1)
+        self._signed_minus_indexes = set()
+        # amount of ( tokens in the op stack
+        self._open_paren_count = 0
+        # amount of values the evaluator holds after the current output and the max of it
+        self._depth = 0
+        self._max_depth = 0
+        self._token_stream = None
+        self._types = None
+        # funcs that check the placement of every operator placement
+        self._check_funcs_dict = {
+            "left": self._check_left_op,
+            "right": self._check_right_op,
+            "mid": self._check_mid_op,
+        }
+
+    def convert(self, token_stream: TokenStream, start_index: int = 0, checkpoints: list = None) -> bool:
+        """
+        This is the main convert function, it goes over the token stream and turns it into a post fix list
+        :param token_stream:
+        :param start_index: the first token to convert, the converter must hold the state from before it (see
+        restore_state)
+        :param checkpoints: if passed, the states of the converter are added to it until the first error, so a later
+        conversion of an expression that starts with the same tokens can resume from them. A state copies the stacks,
+        so the next one is only saved after at least as many tokens as the stacks hold (and CHECKPOINT_EVERY), this
+        keeps the states linear in time and memory even for deeply nested expressions
+        :return: True if the expression has no errors, see ErrorHandler.check_errors
+        """
+        self._token_stream = token_stream
+        self._types = types = token_stream.types
+        error_handler = self._error_handler
+        if checkpoints is None:
+            self._convert_range(start_index, len(types))
+        else:
+            every = self.CHECKPOINT_EVERY
+            cur_index = start_index
+            while cur_index < len(types) and not error_handler.is_stopped():
+                if not error_handler.has_errors():
+                    checkpoints.append(self.save_state(cur_index))
+                # convert up to the next checkpoint, the op stack and the values of the evaluator are copied in it
+                block_end = min(cur_index + max(every, len(self._op_stack) + self._depth), len(types))
+                self._convert_range(cur_index, block_end)
+                cur_index = block_end
+        # call the end of input func, fail fast already has its error if the conversion stopped
+        if not error_handler.is_stopped():
+            self._handle_end_input()
+        # check if we need to show errors
+        return error_handler.check_errors()
 
-    def convert(self, token_list: list):
+    def _convert_range(self, start_index: int, end_index: int):
         """
-        This is the main convert function, it goes over the token list and turns it into a post fix token list
-        :param token_list:
+        Func that converts a range of the tokens
+        :param start_index:
+        :param end_index:
         """
+        types = self._types
+        is_operand = TokenStream.IS_OPERAND
+        is_operator = TokenStream.IS_OPERATOR
+        # only fail fast can stop the conversion, the check is skipped in the default mode
+        is_stopped = self._error_handler.is_stopped if self._error_handler.is_fail_fast() else None
         # convert infix token list to post fix
-        cur_index = 0
-        for token in token_list:
-            if token.get_token_type() == "Number":
-                self._handle_number(token)
-            elif isinstance(token.get_token_value(), Operator):
-                self._check_operator_placement(cur_index, token_list)
-                self._handle_operator(token, cur_index, token_list)
+        for cur_index in range(start_index, end_index):
+            type_code = types[cur_index]
+            if is_operand[type_code]:
+                self._handle_number(cur_index)
+                continue
+            if is_operator[type_code]:
+                self._check_operator_placement(cur_index)
+                self._handle_operator(cur_index)
             else:
                 # the token is parentheses
-                self._handle_paren(token_list, cur_index)
-            cur_index += 1
-        # call the end of input func
-        self._handle_end_input()
-        # check if we need to show errors
-        self._error_handler.check_errors()
+                self._handle_paren(cur_index)
+            # only operators and parentheses add errors, fail fast stops at the first one
+            if is_stopped is not None and is_stopped():
+                return
+
+    def save_state(self, cur_index: int) -> tuple:
+        """
+        Func that saves the state of the converter before a token, the state is valid for any expression that has the
+        same tokens up to and including the token at cur_index, as the checks look one token ahead
+        :param cur_index: the index of the next token to convert
+        :return: the state
+        """
+        return (cur_index, len(self._output_lst), tuple(self._op_stack), self._open_paren_count, self._depth,
+                self._max_depth, self._hit_missing_operands_error)
 
-    def _handle_number(self, token: Token):
+    def restore_state(self, state: tuple):
         """
-        Adds a number literal to the output list
-        :param token:
+        Func that returns the converter to a saved state, the postfix list must still be the one of the expression
+        the state was saved in, only the part after the state is removed from it
+        :param state:
         """
-        self._output_lst.append(token)
+        cur_index, output_length, op_stack, self._open_paren_count, self._depth, self._max_depth, \
+            self._hit_missing_operands_error = state
+        del self._output_lst[output_length:]
+        self._op_stack[:] = op_stack
+        self._signed_minus_indexes = {index for index in self._signed_minus_indexes if index < cur_index}
 
-    def _handle_paren(self, token_list: list, cur_index: int):
+    def _handle_number(self, cur_index: int):
+        """
+        Adds a number literal or a variable to the output list
+        :param cur_index:
+        """
+        self._output_lst.append(cur_index)
+        self._depth += 1
+        if self._depth > self._max_depth:
+            self._max_depth = self._depth
+
+    def _output_operator(self, op_index: int):
+        """
+        Adds an operator to the output list, a binary operator leaves one value instead of two in the evaluator
+        :param op_index:
+        """
+        self._output_lst.append(op_index)
+        if not TokenStream.IS_UNARY[self._types[op_index]]:
+            self._depth -= 1
+
+    def _handle_paren(self, cur_index: int):
         """
         Handles the parentheses
-        :param token_list:
         :param cur_index:
         """
         # add invalid parentheses errors if there are any
-        self._check_invalid_paren(token_list, cur_index)
-        cur_token = token_list[cur_index]
-        if cur_token.get_token_value() == '(':
+        self._check_invalid_paren(cur_index)
+        if self._types[cur_index] == TokenStream.OPEN_PAREN:
             # check for binary op
-            self._op_stack.append(cur_token)
+            self._op_stack.append(cur_index)
+            self._open_paren_count += 1
         else:
             # parentheses is )
-            if self._check_list_for_paren('('):
-                while len(self._op_stack) != 0 and self._op_stack[-1].get_token_value() != '(':
-                    self._output_lst.append(self._op_stack.pop())
+            if self._open_paren_count:
+                while len(self._op_stack) != 0 and self._types[self._op_stack[-1]] != TokenStream.OPEN_PAREN:
+                    self._output_operator(self._op_stack.pop())
                 # pop the final parentheses
                 self._op_stack.pop()
+                self._open_paren_count -= 1
             else:
                 self._error_handler.add_error(
-                    BaseCalcError("Missing_Open_Paren_Error",
-                                  "Missing Opening parentheses to closing parentheses at position: " + str(
-                                      cur_token.get_token_pos()[0])))
+                    BaseCalcError("Missing_Open_Paren_Error", None, (self._token_stream.starts[cur_index],)))
 
-    def _check_invalid_paren(self, token_list: list, cur_index: int):
+    def _check_invalid_paren(self, cur_index: int):
         """
         Checks for any errors with parentheses in the expression.
         """
-        cur_token = token_list[cur_index]
-        cur_paren = cur_token.get_token_type()
-        pos = cur_token.get_token_pos()[0]
-        prev_token = token_list[cur_index - 1] if cur_index - 1 >= 0 else None
-        next_token = token_list[cur_index + 1] if cur_index + 1 < len(token_list) else None
-        if cur_paren == '(':
-            self._check_opening_paren(prev_token, next_token, pos)
+        pos = self._token_stream.starts[cur_index]
+        next_type, prev_type = self._get_next_and_prev_types(cur_index)
+        if self._types[cur_index] == TokenStream.OPEN_PAREN:
+            self._check_opening_paren(prev_type, next_type, cur_index + 1, pos)
         else:
-            self._check_closing_paren(next_token, pos)
+            self._check_closing_paren(next_type, pos)
 
-    def _check_opening_paren(self, prev_token: Token, next_token: Token, pos: int):
+    def _check_opening_paren(self, prev_type: int, next_type: int, next_index: int, pos: int):
         """
         Check all errors with opening parentheses
-        :param prev_token:
-        :param next_token:
+        :param prev_type:
+        :param next_type:
+        :param next_index:
         :param pos:
         """
         # check token before (
-        if prev_token and prev_token.get_token_type() in ['!', 'Number']:
-            self._error_handler.add_error(
-                BaseCalcError("Invalid_Before_Open_Paren_Error", f"Invalid token before ( at position: {pos}")
-            )
+        if prev_type is not None and (prev_type == TokenStream.OP_CODES['!'] or TokenStream.IS_OPERAND[prev_type]):
+            self._error_handler.add_error(BaseCalcError("Invalid_Before_Open_Paren_Error", None, (pos,)))
 
-        next_type = next_token.get_token_type()
-        # check for empty parentheses
-        if next_type == ')':
-            closing_pos = next_token.get_token_pos()[0]
-            self._error_handler.add_error(
-                BaseCalcError("Invalid_Empty_Paren_Error",
-                              f"Invalid empty parentheses at position: {closing_pos - 1} -> {closing_pos}")
-            )
+        # check for empty parentheses, a ( at the end of the expression is a missing ) error
+        if next_type == TokenStream.CLOSE_PAREN:
+            closing_pos = self._token_stream.starts[next_index]
+            self._error_handler.add_error(BaseCalcError("Invalid_Empty_Paren_Error", None, (pos, closing_pos)))
 
-    def _check_closing_paren(self, next_token: Token, pos: int):
+    def _check_closing_paren(self, next_type: int, pos: int):
         """
         Check all errors with closing parentheses
-        :param next_token:
+        :param next_type:
         :param pos:
         """
-        if next_token and next_token.get_token_type() in ["U-", "Number"]:
-            self._error_handler.add_error(
-                BaseCalcError("Invalid_After_Close_Paren_Error", f"Invalid token after ) at position: {pos}")
-            )
+        if next_type is not None and (next_type == TokenStream.OP_CODES['U-'] or TokenStream.IS_OPERAND[next_type]):
+            self._error_handler.add_error(BaseCalcError("Invalid_After_Close_Paren_Error", None, (pos,)))
 
-    def _check_list_for_paren(self, paren_type: chr) -> bool:
-        """
-        Func to check if the op_stack has parentheses of paren_type
-        :return:
-        """
-        for token in self._op_stack:
-            if token.get_token_type() == paren_type:
-                return True
-        return False
-
-    def _handle_operator(self, token: Token, cur_index: int, token_list: list):
+    def _handle_operator(self, cur_index: int):
         """
         Func that will handle operator adding to the output list
-        :param token:
+        :param cur_index:
         """
-        current_op = token.get_token_value()
-        if self._check_for_sign_minus(cur_index, token_list):
+        if self._check_for_sign_minus(cur_index):
             # append sign minuses immediately
-            self._op_stack.append(self._unary_sign_token)
+            self._op_stack.append(cur_index)
         else:
-            while len(self._op_stack) != 0 and self._op_stack[-1].get_token_value() != '(' and \
-                    self._check_precedence(current_op, self._op_stack[-1].get_token_value()) <= 0 and \
-                    len(self._output_lst) != 0:
-                self._output_lst.append(self._op_stack.pop())
-            self._op_stack.append(token)
+            current_precedence = TokenStream.PRECEDENCES[self._types[cur_index]]
+            while len(self._op_stack) != 0 and self._types[self._op_stack[-1]] != TokenStream.OPEN_PAREN and \
+                    self._check_precedence(current_precedence, self._get_stack_precedence(self._op_stack[-1])) <= 0 \
+                    and len(self._output_lst) != 0:
+                self._output_operator(self._op_stack.pop())
+            self._op_stack.append(cur_index)
+
+    def _get_stack_precedence(self, op_index: int) -> float:
+        """
+        :param op_index:
+        :return: the precedence of an operator in the op stack, sign minuses have the highest precedence
+        """
+        if op_index in self._signed_minus_indexes:
+            return self._sign_minus_precedence
+        return TokenStream.PRECEDENCES[self._types[op_index]]
 
     def _handle_end_input(self):
         """
         Func that will add the final ops to the output list
         """
-        if self._check_list_for_paren('('):
-            # invalid exp missing ) to opening parentheses, get the indexes
-            invalid_indexes = list(
-                filter(lambda pos: self._op_stack[pos].get_token_value() == '(', range(len(self._op_stack))))
-            for index in invalid_indexes:
-                # add the error
-                self._error_handler.add_error(
-                    BaseCalcError("Missing_Close_Paren_Error",
-                                  "Missing Closing parentheses to opening parentheses at position: " + str(
-                                      self._op_stack[index].get_token_pos()[0])))
+        if self._open_paren_count:
+            # invalid exp missing ) to opening parentheses, add an error for every one of them
+            for index in self._op_stack:
+                if self._types[index] == TokenStream.OPEN_PAREN:
+                    if self._error_handler.add_error(
+                            BaseCalcError("Missing_Close_Paren_Error", None, (self._token_stream.starts[index],))):
+                        return
         else:
             while len(self._op_stack) != 0:
-                self._output_lst.append(self._op_stack.pop())
+                self._output_operator(self._op_stack.pop())
 
-    def _check_precedence(self, op_token1: Operator, op_token2: Operator) -> float:
+    def _check_precedence(self, precedence1: float, precedence2: float) -> float:
         """
         This func will return:
         neg num if op1 < op2
         pos num if op1 > op2
         0 if op1 == op2
-        :param op_token1:
-        :param op_token2:
+        :param precedence1:
+        :param precedence2:
         :return: int value
         """
-        return op_token1.get_precedence() - op_token2.get_precedence()
+        return precedence1 - precedence2
 
-    def get_post_fix(self) -> list:
+    def get_post_fix(self) -> array:
         """
-        :return: return the postfix list
+        :return: return the postfix list, the indexes of the tokens in the token stream
         """
         return self._output_lst
 
+    def get_post_fix_tokens(self) -> list:
+        """
+        Func that returns the postfix list as Token objects, used for debugging
+        :return: list of tokens
+        """
+        return [self._token_stream.get_token(index) for index in self._output_lst]
+
+    def get_max_depth(self) -> int:
+        """
+        :return: the max amount of values the evaluator holds while evaluating the postfix list
+        """
+        return self._max_depth
+
     def clear_converter(self):
         """
         Clear the used values so I can convert another expression
         """
-        self._op_stack = []
-        self._output_lst = []
-        self._signed_minus_indexes = []
+        # the lists are cleared in place so they are reused between expressions
+        self._op_stack.clear()
+        del self._output_lst[:]
+        self._signed_minus_indexes.clear()
+        self._open_paren_count = 0
+        self._hit_missing_operands_error = False
+        self._depth = 0
+        self._max_depth = 0
 
-    def _check_operator_placement(self, cur_index: int, token_list: list):
+    def _check_operator_placement(self, cur_index: int):
         """
         This func will check if an operator is placed in a valid way based on its placement and add an error if needed
         :param cur_index:
-        :param token_list:
         """
-        if self._hit_missing_operands_error and token_list[cur_index].get_token_value().get_placement() == "mid":
+        current_type = self._types[cur_index]
+        current_token_placement = TokenStream.PLACEMENTS[current_type]
+        if self._hit_missing_operands_error and current_token_placement == "mid":
             self._hit_missing_operands_error = False
             return
-        current_token = token_list[cur_index]
-        current_token_placement = current_token.get_token_value().get_placement()
-        check_funcs_dict = {
-            "left": self._check_left_op,
-            "right": self._check_right_op,
-            "mid": self._check_mid_op,
-        }
-        func = check_funcs_dict[current_token_placement]
-        is_good, error_dir = func(cur_index, token_list)
+        func = self._check_funcs_dict[current_token_placement]
+        is_good, error_dir = func(cur_index)
         if not is_good:
+            token_pos = self._token_stream.starts[cur_index]
             if current_token_placement == "mid":
                 # missing operands for mid placed operator
-                self._error_handler.add_error(
-                    BaseCalcError("Missing_Operands_Error",
-                                  f"Missing operands for: {current_token.get_token_type()} "
-                                  f"at position: {current_token.get_token_pos()[0]}"))
-
-                if cur_index + 1 < len(token_list):
-                    next_token = token_list[cur_index + 1].get_token_value()
-                    if isinstance(next_token, Operator) and next_token.get_placement() == "mid":
-                        self._hit_missing_operands_error = True
+                self._error_handler.add_error(BaseCalcError("Missing_Operands_Error", None, (token_pos,),
+                                                            (TokenStream.TYPE_NAMES[current_type],)))
+
+                if cur_index + 1 < len(self._types) and TokenStream.PLACEMENTS[self._types[cur_index + 1]] == "mid":
+                    self._hit_missing_operands_error = True
             else:
-                token_value = current_token.get_token_value().get_op_value()
-                token_pos = current_token.get_token_pos()[0]
-                self._handle_unary_op_errors(cur_index, token_list, current_token_placement,
-                                             token_value, token_pos, error_dir)
+                token_value = TokenStream.OP_CLASSES[current_type].get_op_value()
+                self._handle_unary_op_errors(cur_index, current_token_placement, token_value, token_pos, error_dir)
 
-    def _handle_unary_op_errors(self, cur_index: int, token_list: list, current_token_placement: str,
-                                current_token_value: str, current_pos: int, error_direction: str):
+    def _handle_unary_op_errors(self, cur_index: int, current_token_placement: str, current_token_value: str,
+                                current_pos: int, error_direction: str):
         """
         Func that handles the unary op errors (missing operands / invalid placement)
         :param cur_index:
-        :param token_list:
         :param current_token_placement:
         :param current_token_value:
         :param current_pos:
         """
-        if self._check_has_error_token(cur_index, token_list, current_token_placement):
-            has_after = token_list[cur_index - 1] is not None if current_token_placement == "right" else \
-                token_list[cur_index + 1] is not None
-            error_token = token_list[cur_index - 1] if error_direction == "after" else token_list[cur_index + 1]
+        if self._check_has_error_token(cur_index, current_token_placement):
+            error_type = self._types[cur_index - 1] if error_direction == "after" else self._types[cur_index + 1]
             # add error for invalid use of unary operator
-            if has_after:
-                self._error_handler.add_error(BaseCalcError("Invalid_Unary_Usage_Error",
-                                                            f"Invalid usage of: {current_token_value} "
-                                                            f"at position: {current_pos} "
-                                                            f"cannot come {error_direction}: "
-                                                            f"{error_token.get_token_type()}"))
+            self._error_handler.add_error(
+                BaseCalcError("Invalid_Unary_Usage_Error", None, (current_pos,),
+                              (current_token_value, error_direction, TokenStream.TYPE_NAMES[error_type])))
         else:
             # missing op error for unary operator
             self._error_handler.add_error(
-                BaseCalcError("Missing_Operand_Error",
-                              f"Missing operand for: {current_token_value} at position: {current_pos}"))
+                BaseCalcError("Missing_Operand_Error", None, (current_pos,), (current_token_value,)))
 
-    def _check_has_error_token(self, cur_index: int, token_list: list, placement: str) -> bool:
+    def _check_has_error_token(self, cur_index: int, placement: str) -> bool:
         """
         Func that returns if there is a next token or before token based on the token's placement
         :param cur_index:
-        :param token_list:
         :param placement:
         """
         if placement == "left":
-            return cur_index + 1 < len(token_list)
+            return cur_index + 1 < len(self._types)
         else:
             return cur_index - 1 >= 0
 
-    def _check_left_op(self, cur_index: int, token_list: list) -> tuple:
+    def _check_left_op(self, cur_index: int) -> tuple:
         """
         Func to check the validity of a left sided operator
         :param cur_index:
-        :param token_list:
         :return: False if non valid, else true
         """
-        cur_value = token_list[cur_index].get_token_value()
-        next_token, prev_token = self._get_next_and_prev_tokens(cur_index, token_list)
+        next_type, prev_type = self._get_next_and_prev_types(cur_index)
         # first check the more fatal error of having no next token (no operand)
-        if next_token is None:
+        if next_type is None:
             return False, "None"
         # after checking that there is another token check if it is a valid token
-        next_type = next_token.get_token_type()
-        if isinstance(cur_value, ILeftSidedOp):
+        if TokenStream.IS_LEFT_SIDED[self._types[cur_index]]:
             # unary left sided ops can only come before a unary minus a number or an open paren
-            if next_type not in ("U-", "Number", "("):
+            if not (next_type == TokenStream.OP_CODES['U-'] or TokenStream.IS_OPERAND[next_type] or
+                    next_type == TokenStream.OPEN_PAREN):
                 return False, "before"
             # there cant be a number a closing paren or a right sided unary op before a left sided unary op
-            elif self._check_prev_token(prev_token, ("Number", ")")):
+            elif self._check_prev_type(prev_type):
                 return False, "after"
             return True, "None"
         # this is used for the binary ops
-        return self._check_next_token(next_token, ("Number", "(")), "None"
+        return self._check_next_type(next_type), "None"
 
-    def _check_right_op(self, cur_index: int, token_list: list) -> tuple:
+    def _check_right_op(self, cur_index: int) -> tuple:
         """
         Func to check the validity of a right sided operator
         :param cur_index:
-        :param token_list:
         :return: False if non valid, else true
         """
-        next_token, prev_token = self._get_next_and_prev_tokens(cur_index, token_list)
-        cur_value = token_list[cur_index].get_token_value()
-        if prev_token is None:
+        next_type, prev_type = self._get_next_and_prev_types(cur_index)
+        if prev_type is None:
             return False, "None"
-        prev_type = prev_token.get_token_type()
-        prev_value = prev_token.get_token_value()
-        if isinstance(cur_value, IRightSidedOp):
+        if TokenStream.IS_RIGHT_SIDED[self._types[cur_index]]:
             # unary right sided operators can come after a number a closing paren or another right sided unary op
-            if prev_type not in ("Number", ")") and not isinstance(prev_value, IRightSidedOp):
+            if not self._check_prev_type(prev_type):
                 return False, "after"
             # there cant be a number a opening paren or a left sided unary op after a right sided unary op
-            elif self._check_next_token(next_token, ("Number", "(")):
+            elif self._check_next_type(next_type):
                 return False, "before"
             return True, "None"
         # this is used for the binary ops
-        return self._check_prev_token(prev_token, ("Number", ")")), "after"
+        return self._check_prev_type(prev_type), "after"
 
-    def _check_prev_token(self, prev_token: Token, valid_token_values: tuple) -> bool:
+    def _check_prev_type(self, prev_type: int) -> bool:
         """
-        Func that checks if the prev token is valid (in the valid token values or is an instance of a right sided op)
-        :param prev_token:
-        :param valid_token_values:
+        Func that checks if the prev token is valid (a number, a variable, a closing paren or a right sided op)
+        :param prev_type:
         :return: True if valid False if not
         """
-        if prev_token is None:
+        if prev_type is None:
             return False
-        prev_type = prev_token.get_token_type()
-        prev_value = prev_token.get_token_value()
-        return prev_type in valid_token_values or isinstance(prev_value, IRightSidedOp)
+        return TokenStream.IS_OPERAND[prev_type] or prev_type == TokenStream.CLOSE_PAREN or \
+            TokenStream.IS_RIGHT_SIDED[prev_type]
 
-    def _check_next_token(self, next_token: Token, valid_token_values: tuple) -> bool:
+    def _check_next_type(self, next_type: int) -> bool:
         """
-        Func that checks if the next token is valid (in the valid token values or is an instance of a left sided op)
-        :param next_token:
-        :param valid_token_values:
-        :return:
+        Func that checks if the next token is valid (a number, a variable, an opening paren or a left sided op)
+        :param next_type:
+        :return: True if valid False if not
         """
-        if next_token is None:
+        if next_type is None:
             return False
-        next_type = next_token.get_token_type()
-        next_value = next_token.get_token_value()
-        return next_type in valid_token_values or isinstance(next_value, ILeftSidedOp)
+        return TokenStream.IS_OPERAND[next_type] or next_type == TokenStream.OPEN_PAREN or \
+            TokenStream.IS_LEFT_SIDED[next_type]
 
-    def _get_next_and_prev_tokens(self, cur_index: int, token_list: list) -> tuple:
+    def _get_next_and_prev_types(self, cur_index: int) -> tuple:
         """
-        Func that gets the values of the prev and next token
+        Func that gets the type codes of the prev and next token
         :param cur_index:
-        :param token_list:
-        :return: the values of the tokens or None
+        :return: the type codes of the tokens or None
         """
-        prev_token = token_list[cur_index - 1] if cur_index - 1 >= 0 else None
-        next_token = token_list[cur_index + 1] if cur_index + 1 < len(token_list) else None
-        return next_token, prev_token
+        prev_type = self._types[cur_index - 1] if cur_index - 1 >= 0 else None
+        next_type = self._types[cur_index + 1] if cur_index + 1 < len(self._types) else None
+        return next_type, prev_type
 
-    def _check_mid_op(self, cur_index: int, token_list: list) -> tuple:
+    def _check_mid_op(self, cur_index: int) -> tuple:
         """
         Func that checks the validity of an operator that is binary
         :param cur_index:
-        :param token_list:
         :return: False if non valid, else true
         """
-        return (self._check_right_op(cur_index, token_list)[0] and
-                self._check_left_op(cur_index, token_list)[0]), "None"
+        return (self._check_right_op(cur_index)[0] and
+                self._check_left_op(cur_index)[0]), "None"
 
-    def _check_for_sign_minus(self, cur_index: int, token_list: list) -> bool:
+    def _check_for_sign_minus(self, cur_index: int) -> bool:
         """
         Func to check if a unary minus is a sign minus
         A sign minus is the highest precedence op and must be pushed before anything else
         :param cur_index:
-        :param token_list:
         :return: True if it is a sign minus, False if it isn't
         """
-        cur_type = token_list[cur_index].get_token_type()
-        if cur_type != "U-":
+        u_minus_code = TokenStream.OP_CODES['U-']
+        if self._types[cur_index] != u_minus_code:
             return False
         # if the prev minus was a signed one the current one is as well
         if cur_index != 0 and (cur_index - 1) in self._signed_minus_indexes:
-            self._signed_minus_indexes.append(cur_index)
+            self._signed_minus_indexes.add(cur_index)
             return True
         # token is U-
-        prev_token = token_list[cur_index - 1] if cur_index - 1 >= 0 else None
-        if prev_token is None or prev_token.get_token_type() == "(" or prev_token.get_token_type() == "U-":
+        if cur_index == 0 or self._types[cur_index - 1] in (TokenStream.OPEN_PAREN, u_minus_code):
             return False
-        self._signed_minus_indexes.append(cur_index)
+        self._signed_minus_indexes.add(cur_index)
         return True
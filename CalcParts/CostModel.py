@@ -0,0 +1,88 @@
+from abc import ABC
+from array import array
+from math import log10
+from CalcParts.TokenStream import TokenStream
+from CalcParts.OpRegistry import OpRegistry
+
+
+class EvalLimits:
+    """
+    The limits of the evaluation of a single expression, a limit that is None isn't checked
+    max_digits: the budget of the estimated size (digits) of any value of the expression, see CostModel
+    max_operations: the max amount of postfix items (numbers and ops) that are evaluated
+    time_limit: the max amount of seconds the evaluation takes
+    """
+    __slots__ = ("max_digits", "max_operations", "time_limit")
+
+    def __init__(self, max_digits: float = None, max_operations: int = None, time_limit: float = None):
+        self.max_digits = max_digits
+        self.max_operations = max_operations
+        self.time_limit = time_limit
+
+
+class CostModel(ABC):
+    """
+    Static class that estimates the size of the values of a postfix list before anything is computed.
+    Every value is bounded by its log10 magnitude, about its amount of digits, that is estimated from the magnitudes of
+    its operands by the op (see estimate_digits of the operator classes), so the size of ie 9999!^9999 is found
+    from a few float ops. A number with a decimal part counts the digits of its text, as the exact backend keeps it
+    as a fraction, and the float backend, that only keeps its magnitude, counts the digits of its value and bounds
+    the ops that return floats by the size of a float (see FloatBackend).
+    The estimates are upper bounds for whole numbers, a value below 1 is as large as its reciprocal
+    """
+    @staticmethod
+    def estimate_digits(token_stream: TokenStream, post_fix: array, stack: tuple = (), backend=None) -> float:
+        """
+        Func that estimates the size of the largest value that is computed while evaluating the postfix list
+        :param token_stream: the token stream the postfix indexes point into
+        :param post_fix: the indexes of the tokens in postfix order
+        :param stack: the values that are already in the calculation stack, the stack of Evaluator.save_state
+        :param backend: the NumericBackend of the values, None estimates the values of the exact backend
+        :return: the largest log10 magnitude
+        """
+        types = token_stream.types
+        values = token_stream.values
+        estimate_funcs = OpRegistry.ESTIMATES if backend is None else backend.estimates
+        exact_literals = backend is None or backend.exact_literals
+        is_unary = TokenStream.IS_UNARY
+        number_code = TokenStream.NUMBER
+        sizes = [CostModel.get_digits(value) for value in stack]
+        largest = max(sizes, default=0.0)
+        for index in post_fix:
+            type_code = types[index]
+            if type_code == number_code:
+                value = values[index]
+                size = CostModel.get_digits(value) if value.is_integer() or not exact_literals else \
+                    float(len(token_stream.get_number_text(index)))
+                sizes.append(size)
+            elif not sizes or (not is_unary[type_code] and len(sizes) < 2):
+                # missing operands, the evaluator gives the error
+                break
+            elif is_unary[type_code]:
+                size = sizes[-1] = estimate_funcs[type_code](sizes[-1])
+            else:
+                right = sizes.pop()
+                size = sizes[-1] = estimate_funcs[type_code](sizes[-1], right)
+            if size > largest:
+                largest = size
+        return largest
+
+    @staticmethod
+    def get_digits(value) -> float:
+        """
+        :param value: a value of any numeric backend
+        :return: the log10 magnitude of the value, or of its reciprocal for values below 1
+        """
+        # the values are told apart by their methods so the float backend doesn't import decimal and fractions
+        if getattr(value, "denominator", 1) != 1:
+            # a Fraction
+            value = max(abs(value.numerator), value.denominator)
+        elif hasattr(value, "adjusted"):
+            # a Decimal
+            return float(value.adjusted() + 1) if value.is_finite() and value else 0.0
+        if not value:
+            return 0.0
+        # a value below 1 is as large as its reciprocal, like the denominator of a fraction
+        digits = abs(log10(abs(value)))
+        # nan isn't a size
+        return digits if digits == digits else 0.0
@@ -0,0 +1,251 @@
+import time
+from bisect import bisect_left
+from ErrorParts.ErrorHandler import ErrorHandler
+from CalcParts.Tokenizer import Tokenizer
+from CalcParts.Converter import Converter
+from CalcParts.CostModel import EvalLimits
+from CalcParts.Evaluator import Evaluator
+from CalcParts.NumericBackends import NumericBackend, FloatBackend
+from CalcParts.TokenStream import TokenStream
+
+
+class EvalPipeline:
+    """
+    This class holds the calculator parts (error handler, tokenizer, converter and evaluator) and with them all the
+    state of a single evaluation, the token stream, the postfix list, the stack and the errors.
+    The parts are reused between expressions, so a pipeline must only run one expression at a time, the CalcHandler
+    keeps a pool of pipelines and every call takes its own pipeline from the pool so the handler can be shared
+    between threads.
+    The engine is the front end that turns the tokens into the postfix list, the shunting yard Converter or the
+    PrattParser, both give the same postfix lists and errors.
+    The backend is the type of the values the evaluator computes with, see NumericBackend.
+    The pratt parser is only imported when it is the engine
+    """
+    ENGINES = ("shunting_yard", "pratt")
+
+    def __init__(self, fail_fast: bool = False, engine: str = "shunting_yard", subtree_cache=None,
+                 backend: NumericBackend = None, limits: EvalLimits = None):
+        """
+        :param fail_fast: the default error mode of the pipeline
+        :param engine: shunting_yard or pratt
+        :param subtree_cache: the SubtreeCache of the groups in parentheses that is shared between expressions, None
+        doesn't cache groups, the cache holds floats so it is only used with the float backend
+        :param backend: the numeric backend of the evaluator, None uses floats
+        :param limits: the budget and the limits of every evaluation, None doesn't limit the evaluations
+        """
+        if engine not in self.ENGINES:
+            raise ValueError(f"Unknown engine: {engine}, the engines are: {', '.join(self.ENGINES)}")
+        self._fail_fast = fail_fast
+        # the stages give result codes instead of raising on errors
+        self._error_handler = ErrorHandler(fail_fast, raise_errors=False)
+        self._tokenizer = Tokenizer(self._error_handler)
+        if engine == "pratt":
+            from CalcParts.PrattParser import PrattParser
+            self._converter = PrattParser(self._error_handler)
+        else:
+            self._converter = Converter(self._error_handler)
+        self._evaluator = Evaluator(self._error_handler, backend, limits)
+        self._subtree_cache = subtree_cache if isinstance(self._evaluator.get_backend(), FloatBackend) else None
+
+    def run(self, input_exp, fail_fast: bool, tracer=None):
+        """
+        Func that runs the expression through the tokenizer, converter and evaluator
+        :param input_exp: the expression string or its encoded bytes
+        :param fail_fast:
+        :param tracer: the StageTracer that gets the stage callbacks if it traces the expression, None doesn't trace it
+        :return: returns the final value or the errors the calc ran into
+        """
+        if self._subtree_cache is None or not isinstance(input_exp, str):
+            return self._run_stages(input_exp, fail_fast, tracer)
+        return self._run_with_groups(self._run_stages, input_exp, fail_fast, tracer)
+
+    def _run_with_groups(self, run_stages, input_exp: str, fail_fast: bool, tracer):
+        """
+        Func that runs the expression with the cached groups of the subtree cache
+        :param run_stages: func that runs the stages with the args of _run_stages
+        :param input_exp:
+        :param fail_fast:
+        :param tracer:
+        :return: returns the final value or the errors the calc ran into
+        """
+        groups, new_groups = self._subtree_cache.find_groups(input_exp)
+        result, errors = run_stages(input_exp, fail_fast, tracer, groups, new_groups)
+        if errors is not None and groups:
+            # a cached group can hide the errors in the expression around it, the errors are found without them
+            self.clear(fail_fast)
+            return run_stages(input_exp, fail_fast, None)
+        return result, errors
+
+    def _run_stages(self, input_exp, fail_fast: bool, tracer, groups: dict = None,
+                    new_groups: list = None):
+        """
+        Func that runs the expression through the stages
+        :param input_exp:
+        :param fail_fast:
+        :param tracer:
+        :param groups: the cached groups that are added as number tokens, see SubtreeCache.find_groups
+        :param new_groups: the groups that are added to the subtree cache if the expression has no errors
+        :return: returns the final value or the errors the calc ran into
+        """
+        # clear the prev values
+        self.clear(fail_fast)
+        token_stream = self._tokenizer.get_token_stream()
+        if isinstance(input_exp, bytes):
+            tokenize, tokenize_args = self._tokenizer.tokenize_bytes, (input_exp,)
+        else:
+            tokenize, tokenize_args = self._tokenizer.tokenize_expression, (input_exp, (), groups)
+        evaluate, evaluate_args = (self._evaluate_groups, (input_exp, new_groups)) if new_groups else \
+            (self._evaluate, (token_stream,))
+        result = None
+        # every stage returns False if it had errors, the next stages are skipped
+        if tracer is not None and tracer.begin_expression(input_exp):
+            if self._trace_stage(tracer, "tokenize", tokenize, *tokenize_args) and \
+                    self._trace_stage(tracer, "convert", self._converter.convert, token_stream):
+                result = self._trace_stage(tracer, "eval", evaluate, *evaluate_args)
+        elif tokenize(*tokenize_args) and self._converter.convert(token_stream):
+            result = evaluate(*evaluate_args)
+        if self._error_handler.has_errors():
+            # we had an error so we show all the errors
+            return None, self._error_handler.get_errors()
+        return result, None
+
+    def convert(self, input_exp, variables=()):
+        """
+        Func that runs the expression only through the tokenizer and converter, the token stream and the postfix
+        list stay in the pipeline until its next expression
+        :param input_exp:
+        :param variables: the names of the variables that can be used in the expression
+        :return: None if the expression was converted, else the errors the calc ran into
+        """
+        self.clear()
+        if self._tokenizer.tokenize_expression(input_exp, variables) and \
+                self._converter.convert(self._tokenizer.get_token_stream()):
+            return None
+        return self._error_handler.get_errors()
+
+    def get_token_stream(self):
+        """
+        :return: the token stream of the last expression
+        """
+        return self._tokenizer.get_token_stream()
+
+    def get_post_fix(self):
+        """
+        :return: the postfix indexes of the last expression
+        """
+        return self._converter.get_post_fix()
+
+    def get_max_depth(self) -> int:
+        """
+        :return: the max stack depth of the last expression
+        """
+        return self._converter.get_max_depth()
+
+    def get_error_handler(self) -> ErrorHandler:
+        """
+        :return: the error handler that holds the errors of the last expression
+        """
+        return self._error_handler
+
+    def clear(self, fail_fast: bool = None):
+        """
+        Func to clear all the old values in the calculator parts
+        :param fail_fast: the error mode of the next expression, None uses the mode of the pipeline
+        """
+        self._tokenizer.clear_tokenizer()
+        self._error_handler.clear_errors()
+        self._error_handler.set_fail_fast(self._fail_fast if fail_fast is None else fail_fast)
+        self._converter.clear_converter()
+        self._evaluator.clear_evaluator()
+
+    def _evaluate(self, token_stream):
+        """
+        Func that evaluates the converted postfix list
+        :param token_stream:
+        :return: the final value, None if there were errors
+        """
+        if not self._evaluator.eval(token_stream, self._converter.get_post_fix(), self._converter.get_max_depth()):
+            return None
+        return self._evaluator.get_final()
+
+    def _evaluate_groups(self, input_exp: str, new_groups: list):
+        """
+        Func that evaluates the postfix list and puts the values of the new groups in the subtree cache. The postfix
+        items of a group are a single range that ends with the value of the group on the top of the stack, so the
+        postfix list is evaluated in parts that end at the ends of the groups
+        :param input_exp:
+        :param new_groups: list of (position of (, position of )) of the groups
+        :return: the final value, None if there were errors
+        """
+        token_stream = self._tokenizer.get_token_stream()
+        post_fix = self._converter.get_post_fix()
+        max_depth = self._converter.get_max_depth()
+        values = []
+        position = 0
+        for end, text in self._get_group_ends(input_exp, new_groups):
+            if not self._evaluator.eval(token_stream, post_fix[position:end], max_depth):
+                return None
+            values.append((text, self._evaluator.peek()))
+            position = end
+        if not self._evaluator.eval(token_stream, post_fix[position:], max_depth):
+            return None
+        final = self._evaluator.get_final()
+        if self._error_handler.has_errors():
+            return None
+        # only the groups of an expression without errors are cached
+        for text, value in values:
+            self._subtree_cache.put(text, value)
+        return final
+
+    def _get_group_ends(self, input_exp: str, new_groups: list) -> list:
+        """
+        Func that finds where the postfix items of every group end, the postfix items of a group are a single range
+        that ends with the value of the group on the top of the stack. A group whose ( isn't a paren token (it is in
+        a group that was added as a single number) is skipped
+        :param input_exp:
+        :param new_groups: list of (position of (, position of )) of the groups
+        :return: sorted list of (postfix length at the end of the group, text of the group)
+        """
+        token_stream = self._tokenizer.get_token_stream()
+        starts = token_stream.starts
+        types = token_stream.types
+        post_fix = self._converter.get_post_fix()
+        # the place of every token in the postfix list, the parentheses aren't in it
+        post_fix_positions = dict(zip(post_fix, range(len(post_fix))))
+        group_ends = []
+        for open_pos, close_pos in new_groups:
+            open_index = bisect_left(starts, open_pos)
+            if open_index == len(starts) or starts[open_index] != open_pos or \
+                    types[open_index] != TokenStream.OPEN_PAREN:
+                continue
+            close_index = bisect_left(starts, close_pos)
+            # the group starts with its first operand and holds all the tokens in it except for the parentheses
+            first_index = open_index + 1
+            while not TokenStream.IS_OPERAND[types[first_index]]:
+                first_index += 1
+            paren_count = types[open_index:close_index].count(TokenStream.OPEN_PAREN) + \
+                types[open_index:close_index].count(TokenStream.CLOSE_PAREN)
+            group_ends.append((post_fix_positions[first_index] + close_index - open_index - paren_count,
+                               input_exp[open_pos:close_pos + 1]))
+        group_ends.sort()
+        return group_ends
+
+    def _trace_stage(self, tracer, stage: str, stage_func, *args):
+        """
+        Func that runs a single stage between the callbacks of the tracer
+        :param tracer:
+        :param stage:
+        :param stage_func:
+        :param args: the args of the stage func
+        :return: the return value of the stage func
+        """
+        error_count = len(self._error_handler.get_errors())
+        tracer.stage_start(stage)
+        start = time.perf_counter_ns()
+        try:
+            return stage_func(*args)
+        finally:
+            # the stage is also traced when it stops with errors
+            elapsed_ns = time.perf_counter_ns() - start
+            tracer.stage_end(stage, elapsed_ns, len(self._tokenizer.get_token_stream()),
+                             len(self._converter.get_post_fix()), len(self._error_handler.get_errors()) - error_count)
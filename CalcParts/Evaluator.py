@@ -1,6 +1,10 @@
+import time
+from array import array
 from ErrorParts.ErrorHandler import ErrorHandler
 from ErrorParts.Errors import *
-from CalcParts.Operators import IUnaryOperator
+from CalcParts.CostModel import CostModel, EvalLimits
+from CalcParts.NumericBackends import NumericBackend, FloatBackend
+from CalcParts.TokenStream import TokenStream
 
 
 class Evaluator:
@@ -14,97 +18,231 @@ class Evaluator:
     6. Pow overflow
     7. Invalid attempt to preform hash on a negative number
     8. Invalid attempt to preform hash on a very small / very large number
+    9. The estimated size of the values is over the budget, or the evaluation ran over its operation count or time
+    limit (see EvalLimits)
     Any error that occurs in this stage is a fatal one because we can't continue to evaluate if we can't preform an
-    operation on a prev token, so when we encounter an error in this stage we stop the eval process
+    operation on a prev token, so when we encounter an error in this stage we stop the eval process.
+    The postfix list holds indexes into the token stream, the stack is a preallocated list that is indexed instead of
+    pushed to and popped from.
+    The values and the ops are the ones of the numeric backend (see NumericBackend), floats by default
     """
 
-    def __init__(self, error_handler: ErrorHandler):
+    # the custom operator exceptions and the error types they are shown as
+    _operator_errors = (
+        (InvalidFactorialError, "Invalid_Factorial_Error"),
+        (LargeNumberError, "Large_Number_Error"),
+        (InvalidHashError, "Invalid_Hash_Error"),
+        (SmallNumberError, "Small_Number_Error"),
+        (InvalidPowerError, "Zero_Pow_Error"),
+        (PowerOverflowError, "Pow_Overflow_Error"),
+        (CostBudgetError, "Cost_Budget_Error"),
+        (EvalLimitError, "Eval_Limit_Error"),
+    )
+    # amount of postfix items that are evaluated between the checks of the time limit
+    CHECK_EVERY = 1024
+
+    def __init__(self, error_handler: ErrorHandler, backend: NumericBackend = None, limits: EvalLimits = None):
         self._error_handler = error_handler
+        self._backend = backend if backend is not None else FloatBackend()
+        self._limits = limits
+        # the stack is allocated once and reused, only the amount of values in it is reset
         self._calculation_stack = []
-        self._encountered_fatal_error = False
+        self._stack_size = 0
+        # the amount of evaluated postfix items and the time limit of the current expression
+        self._operation_count = 0
+        self._deadline = None
 
-    def eval(self, post_fix_token_list: list):
+    def eval(self, token_stream: TokenStream, post_fix: array, max_depth: int = None) -> bool:
         """
         Main eval func that takes the post fix list and converts it into a single number if possible
-        :param post_fix_token_list:
+        :param token_stream: the token stream the postfix indexes point into
+        :param post_fix: the indexes of the tokens in postfix order
+        :param max_depth: the max amount of values in the stack, see Converter.get_max_depth
+        :return: True if there were no errors, see ErrorHandler.check_errors
+        """
+        if self._limits is None:
+            self._eval_items(token_stream, post_fix, max_depth)
+        else:
+            self._eval_limited(token_stream, post_fix, max_depth)
+        # check if we need to show errors
+        return self._error_handler.check_errors()
+
+    def _eval_limited(self, token_stream: TokenStream, post_fix: array, max_depth: int):
+        """
+        Func that checks the budget and the operation count before the postfix list is evaluated, and evaluates it in
+        chunks of CHECK_EVERY items with the time limit checked between the chunks. A single op can't be stopped
+        while it runs, the budget is what keeps every op small
+        :param token_stream:
+        :param post_fix:
+        :param max_depth:
+        """
+        limits = self._limits
+        try:
+            if limits.max_digits is not None:
+                digits = CostModel.estimate_digits(token_stream, post_fix,
+                                                   tuple(self._calculation_stack[:self._stack_size]), self._backend)
+                if digits > limits.max_digits:
+                    raise CostBudgetError("Cost_Budget", digits, limits.max_digits)
+            self._operation_count += len(post_fix)
+            if limits.max_operations is not None and self._operation_count > limits.max_operations:
+                raise EvalLimitError("Operation_Limit", limits.max_operations)
+            if limits.time_limit is None:
+                self._eval_items(token_stream, post_fix, max_depth)
+                return
+            if self._deadline is None:
+                self._deadline = time.perf_counter() + limits.time_limit
+            for start in range(0, len(post_fix), self.CHECK_EVERY):
+                if time.perf_counter() > self._deadline:
+                    raise EvalLimitError("Time_Limit", limits.time_limit)
+                if not self._eval_items(token_stream, post_fix[start:start + self.CHECK_EVERY], max_depth):
+                    return
+        except (CostBudgetError, EvalLimitError) as e:
+            self._error_handler.add_error(Evaluator.exception_to_error(e))
+
+    def _eval_items(self, token_stream: TokenStream, post_fix: array, max_depth: int) -> bool:
+        """
+        Func that evaluates postfix items on the stack
+        :param token_stream:
+        :param post_fix:
+        :param max_depth:
+        :return: True if the items were evaluated without errors
         """
-        for token in post_fix_token_list:
-            if not self._encountered_fatal_error:
-                if token.get_token_type() == "Number":
-                    self._handle_number_token(token)
+        if max_depth is None:
+            max_depth = len(post_fix)
+        calculation_stack = self._calculation_stack
+        if len(calculation_stack) < max_depth:
+            calculation_stack.extend([0.0] * (max_depth - len(calculation_stack)))
+        types = token_stream.types
+        values = self._backend.get_values(token_stream)
+        op_funcs = self._backend.op_funcs
+        is_unary = TokenStream.IS_UNARY
+        number_code = TokenStream.NUMBER
+        # the stack starts empty unless a saved state was restored
+        stack_size = self._stack_size
+        try:
+            for index in post_fix:
+                type_code = types[index]
+                if type_code == number_code:
+                    calculation_stack[stack_size] = values[index]
+                    stack_size += 1
+                elif is_unary[type_code]:
+                    if stack_size < 1:
+                        raise IndexError("Missing operand in the calculation stack")
+                    calculation_stack[stack_size - 1] = op_funcs[type_code](calculation_stack[stack_size - 1])
                 else:
-                    # op token
-                    self._handle_operator_token(token)
+                    if stack_size < 2:
+                        raise IndexError("Missing operands in the calculation stack")
+                    stack_size -= 1
+                    # eval the binary op and put it back in the place of the first operand
+                    calculation_stack[stack_size - 1] = op_funcs[type_code](calculation_stack[stack_size - 1],
+                                                                            calculation_stack[stack_size])
+        except Exception as e:
+            # any error in this stage is fatal, stop evaluating
+            self._error_handler.add_error(Evaluator.exception_to_error(e))
+            self._stack_size = stack_size
+            return False
+        self._stack_size = stack_size
+        return True
+
+    def eval_dag(self, dag) -> bool:
+        """
+        Func that evaluates the DAG of a postfix list, every unique subterm is evaluated once and the final value is
+        put in the stack like after eval, the DAG is only evaluated with floats
+        :param dag: ExpressionDag of the postfix list
+        :return: True if there were no errors
+        """
+        try:
+            final_value = dag.evaluate()
+            self.restore_state(((final_value,), 0, 0.0))
+        except Exception as e:
+            # any error in this stage is fatal, stop evaluating
+            self._error_handler.add_error(Evaluator.exception_to_error(e))
         # check if we need to show errors
-        self._error_handler.check_errors()
+        return self._error_handler.check_errors()
+
+    def peek(self):
+        """
+        :return: the value on the top of the stack, the value of the postfix items that were evaluated last
+        """
+        return self._calculation_stack[self._stack_size - 1]
 
     def get_final(self):
+        """
+        :return: the final value, None if it can't be shown and the handler gives result codes
+        """
         # get the final num
-        # check if the value has decimal point
-        final_value = self._calculation_stack.pop()
-        if final_value % 1 == 0:
-            final_value = int(final_value)
-        return final_value
-
-    def _set_error(self, error_type, error_msg):
-        """
-        Func that adds an error and sets the fatal error flag
-        :param error_type:
-        :param error_msg:
-        """
-        self._error_handler.add_error(BaseCalcError(error_type, error_msg))
-        self._encountered_fatal_error = True
-
-    def _handle_operator_token(self, token):
-        """
-        Func that handles the operator evaluation, checks if the operator is unary or binary then attempts
-        to preform its func
-        :param token:
-        """
-        token_class = token.get_token_value()
-        if isinstance(token_class, IUnaryOperator):
-            # unary op
-            num_val = self._calculation_stack.pop()
-            try:
-                self._calculation_stack.append(token_class.unary_evaluate(num_val))
-            except InvalidFactorialError as e:
-                self._set_error("Invalid_Factorial_Error", e)
-            except LargeNumberError as e:
-                self._set_error("Large_Number_Error", e)
-            except InvalidHashError as e:
-                self._set_error("Invalid_Hash_Error", e)
-            except SmallNumberError as e:
-                self._set_error("Small_Number_Error", e)
-            except Exception as e:
-                # this should never happen but is used as a safeguard
-                self._set_error("Safe_Guard_Error", e)
+        if self._stack_size == 0:
+            raise IndexError("The calculation stack is empty")
+        self._stack_size -= 1
+        try:
+            return self._backend.format_final(self._calculation_stack[self._stack_size])
+        except Exception as e:
+            # an exact value can be too large to show
+            self._error_handler.add_error(Evaluator.exception_to_error(e))
+        self._error_handler.check_errors()
 
-        else:
-            second_operand = self._calculation_stack.pop()
-            first_operand = self._calculation_stack.pop()
-            # eval the binary op and push it back
-            try:
-                self._calculation_stack.append(token_class.binary_evaluate(first_operand, second_operand))
-            except ZeroDivisionError:
-                self._set_error("Zero_Div_Error", "Cannot divide value by 0")
-            except InvalidPowerError as e:
-                self._set_error("Zero_Pow_Error", e)
-            except PowerOverflowError as e:
-                self._set_error("Pow_Overflow_Error", e)
-            except Exception as e:
-                # this should never happen but is used as a safeguard
-                self._set_error("Safe_Guard_Error", e)
-
-    def _handle_number_token(self, token):
-        """
-        Func that adds a number to the stack as a float
-        :param token:
-        """
-        self._calculation_stack.append(float(token.get_token_value()))
+    @staticmethod
+    def format_final(final_value):
+        """
+        Func that turns a final value with no decimal part into an int
+        :param final_value:
+        :return: the formatted final value
+        """
+        return FloatBackend.format_final(final_value)
+
+    def get_backend(self) -> NumericBackend:
+        """
+        :return: the numeric backend of the evaluator
+        """
+        return self._backend
+
+    @staticmethod
+    def exception_to_error(exception: Exception) -> BaseCalcError:
+        """
+        Func that maps an exception raised by an operator to the calc error that is shown to the user, the exception
+        is the operand of the error and its msg is only created when it is shown
+        :param exception:
+        :return: the matching BaseCalcError
+        """
+        if isinstance(exception, ZeroDivisionError):
+            return BaseCalcError("Zero_Div_Error", None, (), (exception,))
+        for exception_type, error_type in Evaluator._operator_errors:
+            if isinstance(exception, exception_type):
+                return BaseCalcError(error_type, None, (), (exception,))
+        # this should never happen but is used as a safeguard
+        return BaseCalcError("Safe_Guard_Error", None, (), (exception,))
+
+    def save_state(self) -> tuple:
+        """
+        Func that saves the values in the stack and the counts of the limits, the evaluation of a postfix list can be
+        resumed from the state
+        :return: (the values in the stack, amount of evaluated postfix items, seconds the evaluation ran)
+        """
+        elapsed = 0.0
+        if self._deadline is not None:
+            elapsed = time.perf_counter() - self._deadline + self._limits.time_limit
+        return tuple(self._calculation_stack[:self._stack_size]), self._operation_count, elapsed
+
+    def restore_state(self, state: tuple):
+        """
+        Func that puts saved values back in the stack, the next eval continues from them. The limits keep counting
+        from the saved counts, so a resumed evaluation has the same limits as a full one
+        :param state: see save_state
+        """
+        stack, operation_count, elapsed = state
+        if len(self._calculation_stack) < len(stack):
+            self._calculation_stack.extend([0.0] * (len(stack) - len(self._calculation_stack)))
+        self._calculation_stack[:len(stack)] = stack
+        self._stack_size = len(stack)
+        self._operation_count = operation_count
+        self._deadline = None
+        if self._limits is not None and self._limits.time_limit is not None:
+            self._deadline = time.perf_counter() + self._limits.time_limit - elapsed
 
     def clear_evaluator(self):
         """
         Func that clears the evaluator of used data, so that it can be used for the next expression
         """
-        self._calculation_stack = []
-        self._encountered_fatal_error = False
+        self._stack_size = 0
+        self._operation_count = 0
+        self._deadline = None
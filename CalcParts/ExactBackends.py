@@ -0,0 +1,280 @@
+"""
+The backends whose values aren't floats, see NumericBackend. They are only imported when a handler uses them, so the
+float backend doesn't import decimal and fractions
+"""
+from decimal import Decimal, Context, InvalidOperation, DivisionByZero
+from fractions import Fraction
+from math import factorial, log10
+from operator import add, sub, mul, mod
+from ErrorParts.Errors import *
+from CalcParts.Kernels import OpKernels
+from CalcParts.NumericBackends import NumericBackend, FloatBackend
+from CalcParts.Operators import OpData
+from CalcParts.TokenStream import TokenStream
+
+
+class ExactBackend(NumericBackend):
+    """
+    Exact backend, whole numbers are python ints and the other numbers are Fractions, so no value is rounded and a
+    whole number isn't limited to the 2^53 of a float or a factorial to 170!.
+    An op on ints that has a whole result gives an int, only a division or an average that isn't whole gives a
+    Fraction, and a Fraction with a whole value is turned back into an int. A power with an exponent that isn't
+    whole can't be exact, so it gives a float like in the float backend and the ops after it work with the float
+    """
+    name = "exact"
+    # the digits of a value are bounded as python can't turn an int with too many digits into a str
+    MAX_DIGITS = 4000
+    # the largest factorial with less than MAX_DIGITS digits
+    MAX_FACTORIAL = 1449
+    # the whole floats below it are exact, so a number token with such a value doesn't need its text
+    _max_exact_float = float(2 ** 53)
+
+    def literal(self, token_stream: TokenStream, index: int):
+        value = token_stream.values[index]
+        if value.is_integer() and value < self._max_exact_float:
+            return int(value)
+        return self._normalize(Fraction(token_stream.get_number_text(index)))
+
+    def format_final(self, final_value):
+        if final_value.__class__ is float:
+            return FloatBackend.format_final(final_value)
+        if self._count_digits(final_value) > self.MAX_DIGITS:
+            raise LargeNumberError("Result_Size", self.MAX_DIGITS)
+        return final_value
+
+    def _coerce(self, value):
+        """
+        Func that converts a value of a registered operator, a whole float that is exact is an int like a number token
+        :param value:
+        :return: int, Fraction or float
+        """
+        if value.__class__ is int:
+            return value
+        if value.__class__ is float:
+            return int(value) if value.is_integer() and abs(value) < self._max_exact_float else value
+        return self._normalize(Fraction(value))
+
+    def _create_op_funcs(self) -> dict:
+        return {
+            '+': self._exact_op(add),
+            '-': self._exact_op(sub),
+            '*': self._exact_op(mul),
+            '%': self._exact_op(mod),
+            '/': self._divide,
+            '@': lambda num1, num2: self._divide(num1 + num2, 2),
+            '^': self._power,
+            '!': self._factorial,
+            '#': self._hash,
+        }
+
+    @staticmethod
+    def _normalize(value):
+        """
+        Func that turns a Fraction with a whole value into an int
+        :param value:
+        :return: the value
+        """
+        if value.__class__ is Fraction and value.denominator == 1:
+            return value.numerator
+        return value
+
+    @staticmethod
+    def _exact_op(op):
+        """
+        :param op: binary func of python numbers
+        :return: the op func that turns its whole Fraction results into ints
+        """
+        def exact_op(num1, num2):
+            result = op(num1, num2)
+            if result.__class__ is Fraction and result.denominator == 1:
+                return result.numerator
+            return result
+        return exact_op
+
+    @staticmethod
+    def _count_digits(num) -> float:
+        """
+        :param num: int or Fraction
+        :return: about the amount of digits of the larger part of the number, without turning it into a str
+        """
+        num = abs(num)
+        if num.__class__ is Fraction:
+            num = max(num.numerator, num.denominator)
+        return log10(num) if num > 1 else 0.0
+
+    def _divide(self, num1, num2):
+        if num1.__class__ is int and num2.__class__ is int:
+            if num2 == 0:
+                raise ZeroDivisionError("division by zero")
+            quotient, remainder = divmod(num1, num2)
+            return quotient if remainder == 0 else Fraction(num1, num2)
+        return self._normalize(num1 / num2)
+
+    def _power(self, num1, num2):
+        if num1.__class__ is float or num2.__class__ is not int:
+            # the result isn't exact, the floats of the operands are raised by the power op
+            return OpData.get_op_class('^').binary_evaluate(self._to_float(num1), self._to_float(num2))
+        if num1 == 0 and num2 < 0:
+            raise InvalidPowerError("Invalid_Power", num1, num2)
+        # the powers of 0, 1 and -1 have a single digit for any exponent
+        if num1 == 0:
+            return 0 if num2 else 1
+        if num1 == 1 or num1 == -1:
+            return num1 ** (num2 % 2)
+        # the exponent can be too large to be a float, so it is compared and not multiplied
+        if abs(num2) > self.MAX_DIGITS / self._count_digits(num1):
+            raise PowerOverflowError("Power_Overflow", num1, num2)
+        if num2 < 0:
+            return self._normalize(Fraction(1) / num1 ** -num2)
+        # a fraction to the power of 0 is the fraction 1
+        return self._normalize(num1 ** num2)
+
+    def _factorial(self, num):
+        if num.__class__ is float:
+            return OpData.get_op_class('!').unary_evaluate(num)
+        if num.__class__ is not int:
+            raise InvalidFactorialError("Factorial_Not_Int")
+        elif num < 0:
+            raise InvalidFactorialError("Factorial_Negative")
+        elif num > self.MAX_FACTORIAL:
+            raise LargeNumberError("Factorial_Size", num)
+        return OpKernels.factorial(num) if num < OpKernels.MAX_FACTORIAL else factorial(num)
+
+    def _hash(self, num):
+        if num.__class__ is not int or num < 0:
+            # the digits of a number that isn't whole are the digits of its float, like in the float backend
+            return OpData.get_op_class('#').unary_evaluate(num if num.__class__ is int else self._to_float(num))
+        if self._count_digits(num) > self.MAX_DIGITS:
+            raise LargeNumberError("Hash_Large", num)
+        return sum(map(int, str(num)))
+
+    @staticmethod
+    def _to_float(num) -> float:
+        """
+        :param num:
+        :return: the float of the number
+        """
+        try:
+            return float(num)
+        except OverflowError:
+            raise LargeNumberError("Float_Large")
+
+
+class DecimalBackend(NumericBackend):
+    """
+    Decimal backend, every value is a Decimal that is rounded to the precision of the backend, so decimal fractions
+    like 0.1 are exact and the precision can be larger than the 15 digits of a float.
+    The ops use the context of the backend and not the context of the thread, so a handler always computes with its
+    own precision. Like in the float backend an overflow gives Infinity except for a power that overflows
+    """
+    name = "decimal"
+
+    def __init__(self, precision: int = 28):
+        """
+        :param precision: the amount of significant digits of the values
+        """
+        self.precision = precision
+        self._context = Context(prec=precision, traps=[InvalidOperation, DivisionByZero])
+        super().__init__()
+
+    def literal(self, token_stream: TokenStream, index: int):
+        value = token_stream.values[index]
+        if value.is_integer() and value < ExactBackend._max_exact_float:
+            return self._context.create_decimal(int(value))
+        return self._context.create_decimal(token_stream.get_number_text(index))
+
+    def format_final(self, final_value):
+        # a whole value with more digits than the precision was rounded, so it is kept as a decimal
+        if final_value.is_finite() and final_value == final_value.to_integral_value() and \
+                final_value.adjusted() < self.precision:
+            return int(final_value)
+        return final_value
+
+    def _coerce(self, value) -> Decimal:
+        """
+        Func that converts a value of a registered operator to a decimal rounded to the precision, a float is
+        converted by its shortest text like a number token
+        :param value:
+        :return: the Decimal
+        """
+        if value.__class__ is float:
+            return self._context.create_decimal(repr(value))
+        if value.__class__ is Fraction:
+            return self._context.divide(Decimal(value.numerator), Decimal(value.denominator))
+        return self._context.create_decimal(value)
+
+    def _create_op_funcs(self) -> dict:
+        context = self._context
+        return {
+            '+': context.add,
+            '-': context.subtract,
+            '*': context.multiply,
+            '/': self._divide,
+            '@': lambda num1, num2: context.divide(context.add(num1, num2), 2),
+            '%': self._modulo,
+            '^': self._power,
+            'U-': context.minus,
+            '~': context.minus,
+            '!': self._factorial,
+            '#': self._hash,
+        }
+
+    def _create_estimates(self) -> dict:
+        # # sums the digits of the coefficient, a value that isn't whole has up to precision digits
+        max_digits = max(self.precision, OpData.get_op_class('#').FLOAT_DIGITS)
+        return {'#': lambda digits: log10(9 * max(digits + 1, max_digits))}
+
+    def _divide(self, num1: Decimal, num2: Decimal) -> Decimal:
+        if not num2:
+            raise ZeroDivisionError("division by zero")
+        return self._context.divide(num1, num2)
+
+    def _modulo(self, num1: Decimal, num2: Decimal) -> Decimal:
+        if not num2:
+            raise ZeroDivisionError("modulo by zero")
+        try:
+            remainder = self._context.remainder(num1, num2)
+        except InvalidOperation:
+            # the whole part of the quotient has more digits than the precision
+            raise LargeNumberError("Modulo_Large", num1, num2, self.precision)
+        # the remainder has the sign of the divisor like the float modulo
+        if remainder and (remainder < 0) != (num2 < 0):
+            remainder = self._context.add(remainder, num2)
+        return remainder
+
+    def _power(self, num1: Decimal, num2: Decimal) -> Decimal:
+        if not num2:
+            # decimal doesn't define 0^0, the float power gives 1
+            return Decimal(1)
+        try:
+            result = self._context.power(num1, num2)
+        except InvalidOperation:
+            raise InvalidPowerError("Invalid_Power", num1, num2)
+        if result.is_infinite():
+            if not num1:
+                raise InvalidPowerError("Invalid_Power", num1, num2)
+            raise PowerOverflowError("Power_Overflow", num1, num2)
+        return result
+
+    def _factorial(self, num: Decimal) -> Decimal:
+        if num != num.to_integral_value():
+            raise InvalidFactorialError("Factorial_Not_Int")
+        elif num < 0:
+            raise InvalidFactorialError("Factorial_Negative")
+        elif num > ExactBackend.MAX_FACTORIAL:
+            raise LargeNumberError("Factorial_Size", num)
+        num = int(num)
+        return self._context.create_decimal(OpKernels.factorial(num) if num < OpKernels.MAX_FACTORIAL else
+                                            factorial(num))
+
+    def _hash(self, num: Decimal) -> Decimal:
+        if num < 0:
+            raise InvalidHashError("Hash_Negative", num)
+        # check for small numbers
+        elif num < Decimal("1e-10") and num != 0:
+            raise SmallNumberError("Hash_Small", num)
+        # a whole number with more digits than the precision was rounded
+        elif num.adjusted() >= self.precision:
+            raise LargeNumberError("Hash_Large", num)
+        # the digits of the coefficient, the exponent only adds zeros
+        return Decimal(sum(num.as_tuple().digits))
@@ -0,0 +1,86 @@
+from array import array
+from CalcParts.TokenStream import TokenStream
+
+
+class ExpressionDag:
+    """
+    Hash consed DAG of a postfix list, every unique subterm of the expression is a single node so a subterm that
+    shows up many times (ie (big)^2+(big)*3) is evaluated once.
+    A node is a number or an operator with the node ids of its operands, the nodes are kept in a list in the
+    order of their first use in the postfix list, so the operands of a node always come before it and evaluating the
+    nodes in order runs the ops in the same order as the evaluator. The first op that fails in the postfix list is
+    always the first use of its node (an earlier copy would have failed first), so the DAG fails with the same error
+    """
+
+    def __init__(self):
+        # a number node is its float value and an op node is a tuple of its type code and the node ids of its
+        # operands, the node is also its key in the hash consing dict
+        self.nodes = []
+        # the node of the final value
+        self.root = -1
+
+    def __len__(self):
+        return len(self.nodes)
+
+    @staticmethod
+    def build(token_stream: TokenStream, post_fix: array):
+        """
+        Func that builds the DAG of a postfix list, the same subterms are found by looking up every node in a dict
+        :param token_stream: the token stream the postfix indexes point into
+        :param post_fix: the indexes of the tokens in postfix order
+        :return: the ExpressionDag, None if the postfix list has tokens that aren't numbers or operators or is missing
+        operands
+        """
+        dag = ExpressionDag()
+        nodes = dag.nodes
+        types = token_stream.types
+        values = token_stream.values
+        is_operator = TokenStream.IS_OPERATOR
+        is_unary = TokenStream.IS_UNARY
+        number_code = TokenStream.NUMBER
+        node_ids = {}
+        get_node = node_ids.get
+        stack = []
+        push = stack.append
+        pop = stack.pop
+        try:
+            for index in post_fix:
+                type_code = types[index]
+                if type_code == number_code:
+                    node = values[index]
+                elif is_unary[type_code]:
+                    node = (type_code, pop())
+                elif is_operator[type_code]:
+                    right = pop()
+                    node = (type_code, pop(), right)
+                else:
+                    return None
+                node_id = get_node(node)
+                if node_id is None:
+                    node_id = node_ids[node] = len(nodes)
+                    nodes.append(node)
+                push(node_id)
+        except IndexError:
+            # an op is missing operands
+            return None
+        if not stack:
+            return None
+        dag.root = stack[-1]
+        return dag
+
+    def evaluate(self):
+        """
+        Func that evaluates every node once, the op exceptions aren't caught (see Evaluator.eval_dag)
+        :return: the raw final value
+        """
+        op_classes = TokenStream.OP_CLASSES
+        results = []
+        push = results.append
+        for node in self.nodes:
+            if node.__class__ is float:
+                push(node)
+            elif len(node) == 2:
+                push(op_classes[node[0]].unary_evaluate(results[node[1]]))
+            else:
+                push(op_classes[node[0]].binary_evaluate(results[node[1]], results[node[2]]))
+        return results[self.root]
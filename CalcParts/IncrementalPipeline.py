@@ -0,0 +1,210 @@
+from bisect import bisect_left
+from CalcParts.CostModel import EvalLimits
+from CalcParts.EvalPipeline import EvalPipeline
+from CalcParts.NumericBackends import NumericBackend
+
+
+class IncrementalPipeline(EvalPipeline):
+    """
+    Pipeline for expressions that are edited and run again, like in the interactive loop where a long expression is
+    built by adding terms to it. The pipeline remembers its last expression and when the next expression starts with
+    the same text, the work on that common prefix is reused:
+    1. The tokens that are fully inside the common prefix are kept and only the rest of the expression is scanned
+    2. The converter resumes from the last state it saved before the changed tokens, the states are saved after at
+    least CHECKPOINT_EVERY tokens and at least as many tokens as the stacks they copy (see Converter.convert)
+    3. The evaluator resumes from the stack it held at the end of the reused postfix part
+    So an edit at the end of an expression costs time by the size of the edit and the nesting depth at the edit and
+    not by the size of the expression, and the saved states take linear time and memory like a full run.
+    States are only saved while the expression has no errors, and an expression with token errors isn't reused, so
+    the results and the errors are always the same as the ones of a full run.
+    With a subtree cache the cached groups after the kept tokens are added as single numbers and the values of the
+    new groups are cached, a kept group token is always the same group as its whole text is in the common prefix
+    """
+    # the pratt parser parses recursively so it can't resume from a saved state, only the converter is incremental
+    ENGINES = ("shunting_yard",)
+
+    def __init__(self, fail_fast: bool = False, backend: NumericBackend = None, limits: EvalLimits = None,
+                 engine: str = "shunting_yard", subtree_cache=None):
+        super().__init__(fail_fast, engine, subtree_cache, backend, limits)
+        # the last expression, None if its tokens can't be reused
+        self._last_exp = None
+        # the saved converter states of the last expression by their token index
+        self._converter_states = []
+        # (postfix length, saved evaluator state) of the last expression
+        self._evaluator_states = []
+        # the postfix length of the converter state the last conversion resumed from, the evaluator states up to it
+        # are still valid
+        self._reused_length = 0
+        # amount of tokens / postfix items that the last run reused
+        self._reused = (0, 0)
+
+    def run(self, input_exp, fail_fast: bool, tracer=None):
+        """
+        Func that runs the expression through the stages, reusing the work of the last expression
+        :param input_exp:
+        :param fail_fast:
+        :param tracer: the StageTracer that gets the stage callbacks if it traces the expression, None doesn't trace it
+        :return: returns the final value or the errors the calc ran into
+        """
+        if self._subtree_cache is None:
+            return self._run_incremental(input_exp, fail_fast, tracer)
+        return self._run_with_groups(self._run_incremental, input_exp, fail_fast, tracer)
+
+    def _run_incremental(self, input_exp: str, fail_fast: bool, tracer, groups: dict = None,
+                         new_groups: list = None):
+        """
+        Func that runs the stages from the saved states
+        :param input_exp:
+        :param fail_fast:
+        :param tracer:
+        :param groups: the cached groups that are added as number tokens, see SubtreeCache.find_groups
+        :param new_groups: the groups that are added to the subtree cache if the expression has no errors
+        :return: returns the final value or the errors the calc ran into
+        """
+        token_count = self._get_reusable_token_count(input_exp)
+        self._reused = (token_count, 0)
+        self._last_exp = None
+        self._error_handler.clear_errors()
+        self._error_handler.set_fail_fast(self._fail_fast if fail_fast is None else fail_fast)
+        result = None
+        if tracer is not None and tracer.begin_expression(input_exp):
+            if self._trace_stage(tracer, "tokenize", self._tokenize, input_exp, token_count, groups) and \
+                    self._trace_stage(tracer, "convert", self._convert, token_count):
+                result = self._trace_stage(tracer, "eval", self._evaluate_from_states, input_exp, new_groups)
+        elif self._tokenize(input_exp, token_count, groups) and self._convert(token_count):
+            result = self._evaluate_from_states(input_exp, new_groups)
+        if self._error_handler.has_errors():
+            return None, self._error_handler.get_errors()
+        return result, None
+
+    def get_reused(self) -> tuple:
+        """
+        :return: (amount of reused tokens, amount of reused postfix items) of the last run
+        """
+        return self._reused
+
+    def clear(self, fail_fast: bool = None):
+        """
+        Func to clear all the old values, the next expression isn't reused
+        :param fail_fast:
+        """
+        super().clear(fail_fast)
+        self._last_exp = None
+        self._converter_states.clear()
+        self._evaluator_states.clear()
+
+    def _get_reusable_token_count(self, input_exp: str) -> int:
+        """
+        Func that finds the amount of tokens of the last expression that are the same in the new expression, a token
+        is the same if the next token starts inside the common prefix, the chars after a token can extend it
+        :param input_exp:
+        :return: the amount of tokens to keep
+        """
+        if self._last_exp is None:
+            return 0
+        prefix_length = self._get_common_prefix_length(self._last_exp, input_exp)
+        return max(bisect_left(self._tokenizer.get_token_stream().starts, prefix_length) - 1, 0)
+
+    def _tokenize(self, input_exp: str, token_count: int, groups: dict = None) -> bool:
+        """
+        Func that tokenizes the expression and keeps the reusable tokens
+        :param input_exp:
+        :param token_count:
+        :param groups: the cached groups
+        :return: True if the expression has no errors
+        """
+        if not self._tokenizer.tokenize_from(input_exp, token_count, groups):
+            # the tokens of an expression with errors aren't reused
+            return False
+        self._last_exp = input_exp
+        return True
+
+    def _convert(self, token_count: int) -> bool:
+        """
+        Func that converts the tokens from the last saved state that only depends on the kept tokens
+        :param token_count: the amount of kept tokens
+        :return: True if the expression has no errors
+        """
+        converter_states = self._converter_states
+        # a state before the token at index i is valid if the tokens up to and including i were kept
+        while converter_states and converter_states[-1][0] >= token_count:
+            converter_states.pop()
+        start_index = 0
+        self._reused_length = 0
+        if converter_states:
+            # the state is saved again when the conversion resumes from it
+            state = converter_states.pop()
+            start_index, self._reused_length = state[0], state[1]
+            self._converter.restore_state(state)
+        else:
+            self._converter.clear_converter()
+        # the postfix list is only the same up to the length of the state, the evaluator states are trimmed before
+        # the conversion as a conversion error skips the evaluation
+        while self._evaluator_states and self._evaluator_states[-1][0] > self._reused_length:
+            self._evaluator_states.pop()
+        return self._converter.convert(self._tokenizer.get_token_stream(), start_index, converter_states)
+
+    def _evaluate_from_states(self, input_exp: str, new_groups: list = None):
+        """
+        Func that evaluates the postfix list from the last evaluator state that is still valid, new evaluator states
+        are saved at the postfix lengths of the converter states and the values of the new groups are taken at their
+        ends (see EvalPipeline._evaluate_groups), the groups that end in the reused part are skipped
+        :param input_exp:
+        :param new_groups: the groups that are added to the subtree cache if the expression has no errors
+        :return: the final value, None if there were errors
+        """
+        token_stream = self._tokenizer.get_token_stream()
+        post_fix = self._converter.get_post_fix()
+        max_depth = self._converter.get_max_depth()
+        evaluator_states = self._evaluator_states
+        position = 0
+        if evaluator_states:
+            position, state = evaluator_states[-1]
+            self._evaluator.restore_state(state)
+        else:
+            self._evaluator.clear_evaluator()
+        self._reused = (self._reused[0], position)
+        # (postfix length, text of the group or None for a state)
+        ends = [(state[1], None) for state in self._converter_states if state[1] > position]
+        if new_groups:
+            ends += [end for end in self._get_group_ends(input_exp, new_groups) if end[0] > position]
+            ends.sort(key=lambda end: end[0])
+        values = []
+        for length, text in ends:
+            if length > position:
+                if not self._evaluator.eval(token_stream, post_fix[position:length], max_depth):
+                    return None
+                position = length
+            if text is None:
+                evaluator_states.append((position, self._evaluator.save_state()))
+            else:
+                values.append((text, self._evaluator.peek()))
+        if not self._evaluator.eval(token_stream, post_fix[position:], max_depth):
+            return None
+        final = self._evaluator.get_final()
+        if self._error_handler.has_errors():
+            return None
+        # only the groups of an expression without errors are cached
+        for text, value in values:
+            self._subtree_cache.put(text, value)
+        return final
+
+    @staticmethod
+    def _get_common_prefix_length(first: str, second: str) -> int:
+        """
+        Func that finds the length of the common prefix of two strings, the prefixes are compared as slices in a
+        binary search so the chars aren't compared one by one in python
+        :param first:
+        :param second:
+        :return: the length of the common prefix
+        """
+        if second.startswith(first):
+            return len(first)
+        low, high = 0, min(len(first), len(second))
+        while low < high:
+            middle = (low + high + 1) // 2
+            if first[:middle] == second[:middle]:
+                low = middle
+            else:
+                high = middle - 1
+        return low
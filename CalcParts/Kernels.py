@@ -0,0 +1,47 @@
+from abc import ABC
+from functools import lru_cache
+from math import factorial
+
+
+class OpKernels(ABC):
+    """
+    Static class that holds the compute part of the operators, the operator classes check their operands and raise
+    the errors and the kernels only compute values that were already checked
+    """
+    # the factorials of all the numbers that have a factorial in the float range (0..169)
+    MAX_FACTORIAL = 170
+    FACTORIAL_TABLE = tuple(factorial(num) for num in range(MAX_FACTORIAL))
+
+    @staticmethod
+    def factorial(num: float) -> int:
+        """
+        Func that returns the factorial of a whole number in the factorial table range
+        :param num:
+        :return: the factorial as an int
+        """
+        return OpKernels.FACTORIAL_TABLE[int(num)]
+
+    @staticmethod
+    @lru_cache(maxsize=4096)
+    def digit_sum(num: float) -> int:
+        """
+        Func that sums the digits of a non negative number, the sums are memoized because the same numbers
+        show up again and again
+        :param num:
+        :return: the sum of the digits
+        """
+        if num % 1 == 0:
+            # the str of a whole float below 1e16 is its digits and .0, so the sum is done with arithmetic
+            num = int(num)
+            output = 0
+            while num:
+                num, digit = divmod(num, 10)
+                output += digit
+            return output
+        output = 0
+        # take only the non zero part if there is an e in the number
+        for char in str(num).split('e')[0]:
+            # check that the char is a digit (used for floating numbers)
+            if char.isdigit():
+                output += int(char)
+        return output
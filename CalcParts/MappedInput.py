@@ -0,0 +1,58 @@
+import mmap
+
+
+class MappedInput:
+    """
+    Class that memory maps a file of expressions, one per line, so a huge input is read by the os page by page
+    instead of being read and decoded into strings.
+    The buffer is read only and can be cut into ranges that end right after a line break, so every range holds whole
+    lines and can be evaluated on its own, ie by another worker process that maps the same file
+    """
+
+    def __init__(self, path: str):
+        """
+        :param path: path of a regular file, pipes can't be memory mapped
+        """
+        self._file = open(path, "rb")
+        try:
+            # an empty file can't be mapped
+            self._buffer = mmap.mmap(self._file.fileno(), 0, access=mmap.ACCESS_READ) if \
+                self._file.seek(0, 2) else b""
+        except BaseException:
+            self._file.close()
+            raise
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        self.close()
+
+    def get_buffer(self):
+        """
+        :return: the mapped bytes of the file, a mmap object or empty bytes for an empty file
+        """
+        return self._buffer
+
+    def split_ranges(self, chunk_bytes: int):
+        """
+        Generator that cuts the file into ranges of whole lines
+        :param chunk_bytes: the min size of a range, a range is extended to the end of its last line
+        :return: yields (start, end) of every range
+        """
+        buffer = self._buffer
+        size = len(buffer)
+        start = 0
+        while start < size:
+            line_break = buffer.find(b"\n", min(start + chunk_bytes, size) - 1)
+            end = size if line_break == -1 else line_break + 1
+            yield start, end
+            start = end
+
+    def close(self):
+        """
+        Func that unmaps the file and closes it
+        """
+        if isinstance(self._buffer, mmap.mmap):
+            self._buffer.close()
+        self._file.close()
@@ -0,0 +1,172 @@
+from abc import ABC, abstractmethod
+from math import lgamma, log, log10
+from sys import float_info
+from CalcParts.TokenStream import TokenStream
+from CalcParts.OpRegistry import OpRegistry
+
+
+class _LiteralValues:
+    """
+    The values of the number tokens of a stream in a backend, a number is converted when the evaluator reads it so
+    only the numbers that are evaluated are converted
+    """
+    __slots__ = ("_token_stream", "_literal")
+
+    def __init__(self, token_stream: TokenStream, literal):
+        self._token_stream = token_stream
+        self._literal = literal
+
+    def __getitem__(self, index: int):
+        return self._literal(self._token_stream, index)
+
+
+class NumericBackend(ABC):
+    """
+    Abstract numeric backend, the type of the values the evaluator works with.
+    The evaluator reads the number tokens through the backend and calls the op funcs of the backend by the type code
+    of the op. The op funcs are the kernels of the operators (OpRegistry) and a backend only replaces the
+    ones that depend on the type of its values, so the ops raise the same errors in every backend.
+    The kernels of the registered operators don't know the backend, their values are converted with _coerce
+    """
+    # the names of the backends, see create
+    NAMES = ("float", "exact", "decimal")
+    # func that converts a value of a registered operator kernel to a value of the backend, None keeps the value
+    _coerce = None
+    # True if a number with a decimal part keeps all the digits of its text, see CostModel
+    exact_literals = True
+
+    def __init__(self):
+        op_funcs = list(OpRegistry.KERNELS)
+        if self._coerce is not None:
+            for type_code, is_plugin in enumerate(OpRegistry.IS_PLUGIN):
+                if is_plugin:
+                    op_funcs[type_code] = self._coerced_kernel(op_funcs[type_code], OpRegistry.ARITIES[type_code])
+        for op_key, op_func in self._create_op_funcs().items():
+            op_funcs[TokenStream.OP_CODES[op_key]] = op_func
+        # the op func of every type code, the non operator codes hold None
+        self.op_funcs = tuple(op_funcs)
+        estimates = list(OpRegistry.ESTIMATES)
+        for op_key, estimate in self._create_estimates().items():
+            estimates[TokenStream.OP_CODES[op_key]] = estimate
+        # the estimate_digits func of every type code, see CostModel
+        self.estimates = tuple(estimates)
+
+    @staticmethod
+    def create(name: str, precision: int = 28):
+        """
+        Func that creates a backend by its name
+        :param name: float, exact or decimal
+        :param precision: the amount of significant digits of the decimal backend
+        :return: the NumericBackend
+        """
+        if name == "float":
+            return FloatBackend()
+        # the other backends need decimal and fractions, they are only imported when they are used
+        if name == "exact":
+            from CalcParts.ExactBackends import ExactBackend
+            return ExactBackend()
+        if name == "decimal":
+            from CalcParts.ExactBackends import DecimalBackend
+            return DecimalBackend(precision)
+        raise ValueError(f"Unknown backend: {name}, the backends are: {', '.join(NumericBackend.NAMES)}")
+
+    def get_values(self, token_stream: TokenStream):
+        """
+        :param token_stream:
+        :return: the values of the number tokens of the stream by their token index
+        """
+        return _LiteralValues(token_stream, self.literal)
+
+    def _create_op_funcs(self) -> dict:
+        """
+        :return: dict of op key to the op func that replaces the evaluate func of the operator class
+        """
+        return {}
+
+    def _create_estimates(self) -> dict:
+        """
+        :return: dict of op key to the estimate func that replaces the estimate_digits func of the operator class
+        """
+        return {}
+
+    def _coerced_kernel(self, kernel, arity: int):
+        """
+        :param kernel: the evaluate func of a registered operator
+        :param arity:
+        :return: the op func that converts the values of the kernel with _coerce
+        """
+        coerce = self._coerce
+        if arity == 1:
+            def coerced_kernel(num):
+                return coerce(kernel(num))
+        else:
+            def coerced_kernel(num1, num2):
+                return coerce(kernel(num1, num2))
+        return coerced_kernel
+
+    @abstractmethod
+    def literal(self, token_stream: TokenStream, index: int):
+        """
+        Func that converts a number token to a value of the backend
+        :param token_stream:
+        :param index: the index of the number token
+        :return: the value of the number
+        """
+
+    @abstractmethod
+    def format_final(self, final_value):
+        """
+        Func that formats the final value of an expression
+        :param final_value:
+        :return: the formatted final value
+        """
+
+
+class FloatBackend(NumericBackend):
+    """
+    The default backend, every value is a float and the ops are the ones of the operator classes
+    """
+    name = "float"
+    # a number token is already a float, its digits after the float precision are lost
+    exact_literals = False
+    # the max log10 magnitude of a float
+    FLOAT_DIGITS = log10(float_info.max)
+
+    def _create_estimates(self) -> dict:
+        # the ops that return floats can't return values larger than a float, they raise on an overflow, and ! raises
+        # on operands of MAX_FLOAT_SIZE and up, so their estimates don't grow past these sizes
+        factorial_class = OpRegistry.OP_CLASSES[TokenStream.OP_CODES['!']]
+        max_sizes = {'^': self.FLOAT_DIGITS, '/': self.FLOAT_DIGITS, '@': self.FLOAT_DIGITS,
+                     '!': lgamma(factorial_class.MAX_FLOAT_SIZE) / log(10)}
+        return {op_key: self._capped_estimate(OpRegistry.ESTIMATES[TokenStream.OP_CODES[op_key]], max_size)
+                for op_key, max_size in max_sizes.items()}
+
+    @staticmethod
+    def _capped_estimate(estimate, max_size: float):
+        """
+        :param estimate: the estimate_digits func of an operator class
+        :param max_size: the max log10 magnitude of the values of the op
+        :return: the estimate func that is at most max_size
+        """
+        def capped_estimate(*sizes):
+            size = estimate(*sizes)
+            return size if size < max_size else max_size
+        return capped_estimate
+
+    def get_values(self, token_stream: TokenStream):
+        # the tokenizer already turned the numbers into floats
+        return token_stream.values
+
+    def literal(self, token_stream: TokenStream, index: int):
+        return token_stream.values[index]
+
+    @staticmethod
+    def format_final(final_value):
+        """
+        Func that turns a final value with no decimal part into an int
+        :param final_value:
+        :return: the formatted final value
+        """
+        if final_value % 1 == 0:
+            final_value = int(final_value)
+        return final_value
@@ -0,0 +1,144 @@
+from abc import ABC
+from CalcParts.Operators import OpData, Operator, IBinaryOperator, IUnaryOperator, ILeftSidedOp, IRightSidedOp
+
+
+class OpRegistry(ABC):
+    """
+    Static class that freezes the operator set (OpData) into flat tables by type code, so the stages look up the
+    arity, precedence, placement and kernel of an operator by indexing a tuple instead of asking its operator class.
+    The op codes come after the type codes of the tokens that aren't operators (see TokenStream), a registered
+    operator gets the next free code so the codes of the other operators never change.
+    The parts that keep their own tables built from the operators (ie the patterns of the tokenizer) subscribe a
+    build func with on_freeze, the func is called right away and every time the set is frozen again.
+    New operators are added with register (and removed with unregister), they must be registered at startup before
+    any CalcHandler is created, a handler keeps the kernels of the operators that were registered when it was created
+    """
+    # the amount of type codes before the first op code
+    FIRST_OP_CODE = 7
+    # every op has a lower precedence, the converter gives it to a sign minus so a sign minus binds tighter than any op
+    MAX_PRECEDENCE = 7
+    # the placements of the ops and the interfaces an op with the placement must implement
+    _placements = {
+        "mid": (IBinaryOperator,),
+        "left": (IUnaryOperator, ILeftSidedOp),
+        "right": (IUnaryOperator, IRightSidedOp),
+    }
+    _build_funcs = []
+    # the keys of the operators that were added with register
+    _plugin_keys = set()
+    # the frozen tables, the codes that aren't operators hold None / False / 0
+    OP_CODES = {}
+    OP_CLASSES = ()
+    ARITIES = ()
+    PRECEDENCES = ()
+    PLACEMENTS = ()
+    IS_LEFT_SIDED = ()
+    IS_RIGHT_SIDED = ()
+    # True for the operators that were added with register, the backends convert the values of their kernels
+    IS_PLUGIN = ()
+    # the evaluate func of every op, unary_evaluate or binary_evaluate by the arity
+    KERNELS = ()
+    # the estimate_digits func of every op, see CostModel
+    ESTIMATES = ()
+    # the chars of all the single char operators
+    OP_CHARS = ""
+
+    @staticmethod
+    def freeze():
+        """
+        Func that builds the tables from the operators in OpData and calls the build funcs of the subscribed parts
+        """
+        op_keys = list(OpData.get_op_keys())
+        OpRegistry.OP_CODES = {op_key: code for code, op_key in enumerate(op_keys, OpRegistry.FIRST_OP_CODE)}
+        no_ops = (None,) * OpRegistry.FIRST_OP_CODE
+        op_classes = tuple(OpData.get_op_class(op_key) for op_key in op_keys)
+        OpRegistry.OP_CLASSES = no_ops + op_classes
+        OpRegistry.ARITIES = (0,) * OpRegistry.FIRST_OP_CODE + \
+            tuple(1 if isinstance(op_class, IUnaryOperator) else 2 for op_class in op_classes)
+        OpRegistry.PRECEDENCES = no_ops + tuple(op_class.get_precedence() for op_class in op_classes)
+        OpRegistry.PLACEMENTS = no_ops + tuple(op_class.get_placement() for op_class in op_classes)
+        OpRegistry.IS_LEFT_SIDED = tuple(isinstance(op_class, ILeftSidedOp) for op_class in OpRegistry.OP_CLASSES)
+        OpRegistry.IS_RIGHT_SIDED = tuple(isinstance(op_class, IRightSidedOp) for op_class in OpRegistry.OP_CLASSES)
+        OpRegistry.IS_PLUGIN = (False,) * OpRegistry.FIRST_OP_CODE + \
+            tuple(op_key in OpRegistry._plugin_keys for op_key in op_keys)
+        OpRegistry.KERNELS = no_ops + tuple(op_class.unary_evaluate if isinstance(op_class, IUnaryOperator) else
+                                            op_class.binary_evaluate for op_class in op_classes)
+        OpRegistry.ESTIMATES = no_ops + tuple(op_class.estimate_digits for op_class in op_classes)
+        OpRegistry.OP_CHARS = ''.join(op_key for op_key in op_keys if len(op_key) == 1)
+        for build_func in OpRegistry._build_funcs:
+            build_func()
+
+    @staticmethod
+    def on_freeze(build_func):
+        """
+        Func that subscribes the build func of a part that keeps its own tables of the operators
+        :param build_func: func without args that builds the tables from the frozen tables
+        """
+        OpRegistry._build_funcs.append(build_func)
+        build_func()
+
+    @staticmethod
+    def register(operator: Operator, op_key: str = None):
+        """
+        Func that adds a new operator and freezes the tables again, ie:
+        class Gcd(IBinaryOperator, Operator):
+            def binary_evaluate(self, num1, num2):
+                return math.gcd(int(num1), int(num2))
+        OpRegistry.register(Gcd(5, '|', "mid", "This operator gives the greatest common divisor of two operands"))
+        The operator is an instance of Operator with the interface of its placement: IBinaryOperator for a
+        mid op, IUnaryOperator and ILeftSidedOp / IRightSidedOp for a left / right op. It raises the custom exceptions
+        of ErrorParts.Errors to give their errors, and can override estimate_digits for the cost budget. The values
+        of its kernel can be ints or floats, the exact and decimal backends convert them to their own values.
+        :param operator:
+        :param op_key: the char of the operator in expressions, defaults to the value of the operator
+        """
+        if op_key is None:
+            op_key = operator.get_op_value() if isinstance(operator, Operator) else None
+        OpRegistry._check_operator(operator, op_key)
+        OpData.operatorData[op_key] = operator
+        OpRegistry._plugin_keys.add(op_key)
+        OpRegistry.freeze()
+
+    @staticmethod
+    def unregister(op_key: str):
+        """
+        Func that removes an operator that was added with register and freezes the tables again, the operators that
+        were registered after it get the next free codes. Like register it must be called before any CalcHandler that
+        shouldn't use the operator is created
+        :param op_key: the char of the operator
+        """
+        if op_key not in OpRegistry._plugin_keys:
+            raise ValueError(f"Unknown operator: {op_key}, only the operators that were added with register can be "
+                             f"removed")
+        del OpData.operatorData[op_key]
+        OpRegistry._plugin_keys.discard(op_key)
+        OpRegistry.freeze()
+
+    @staticmethod
+    def _check_operator(operator, op_key):
+        """
+        Func that checks that a new operator can be added, raises ValueError if it can't
+        :param operator:
+        :param op_key:
+        """
+        if not isinstance(operator, Operator):
+            raise ValueError(f"Invalid operator: {operator}, an operator must be an Operator")
+        interfaces = OpRegistry._placements.get(operator.get_placement())
+        if interfaces is None:
+            raise ValueError(f"Unknown placement: {operator.get_placement()}, the placements are: "
+                             f"{', '.join(OpRegistry._placements)}")
+        if not all(isinstance(operator, interface) for interface in interfaces):
+            raise ValueError(f"Invalid operator: {op_key}, a {operator.get_placement()} operator must implement "
+                             f"{', '.join(interface.__name__ for interface in interfaces)}")
+        # the chars of numbers, parentheses, white spaces and variable names can't be operators
+        if not isinstance(op_key, str) or len(op_key) != 1 or not op_key.isascii() or not op_key.isprintable() or \
+                op_key.isalnum() or op_key in " ()._":
+            raise ValueError(f"Invalid operator char: {op_key!r}, an operator must be a single ascii symbol")
+        if op_key in OpRegistry.OP_CODES:
+            raise ValueError(f"The operator {op_key} already exists")
+        if not 0 < operator.get_precedence() < OpRegistry.MAX_PRECEDENCE:
+            raise ValueError(f"Invalid precedence: {operator.get_precedence()}, the precedence of an operator must be "
+                             f"between 0 and {OpRegistry.MAX_PRECEDENCE}")
+
+
+OpRegistry.freeze()
@@ -1,18 +1,26 @@
 from abc import ABC, abstractmethod
-from dataclasses import dataclass
-from math import pow
+from math import pow, log, log10, lgamma, inf
 from ErrorParts.Errors import *
+from CalcParts.Kernels import OpKernels
+
+# the digits a sum can add to the larger operand
+_CARRY_DIGITS = log10(2)
 
 
-@dataclass
 class Operator(ABC):
     """
-    Abstract operator data class for all the same funcs and data in all the operators
+    Abstract operator data class for all the same funcs and data in all the operators, it isn't a dataclass as the
+    dataclasses module is slow to import and every run of the calc imports the operators
     """
-    _precedence: float
-    _value: str
-    _placement: str
-    _description: str
+
+    def __init__(self, precedence: float, value: str, placement: str, description: str):
+        self._precedence = precedence
+        self._value = value
+        self._placement = placement
+        self._description = description
+
+    def __repr__(self):
+        return f"{type(self).__name__}({self._precedence!r}, {self._value!r}, {self._placement!r})"
 
     def get_precedence(self) -> float:
         return self._precedence
@@ -36,6 +44,16 @@ class IBinaryOperator(ABC):
     def binary_evaluate(self, num1: float, num2: float) -> float:
         pass
 
+    def estimate_digits(self, digits1: float, digits2: float) -> float:
+        """
+        Func that estimates the size of the result from the sizes of the operands before anything is computed, see
+        CostModel
+        :param digits1: the log10 magnitude of the first operand
+        :param digits2: the log10 magnitude of the second operand
+        :return: the log10 magnitude of the result
+        """
+        return max(digits1, digits2)
+
 
 class IUnaryOperator(ABC):
     """
@@ -46,6 +64,14 @@ class IUnaryOperator(ABC):
     def unary_evaluate(self, num1: float) -> float:
         pass
 
+    def estimate_digits(self, digits: float) -> float:
+        """
+        Func that estimates the size of the result from the size of the operand, see CostModel
+        :param digits: the log10 magnitude of the operand
+        :return: the log10 magnitude of the result
+        """
+        return digits
+
 
 class ILeftSidedOp(ABC):
     """
@@ -67,6 +93,9 @@ class Plus(IBinaryOperator, Operator):
     def binary_evaluate(self, num1: float, num2: float) -> float:
         return num1 + num2
 
+    def estimate_digits(self, digits1: float, digits2: float) -> float:
+        return max(digits1, digits2) + _CARRY_DIGITS
+
 
 class Minus(IBinaryOperator, Operator):
     """
@@ -76,6 +105,9 @@ class Minus(IBinaryOperator, Operator):
     def binary_evaluate(self, num1: float, num2: float) -> float:
         return num1 - num2
 
+    def estimate_digits(self, digits1: float, digits2: float) -> float:
+        return max(digits1, digits2) + _CARRY_DIGITS
+
 
 class Multiplication(IBinaryOperator, Operator):
     """
@@ -85,6 +117,9 @@ class Multiplication(IBinaryOperator, Operator):
     def binary_evaluate(self, num1: float, num2: float) -> float:
         return num1 * num2
 
+    def estimate_digits(self, digits1: float, digits2: float) -> float:
+        return digits1 + digits2
+
 
 class Division(IBinaryOperator, Operator):
     """
@@ -94,6 +129,10 @@ class Division(IBinaryOperator, Operator):
     def binary_evaluate(self, num1: float, num2: float) -> float:
         return num1 / num2
 
+    def estimate_digits(self, digits1: float, digits2: float) -> float:
+        # an exact quotient holds the digits of both operands
+        return digits1 + digits2
+
 
 class Power(IBinaryOperator, Operator):
     """
@@ -105,9 +144,16 @@ class Power(IBinaryOperator, Operator):
             result = pow(num1, num2)
             return result
         except ValueError:
-            raise InvalidPowerError(f"Invalid power operation, cannot raise: {num1} to the power of: {num2}")
+            raise InvalidPowerError("Invalid_Power", num1, num2)
+        except OverflowError:
+            raise PowerOverflowError("Power_Overflow", num1, num2)
+
+    def estimate_digits(self, digits1: float, digits2: float) -> float:
+        # the exponent is at most 10^digits2
+        try:
+            return digits1 * 10 ** digits2
         except OverflowError:
-            raise PowerOverflowError(f"Power operation result is too large, cannot preform {num1}^{num2}")
+            return inf
 
 
 class Max(IBinaryOperator, Operator):
@@ -145,6 +191,9 @@ class Avg(IBinaryOperator, Operator):
     def binary_evaluate(self, num1: float, num2: float) -> float:
         return (num1 + num2) / 2
 
+    def estimate_digits(self, digits1: float, digits2: float) -> float:
+        return max(digits1, digits2) + _CARRY_DIGITS
+
 
 class UMinus(IUnaryOperator, Operator, ILeftSidedOp):
     """
@@ -159,21 +208,24 @@ class Factorial(IUnaryOperator, Operator, IRightSidedOp):
     """
     Class for the ! op
     """
-    MAX_FLOAT_SIZE = 170
+    MAX_FLOAT_SIZE = OpKernels.MAX_FACTORIAL
 
     def unary_evaluate(self, num: float) -> float:
-        factorial = 1
         # check for non positive number and non int number
         if num % 1 != 0:
-            raise InvalidFactorialError("Cannot perform factorial on non int number")
+            raise InvalidFactorialError("Factorial_Not_Int")
         elif num < 0:
-            raise InvalidFactorialError("Cannot perform factorial on negative number")
+            raise InvalidFactorialError("Factorial_Negative")
         # check to see if the factorial was too large
         elif num >= self.MAX_FLOAT_SIZE:
-            raise LargeNumberError(f"Invalid factorial size, factorial of: {num} is too large")
-        for i in range(1, int(num + 1)):
-            factorial = factorial * i
-        return factorial
+            raise LargeNumberError("Factorial_Size", num)
+        return OpKernels.factorial(num)
+
+    def estimate_digits(self, digits: float) -> float:
+        # the digits of n! by the log gamma func, n is at most 10^digits
+        if digits > 15:
+            return inf
+        return lgamma(10 ** digits + 1) / log(10)
 
 
 class Negative(IUnaryOperator, Operator, ILeftSidedOp):
@@ -189,24 +241,23 @@ class Hash(IUnaryOperator, Operator, IRightSidedOp):
     """
     Class for the hash op
     """
+    # the max amount of significant digits of the str of a float
+    FLOAT_DIGITS = 17
 
     def unary_evaluate(self, num: float) -> float:
-        output = 0
         if num < 0:
-            raise InvalidHashError(f"Cannot perform hash on negative num: {num}")
+            raise InvalidHashError("Hash_Negative", num)
         # check for small numbers
         elif num < 1e-10 and num != 0:
-            raise SmallNumberError(f"Invalid small number for # operator, cannot preform function on: {num}")
+            raise SmallNumberError("Hash_Small", num)
         # check for large numbers, python float loses precision after 15 digits
         elif num > 1e15:
-            raise LargeNumberError(f"Invalid large number for # operator, cannot preform function on: {num}")
-        # take only the non zero part if there is an e in the number
-        num = str(num).split('e')
-        for char in num[0]:
-            # check that the char is a digit (used for floating numbers or numbers with e in them)
-            if char.isdigit():
-                output = output + int(char)
-        return output
+            raise LargeNumberError("Hash_Large", num)
+        return OpKernels.digit_sum(num)
+
+    def estimate_digits(self, digits: float) -> float:
+        # every digit adds at most 9, a number that isn't whole sums the digits of its float (at most 17)
+        return log10(9 * max(digits + 1, self.FLOAT_DIGITS))
 
 
 class OpData(ABC):
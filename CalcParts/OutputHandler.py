@@ -32,7 +32,25 @@ class OutputHandler:
     @staticmethod
     def output_main_instructions():
         print("Welcome to my special calculator,"
-              " to see all the valid operators please write: op. To exit the calc write: exit")
+              " to see all the valid operators please write: op. To exit the calc write: exit."
+              " To see the time of every stage write: stats")
+
+    @staticmethod
+    def output_stage_stats(stage_stats: dict):
+        """
+        This func will show the run time breakdown of the stages of the traced expressions
+        :param stage_stats: the stats of SamplingCollector.get_stats, None if the stages aren't traced
+        """
+        if stage_stats is None:
+            print("The stages aren't traced")
+            return
+        print("--------------------------")
+        print(f"{'stage':<10}{'count':>8}{'mean us':>10}{'max us':>10}{'share':>8}{'tokens':>8}{'postfix':>9}"
+              f"{'errors':>8}")
+        for stage, stats in stage_stats.items():
+            print(f"{stage:<10}{stats['count']:>8}{stats['mean_us']:>10.1f}{stats['max_us']:>10.1f}"
+                  f"{stats['share']:>8.1%}{stats['tokens']:>8.1f}{stats['post_fix']:>9.1f}{stats['errors']:>8}")
+        print("--------------------------")
 
     @staticmethod
     def output_error(error: BaseCalcError):
@@ -0,0 +1,258 @@
+import multiprocessing
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor, wait, FIRST_COMPLETED
+from itertools import islice
+from CalcHandler import CalcHandler
+from CalcParts.MappedInput import MappedInput
+
+# the calc handler of the current worker process, it is created once when the worker starts
+_worker_calc_handler = None
+
+
+def _init_worker(handler_kwargs: dict):
+    """
+    Func that runs once in every worker process and creates its calc handler
+    :param handler_kwargs:
+    """
+    global _worker_calc_handler
+    _worker_calc_handler = CalcHandler(**handler_kwargs)
+
+
+def _eval_chunk(start_index: int, expressions: list, calc_handler: CalcHandler = None) -> tuple:
+    """
+    Func that evaluates a chunk of expressions inside a worker
+    :param start_index: the index of the first expression in the chunk
+    :param expressions:
+    :param calc_handler: the handler to use, defaults to the handler of the worker process
+    :return: (start_index, list of (result, error_list))
+    """
+    calc_handler = calc_handler or _worker_calc_handler
+    return start_index, [(result, error_list) for _, result, error_list in calc_handler.evaluate_many(expressions)]
+
+
+def _eval_file_range(chunk_number: int, path: str, start: int, end: int, calc_handler: CalcHandler = None) -> tuple:
+    """
+    Func that evaluates the lines of a range of a file inside a worker, the worker maps the file itself so only the
+    path and the offsets are sent to it
+    :param chunk_number: the place of the range in the file
+    :param path:
+    :param start:
+    :param end:
+    :param calc_handler: the handler to use, defaults to the handler of the worker process
+    :return: (chunk_number, list of (result, error_list))
+    """
+    calc_handler = calc_handler or _worker_calc_handler
+    with MappedInput(path) as mapped_input:
+        return chunk_number, [(result, error_list) for _, result, error_list in
+                              calc_handler.evaluate_buffer(mapped_input.get_buffer(), start, end)]
+
+
+class ParallelExecutor:
+    """
+    Class that evaluates batches of expressions on a pool of worker processes, every worker holds its own CalcHandler
+    so the work isn't bound to a single core.
+    The input is cut into chunks and only a few chunks per worker are sent at once, so the input and the output are
+    never fully held in memory
+    """
+
+    def __init__(self, workers: int = None, chunk_size: int = 1000, max_exps_per_worker: int = None,
+                 **handler_kwargs):
+        """
+        :param workers: amount of worker processes, defaults to the amount of cores
+        :param chunk_size: amount of expressions sent to a worker at once
+        :param max_exps_per_worker: a worker is replaced by a new one after evaluating this many expressions
+        :param handler_kwargs: args that are passed to the CalcHandler of every worker
+        """
+        self._workers = workers or multiprocessing.cpu_count()
+        self._chunk_size = chunk_size
+        self._max_exps_per_worker = max_exps_per_worker
+        self._handler_kwargs = handler_kwargs
+        # max amount of chunks that are sent or waiting to be yielded
+        self._max_pending = self._workers * 2
+        self._pool = None
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        self.shutdown()
+
+    def map(self, expressions, ordered: bool = True):
+        """
+        Generator that evaluates an iterable of expressions on the worker pool
+        :param expressions: any iterable of expression strings
+        :param ordered: if True the outputs are yielded in the input order, else they are yielded as soon as their
+        chunk is done and the index is used as the sequence id
+        :return: yields (index, result, error_list) for every expression
+        """
+        pool = self._get_pool()
+        pending = set()
+        # finished chunks by their start index
+        ready = {}
+        next_index = 0
+        expressions = iter(expressions)
+        start_index = 0
+        while True:
+            chunk = list(islice(expressions, self._chunk_size))
+            if not chunk:
+                break
+            pending.add(self._submit_chunk(pool, start_index, chunk))
+            start_index += len(chunk)
+            while len(pending) + len(ready) >= self._max_pending and pending:
+                self._wait_for_chunks(pending, ready)
+                next_index = yield from self._yield_ready(ready, next_index, ordered)
+        while pending:
+            self._wait_for_chunks(pending, ready)
+            next_index = yield from self._yield_ready(ready, next_index, ordered)
+
+    def map_file(self, path: str, chunk_bytes: int = 1 << 20):
+        """
+        Generator that evaluates every line of a file on the worker pool, the file is memory mapped and cut into
+        ranges of whole lines, every worker maps the file and reads its own ranges so the lines are never sent
+        between the processes
+        :param path: path of a regular file with an expression per line
+        :param chunk_bytes: the min size of the range that is sent to a worker at once
+        :return: yields (index, result, error_list) for every line in the file order
+        """
+        pool = self._get_pool()
+        pending = set()
+        # finished ranges by their chunk number
+        ready = {}
+        next_chunk = 0
+        next_index = 0
+        with MappedInput(path) as mapped_input:
+            for chunk_number, (start, end) in enumerate(mapped_input.split_ranges(chunk_bytes)):
+                pending.add(self._submit_range(pool, chunk_number, path, start, end))
+                while len(pending) + len(ready) >= self._max_pending and pending:
+                    self._wait_for_chunks(pending, ready)
+                    next_chunk, next_index = yield from self._yield_ready_chunks(ready, next_chunk, next_index)
+        while pending:
+            self._wait_for_chunks(pending, ready)
+            next_chunk, next_index = yield from self._yield_ready_chunks(ready, next_chunk, next_index)
+
+    def shutdown(self):
+        """
+        Func that stops the worker processes
+        """
+        if self._pool is not None:
+            self._pool.shutdown()
+            self._pool = None
+
+    def _get_pool(self) -> ProcessPoolExecutor:
+        """
+        Func that creates the worker pool on first use, the workers stay warm between map calls
+        :return: the process pool
+        """
+        if self._pool is None:
+            pool_kwargs = {}
+            if self._max_exps_per_worker is not None:
+                # a worker handles whole chunks, so it is replaced after enough chunks to reach the limit
+                pool_kwargs["max_tasks_per_child"] = max(1, self._max_exps_per_worker // self._chunk_size)
+                # replacing workers isn't supported with fork
+                pool_kwargs["mp_context"] = multiprocessing.get_context("spawn")
+            self._pool = ProcessPoolExecutor(self._workers, initializer=_init_worker,
+                                             initargs=(self._handler_kwargs,), **pool_kwargs)
+        return self._pool
+
+    def _submit_chunk(self, pool, start_index: int, chunk: list):
+        """
+        :param pool:
+        :param start_index:
+        :param chunk:
+        :return: the future of a chunk of expressions
+        """
+        return pool.submit(_eval_chunk, start_index, chunk)
+
+    def _submit_range(self, pool, chunk_number: int, path: str, start: int, end: int):
+        """
+        :param pool:
+        :param chunk_number:
+        :param path:
+        :param start:
+        :param end:
+        :return: the future of a range of a file
+        """
+        return pool.submit(_eval_file_range, chunk_number, path, start, end)
+
+    @staticmethod
+    def _wait_for_chunks(pending: set, ready: dict):
+        """
+        Func that waits for at least one sent chunk to finish and moves the finished chunks to ready
+        :param pending:
+        :param ready:
+        """
+        done, _ = wait(pending, return_when=FIRST_COMPLETED)
+        pending.difference_update(done)
+        for future in done:
+            start_index, outputs = future.result()
+            ready[start_index] = outputs
+
+    @staticmethod
+    def _yield_ready(ready: dict, next_index: int, ordered: bool):
+        """
+        Generator that yields the outputs of the finished chunks
+        :param ready:
+        :param next_index: the index of the next expression to yield when the outputs are ordered
+        :param ordered:
+        :return: the next index to yield
+        """
+        if ordered:
+            while next_index in ready:
+                outputs = ready.pop(next_index)
+                for offset, (result, error_list) in enumerate(outputs):
+                    yield next_index + offset, result, error_list
+                next_index += len(outputs)
+        else:
+            for start_index in list(ready):
+                for offset, (result, error_list) in enumerate(ready.pop(start_index)):
+                    yield start_index + offset, result, error_list
+        return next_index
+
+    @staticmethod
+    def _yield_ready_chunks(ready: dict, next_chunk: int, next_index: int):
+        """
+        Generator that yields the outputs of the finished ranges in the file order, the index of a line is only known
+        once all the ranges before it are done
+        :param ready:
+        :param next_chunk: the chunk number of the next range to yield
+        :param next_index: the index of the first line of the next range
+        :return: (the next chunk number, the next index)
+        """
+        while next_chunk in ready:
+            for result, error_list in ready.pop(next_chunk):
+                yield next_index, result, error_list
+                next_index += 1
+            next_chunk += 1
+        return next_chunk, next_index
+
+
+class ThreadExecutor(ParallelExecutor):
+    """
+    Class that evaluates batches of expressions on a pool of threads that share a single CalcHandler, every call of
+    the handler takes its own pipeline so the threads don't share any evaluation state.
+    The chunks don't have to be sent to other processes, but with the GIL only one thread evaluates at a time, the
+    threads only run in parallel on a free threaded python build
+    """
+
+    def __init__(self, workers: int = None, chunk_size: int = 256, **handler_kwargs):
+        """
+        :param workers: amount of threads, defaults to the amount of cores
+        :param chunk_size: amount of expressions given to a thread at once
+        :param handler_kwargs: args that are passed to the shared CalcHandler
+        """
+        super().__init__(workers, chunk_size, **handler_kwargs)
+        self._calc_handler = CalcHandler(**handler_kwargs)
+
+    def _get_pool(self) -> ThreadPoolExecutor:
+        """
+        Func that creates the thread pool on first use
+        :return: the thread pool
+        """
+        if self._pool is None:
+            self._pool = ThreadPoolExecutor(self._workers)
+        return self._pool
+
+    def _submit_chunk(self, pool, start_index: int, chunk: list):
+        return pool.submit(_eval_chunk, start_index, chunk, self._calc_handler)
+
+    def _submit_range(self, pool, chunk_number: int, path: str, start: int, end: int):
+        return pool.submit(_eval_file_range, chunk_number, path, start, end, self._calc_handler)
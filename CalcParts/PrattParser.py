@@ -0,0 +1,199 @@
+from array import array
+from ErrorParts.ErrorHandler import ErrorHandler
+from CalcParts.Converter import Converter
+from CalcParts.TokenStream import TokenStream
+from CalcParts.OpRegistry import OpRegistry
+
+
+class OperandNode:
+    """
+    Syntax tree node of a number or a variable
+    """
+    __slots__ = ("token_index",)
+
+    def __init__(self, token_index: int):
+        self.token_index = token_index
+
+
+class UnaryNode:
+    """
+    Syntax tree node of a left or right sided operator and its operand
+    """
+    __slots__ = ("token_index", "type_code", "operand")
+
+    def __init__(self, token_index: int, type_code: int, operand):
+        self.token_index = token_index
+        self.type_code = type_code
+        self.operand = operand
+
+
+class BinaryNode:
+    """
+    Syntax tree node of a binary operator and its operands
+    """
+    __slots__ = ("token_index", "type_code", "left", "right")
+
+    def __init__(self, token_index: int, type_code: int, left, right):
+        self.token_index = token_index
+        self.type_code = type_code
+        self.left = left
+        self.right = right
+
+
+class _ParseError(Exception):
+    """
+    Raised when the parser finds a token it can't parse, the converter then converts the tokens to give the errors
+    """
+
+
+class PrattParser:
+    """
+    Front end that parses the token stream into a syntax tree in a single pass by the precedence and placement of the
+    operators (OpRegistry), instead of the shunting yard of the Converter and its separate checks of the neighbours of
+    every operator.
+    Every operand and operator is added to the postfix list when its node is created, so the postfix list and the
+    max stack depth are the same as the ones of the converter and the evaluator is shared by both front ends.
+    A unary minus binds by its place like in the converter, a sign minus (after a binary or left sided op) binds
+    tighter than any op and a leading unary minus (at the start or after an open paren) binds by its own precedence.
+    The parser only knows the valid syntax, an expression it can't parse is converted by the converter so the errors
+    are always the same as the ones of the converter, so are the expressions the converter handles in its own way:
+    a leading unary minus right after another one is taken out of the op stack before its operand when an operand
+    came before them (ie 2+(--3)), and expressions that are nested too deep for the recursion
+    """
+    # the precedence the converter gives a sign minus
+    _sign_minus_precedence = OpRegistry.MAX_PRECEDENCE
+
+    def __init__(self, error_handler: ErrorHandler):
+        self._error_handler = error_handler
+        # converts the expressions the parser can't parse
+        self._converter = Converter(error_handler)
+        self._used_converter = False
+        self._output_lst = array('i')
+        self._depth = 0
+        self._max_depth = 0
+        self._syntax_tree = None
+        self._types = None
+        # the index of the next token
+        self._pos = 0
+
+    def convert(self, token_stream: TokenStream) -> bool:
+        """
+        Func that parses the token stream into a syntax tree and a postfix list, same as Converter.convert
+        :param token_stream:
+        :return: True if the expression has no errors
+        """
+        self._types = token_stream.types
+        self._pos = 0
+        try:
+            self._syntax_tree = self._parse_expression(0, False)
+            if self._pos == len(self._types):
+                return True
+        except (_ParseError, RecursionError):
+            pass
+        # a ) without a ( stops the parse before the end, the converter gives the errors of the whole expression
+        self.clear_converter()
+        self._used_converter = True
+        return self._converter.convert(token_stream)
+
+    def _parse_expression(self, min_precedence: float, sign_minus: bool):
+        """
+        Func that parses an operand and the operators after it that bind tighter than min_precedence, all the
+        binary operators are left associative
+        :param min_precedence: the precedence of the operator the expression is the operand of
+        :param sign_minus: True if a unary minus at the start of the expression is a sign minus
+        :return: the node of the expression
+        """
+        types = self._types
+        precedences = TokenStream.PRECEDENCES
+        left = self._parse_prefix(sign_minus)
+        end = len(types)
+        while self._pos < end:
+            type_code = types[self._pos]
+            # a token that can't come after an operand stops the expression, the callers check the token after it
+            if not TokenStream.IS_OPERATOR[type_code] or TokenStream.IS_LEFT_SIDED[type_code]:
+                break
+            precedence = precedences[type_code]
+            if precedence <= min_precedence:
+                break
+            op_index = self._pos
+            self._pos += 1
+            if TokenStream.IS_RIGHT_SIDED[type_code]:
+                left = UnaryNode(op_index, type_code, left)
+            else:
+                left = BinaryNode(op_index, type_code, left, self._parse_expression(precedence, True))
+                self._depth -= 1
+            self._output_lst.append(op_index)
+        return left
+
+    def _parse_prefix(self, sign_minus: bool):
+        """
+        Func that parses an operand, an expression in parentheses or a left sided operator and its operand
+        :param sign_minus: True if a unary minus here is a sign minus
+        :return: the node of the operand
+        """
+        types = self._types
+        cur_index = self._pos
+        if cur_index >= len(types):
+            raise _ParseError()
+        type_code = types[cur_index]
+        self._pos = cur_index + 1
+        if TokenStream.IS_OPERAND[type_code]:
+            self._output_lst.append(cur_index)
+            self._depth += 1
+            if self._depth > self._max_depth:
+                self._max_depth = self._depth
+            return OperandNode(cur_index)
+        if type_code == TokenStream.OPEN_PAREN:
+            node = self._parse_expression(0, False)
+            if self._pos >= len(types) or types[self._pos] != TokenStream.CLOSE_PAREN:
+                raise _ParseError()
+            self._pos += 1
+            return node
+        if not TokenStream.IS_LEFT_SIDED[type_code] or self._pos >= len(types):
+            raise _ParseError()
+        # a left sided op can only come before a unary minus, an operand or an open paren
+        next_type = types[self._pos]
+        u_minus_code = TokenStream.OP_CODES['U-']
+        if not (next_type == u_minus_code or TokenStream.IS_OPERAND[next_type] or
+                next_type == TokenStream.OPEN_PAREN):
+            raise _ParseError()
+        if type_code != u_minus_code:
+            # a unary minus after a left sided op is a sign minus
+            operand = self._parse_expression(TokenStream.PRECEDENCES[type_code], True)
+        elif sign_minus:
+            operand = self._parse_expression(self._sign_minus_precedence, True)
+        else:
+            if next_type == u_minus_code and self._output_lst:
+                raise _ParseError()
+            operand = self._parse_expression(TokenStream.PRECEDENCES[type_code], False)
+        self._output_lst.append(cur_index)
+        return UnaryNode(cur_index, type_code, operand)
+
+    def get_syntax_tree(self):
+        """
+        :return: the root node of the syntax tree, None if the expression was converted by the converter
+        """
+        return self._syntax_tree
+
+    def get_post_fix(self) -> array:
+        """
+        :return: return the postfix list, the indexes of the tokens in the token stream
+        """
+        return self._converter.get_post_fix() if self._used_converter else self._output_lst
+
+    def get_max_depth(self) -> int:
+        """
+        :return: the max amount of values the evaluator holds while evaluating the postfix list
+        """
+        return self._converter.get_max_depth() if self._used_converter else self._max_depth
+
+    def clear_converter(self):
+        """
+        Clear the used values so I can parse another expression
+        """
+        del self._output_lst[:]
+        self._depth = 0
+        self._max_depth = 0
+        self._syntax_tree = None
+        self._used_converter = False
+        self._converter.clear_converter()
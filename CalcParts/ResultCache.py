@@ -0,0 +1,139 @@
+import sys
+import threading
+from collections import OrderedDict
+from ErrorParts.Errors import ERROR_TEMPLATES
+
+
+class ResultCache:
+    """
+    Bounded LRU cache that holds the outcome of whole expressions, the cache holds both final values and error lists
+    so that a repeated expression can skip the tokenizer, converter and evaluator.
+    The cache can be bounded by the amount of entries, by an estimated memory size or by both, when a bound is passed
+    the least recently used entries are evicted.
+    Every access takes a lock, even a get moves its entry, so the cache can be shared between threads
+    """
+
+    def __init__(self, max_size: int = 128, max_bytes: int = None):
+        # the entries are kept from least recently used to most recently used
+        self._entries = OrderedDict()
+        self._max_size = max_size
+        self._max_bytes = max_bytes
+        self._cur_bytes = 0
+        self._hits = 0
+        self._misses = 0
+        self._evictions = 0
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def normalize_key(input_exp: str, fail_fast: bool = False) -> tuple:
+        """
+        Func that creates the cache key of an expression, white spaces don't change the value of an expression.
+        The error mode is a part of the key because a fail fast run returns a different error list
+        :param input_exp: str or bytes expression, a bytes expression keeps a bytes key
+        :param fail_fast:
+        :return: (the expression without white spaces, fail_fast)
+        """
+        if isinstance(input_exp, bytes):
+            return b''.join(input_exp.split()), fail_fast
+        return ''.join(input_exp.split()), fail_fast
+
+    def is_enabled(self) -> bool:
+        """
+        :return: True if the cache can hold entries else False
+        """
+        return self._max_size != 0 and self._max_bytes != 0
+
+    def get(self, key: tuple, source: str = None):
+        """
+        Func that looks for a cached outcome and marks it as recently used
+        :param key:
+        :param source: the original expression, error positions refer to it so cached errors are only used for the
+        same original expression
+        :return: (result, error_list) if the key is cached else None
+        """
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None or (entry[1] is not None and entry[3] != source):
+                self._misses += 1
+                return None
+            self._hits += 1
+            self._entries.move_to_end(key)
+        result, errors, _, _ = entry
+        # give the caller its own list so the cached errors can't be changed from the outside
+        return result, (list(errors) if errors is not None else None)
+
+    def put(self, key: tuple, result, errors, source: str = None):
+        """
+        Func that saves the outcome of an expression and evicts old entries if a bound was passed
+        :param key:
+        :param result:
+        :param errors:
+        :param source: the original expression
+        """
+        if not self.is_enabled():
+            return
+        errors = tuple(errors) if errors is not None else None
+        size = self._estimate_size(key, result, errors)
+        if self._max_bytes is not None and size > self._max_bytes:
+            # the entry can never fit in the cache
+            return
+        with self._lock:
+            if key in self._entries:
+                self._cur_bytes -= self._entries.pop(key)[2]
+            self._entries[key] = (result, errors, size, source)
+            self._cur_bytes += size
+            self._evict()
+
+    def clear(self):
+        """
+        Func that removes all the cached entries and resets the counters
+        """
+        with self._lock:
+            self._entries.clear()
+            self._cur_bytes = 0
+            self._hits = 0
+            self._misses = 0
+            self._evictions = 0
+
+    def get_stats(self) -> dict:
+        """
+        :return: dict with the hit / miss / eviction counters and the current size of the cache
+        """
+        with self._lock:
+            return {
+                "hits": self._hits,
+                "misses": self._misses,
+                "evictions": self._evictions,
+                "size": len(self._entries),
+                "bytes": self._cur_bytes,
+            }
+
+    def _evict(self):
+        """
+        Func that removes the least recently used entries until the cache is in its bounds, the lock must be held
+        """
+        while (self._max_size is not None and len(self._entries) > self._max_size) or \
+                (self._max_bytes is not None and self._cur_bytes > self._max_bytes):
+            _, (_, _, size, _) = self._entries.popitem(last=False)
+            self._cur_bytes -= size
+            self._evictions += 1
+
+    @staticmethod
+    def _estimate_size(key: tuple, result, errors) -> int:
+        """
+        Func that estimates the memory used by a single entry
+        :param key:
+        :param result:
+        :param errors:
+        :return: estimated size in bytes
+        """
+        size = sys.getsizeof(key) + sys.getsizeof(key[0]) + sys.getsizeof(result)
+        if errors is not None:
+            size += sys.getsizeof(errors)
+            # the msg of an error is only created when it is asked for, it is counted as the size of its template, an
+            # exception operand holds the operands of its own msg
+            for error in errors:
+                size += sys.getsizeof(error) + sys.getsizeof(ERROR_TEMPLATES.get(error.get_error_type(), "")) + \
+                    sum(sys.getsizeof(operand) + sum(map(sys.getsizeof, getattr(operand, "args", ())))
+                        for operand in error.get_operands())
+        return size
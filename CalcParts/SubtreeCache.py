@@ -0,0 +1,162 @@
+import re
+import threading
+from collections import OrderedDict
+from CalcParts.OpRegistry import OpRegistry
+
+
+class SubtreeCache:
+    """
+    Bounded LRU cache of the values of the sub expressions in parentheses, it is shared by all the expressions of a
+    handler so a big group that shows up in many different expressions (ie the same (12#-3!)$23 with different
+    suffixes) is only computed once.
+    The key of a group is its exact text, the text of a group always gives the same tokens and so the same sub tree,
+    white spaces aren't removed as they can split a number. The groups are found before the expression is tokenized
+    and a cached group is added as a single number token, so it skips the tokenizer and the converter and not only
+    the evaluator, which is the cheapest stage.
+    A group is only cached when its value doesn't depend on the expression around it:
+    1. only float values are cached, ops like ! return exact ints that a number token can't hold
+    2. a group with a leading unary minus chain, ie (--3), isn't cached, the converter handles it by what came before
+    3. a group is only used when the chars around it can come around a number, so the errors at its edges are kept
+    Any error in an expression with a cached group makes the caller run it again without the cached groups, so the
+    errors are always the ones of the whole expression.
+    Every access takes a lock so the cache can be shared between threads
+    """
+    _paren_pattern = re.compile(r"[()]")
+    _leading_minus_pattern = re.compile(r"\(\s*-\s*-")
+    # the chars that can come before a ( or a number and after a ) or a number without an error, set by build_chars
+    _chars_before = frozenset()
+    _chars_after = frozenset()
+
+    @staticmethod
+    def build_chars():
+        """
+        Func that builds the chars around a group from the operators of the OpRegistry
+        """
+        op_codes = OpRegistry.OP_CODES
+        SubtreeCache._chars_before = frozenset(op_key for op_key, code in op_codes.items()
+                                               if len(op_key) == 1 and not OpRegistry.IS_RIGHT_SIDED[code]) | {'('}
+        SubtreeCache._chars_after = frozenset(op_key for op_key, code in op_codes.items()
+                                              if len(op_key) == 1 and not OpRegistry.IS_LEFT_SIDED[code]) | {')'}
+
+    def __init__(self, max_size: int = 4096, min_length: int = 16, max_length: int = 4096):
+        """
+        :param max_size: max amount of cached groups
+        :param min_length: shorter groups aren't cached, they are cheaper to compute than to look up
+        :param max_length: longer groups aren't cached so a single entry can't hold a lot of memory
+        """
+        # the entries are kept from least recently used to most recently used
+        self._entries = OrderedDict()
+        self._max_size = max_size
+        self._min_length = min_length
+        self._max_length = max_length
+        self._hits = 0
+        self._misses = 0
+        self._evictions = 0
+        self._lock = threading.Lock()
+
+    def is_enabled(self) -> bool:
+        """
+        :return: True if the cache can hold entries else False
+        """
+        return self._max_size != 0
+
+    def find_groups(self, input_exp: str) -> tuple:
+        """
+        Func that looks up every group of the expression that can be cached, the groups in a cached group aren't
+        looked up
+        :param input_exp:
+        :return: (dict of the position of the ( of every cached group to (the position of its ), value), list of
+        (position of (, position of )) of the groups that weren't cached)
+        """
+        hits = {}
+        misses = []
+        if '(' not in input_exp:
+            return hits, misses
+        groups = []
+        open_positions = []
+        for paren_match in self._paren_pattern.finditer(input_exp):
+            if paren_match.group() == '(':
+                open_positions.append(paren_match.start())
+            elif open_positions:
+                groups.append((open_positions.pop(), paren_match.start()))
+        # outer groups first
+        groups.sort()
+        hit_end = -1
+        with self._lock:
+            for open_pos, close_pos in groups:
+                if open_pos < hit_end or not self._min_length <= close_pos - open_pos + 1 <= self._max_length or \
+                        not self._check_edges(input_exp, open_pos, close_pos):
+                    continue
+                text = input_exp[open_pos:close_pos + 1]
+                value = self._entries.get(text)
+                if value is None:
+                    self._misses += 1
+                    if not self._leading_minus_pattern.search(text):
+                        misses.append((open_pos, close_pos))
+                    continue
+                self._hits += 1
+                self._entries.move_to_end(text)
+                hits[open_pos] = (close_pos, value)
+                hit_end = close_pos
+        return hits, misses
+
+    def put(self, text: str, value):
+        """
+        Func that saves the value of a group and evicts the least recently used groups
+        :param text: the text of the group
+        :param value:
+        """
+        if value.__class__ is not float or not self.is_enabled():
+            return
+        with self._lock:
+            self._entries[text] = value
+            self._entries.move_to_end(text)
+            while self._max_size is not None and len(self._entries) > self._max_size:
+                self._entries.popitem(last=False)
+                self._evictions += 1
+
+    def clear(self):
+        """
+        Func that removes all the cached groups and resets the counters
+        """
+        with self._lock:
+            self._entries.clear()
+            self._hits = 0
+            self._misses = 0
+            self._evictions = 0
+
+    def get_stats(self) -> dict:
+        """
+        :return: dict with the hit / miss / eviction counters, the hit rate and the current size of the cache
+        """
+        with self._lock:
+            lookups = self._hits + self._misses
+            return {
+                "hits": self._hits,
+                "misses": self._misses,
+                "evictions": self._evictions,
+                "hit_rate": self._hits / lookups if lookups else 0.0,
+                "size": len(self._entries),
+            }
+
+    def _check_edges(self, input_exp: str, open_pos: int, close_pos: int) -> bool:
+        """
+        Func that checks that the group can be a number in the expression, the chars around a group that are an
+        error (ie 2(3+4)) aren't always an error around a number
+        :param input_exp:
+        :param open_pos:
+        :param close_pos:
+        :return: True if the group can be replaced by a number
+        """
+        before_pos = open_pos - 1
+        while before_pos >= 0 and input_exp[before_pos].isspace():
+            before_pos -= 1
+        if before_pos >= 0 and input_exp[before_pos] not in self._chars_before:
+            return False
+        after_pos = close_pos + 1
+        while after_pos < len(input_exp) and input_exp[after_pos].isspace():
+            after_pos += 1
+        return after_pos == len(input_exp) or input_exp[after_pos] in self._chars_after
+
+
+OpRegistry.on_freeze(SubtreeCache.build_chars)
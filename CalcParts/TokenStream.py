@@ -0,0 +1,169 @@
+from array import array
+from CalcParts.OpRegistry import OpRegistry
+
+
+class TokenStream:
+    """
+    Compact token list that is shared by the tokenizer, converter and evaluator.
+    Every token is a small int type code with a float value and the start and end positions of the token, the values
+    of the tokens are kept in parallel arrays instead of a Token object per token.
+    Numbers hold their float value, variables and invalid tokens hold the index of their text in the texts list and
+    the other tokens don't use their value. The stream also keeps the tokenized expression, so the exact text of a
+    number can be read by the backends that don't work with floats
+    """
+    # type codes of the tokens that aren't operators
+    NUMBER = 0
+    VARIABLE = 1
+    OPEN_PAREN = 2
+    CLOSE_PAREN = 3
+    NUMBER_ERROR = 4
+    INVALID_CHAR_ERROR = 5
+    INVALID_CHARS_ERROR = 6
+    # the type code of every operator, operators come after the other codes, the tables of the operators are the
+    # frozen tables of the OpRegistry and are set by build_tables
+    OP_CODES = {}
+    # the token type string of every type code, this is the type of a Token
+    TYPE_NAMES = ("Number", "Variable", "(", ")", "Number_Error", "Invalid_Char_Error", "Invalid_Chars_Error")
+    TYPE_CODES = {}
+    # tables of the operator data by type code, the non operator codes hold None / False
+    OP_CLASSES = ()
+    PRECEDENCES = ()
+    PLACEMENTS = ()
+    IS_OPERATOR = ()
+    IS_UNARY = ()
+    IS_LEFT_SIDED = ()
+    IS_RIGHT_SIDED = ()
+    IS_OPERAND = ()
+    # the tokens that hold the index of their text as their value
+    HAS_TEXT = ()
+
+    @staticmethod
+    def build_tables():
+        """
+        Func that sets the tables of the type codes from the frozen tables of the OpRegistry
+        """
+        op_count = len(OpRegistry.OP_CODES)
+        TokenStream.OP_CODES = OpRegistry.OP_CODES
+        TokenStream.TYPE_NAMES = TokenStream.TYPE_NAMES[:OpRegistry.FIRST_OP_CODE] + tuple(OpRegistry.OP_CODES)
+        TokenStream.TYPE_CODES = {type_name: code for code, type_name in enumerate(TokenStream.TYPE_NAMES)}
+        TokenStream.OP_CLASSES = OpRegistry.OP_CLASSES
+        TokenStream.PRECEDENCES = OpRegistry.PRECEDENCES
+        TokenStream.PLACEMENTS = OpRegistry.PLACEMENTS
+        TokenStream.IS_OPERATOR = (False,) * OpRegistry.FIRST_OP_CODE + (True,) * op_count
+        TokenStream.IS_UNARY = tuple(arity == 1 for arity in OpRegistry.ARITIES)
+        TokenStream.IS_LEFT_SIDED = OpRegistry.IS_LEFT_SIDED
+        TokenStream.IS_RIGHT_SIDED = OpRegistry.IS_RIGHT_SIDED
+        TokenStream.IS_OPERAND = (True, True) + (False,) * (len(TokenStream.TYPE_NAMES) - 2)
+        TokenStream.HAS_TEXT = (False, True, False, False, True, True, True) + (False,) * op_count
+
+    def __init__(self):
+        self.types = array('b')
+        self.values = array('d')
+        self.starts = array('i')
+        self.ends = array('i')
+        # texts of the variables and the invalid tokens
+        self.texts = []
+        # the tokenized expression, str or bytes
+        self.source = ""
+
+    def __len__(self):
+        return len(self.types)
+
+    def append(self, type_code: int, value: float, starting_index: int, ending_index: int):
+        """
+        Func that adds a token to the end of the stream
+        :param type_code:
+        :param value:
+        :param starting_index:
+        :param ending_index:
+        """
+        self.types.append(type_code)
+        self.values.append(value)
+        self.starts.append(starting_index)
+        self.ends.append(ending_index)
+
+    def append_text(self, type_code: int, text: str, starting_index: int, ending_index: int):
+        """
+        Func that adds a token that has a text value (a variable or an invalid token)
+        :param type_code:
+        :param text:
+        :param starting_index:
+        :param ending_index:
+        """
+        self.append(type_code, len(self.texts), starting_index, ending_index)
+        self.texts.append(text)
+
+    def get_text(self, index: int) -> str:
+        """
+        :param index:
+        :return: the text of a variable or an invalid token
+        """
+        return self.texts[int(self.values[index])]
+
+    def get_number_text(self, index: int) -> str:
+        """
+        :param index:
+        :return: the text of a number token in the expression, without its white spaces
+        """
+        text = self.source[self.starts[index]:self.ends[index] + 1]
+        if isinstance(text, bytes):
+            text = text.decode()
+        return ''.join(text.split())
+
+    def get_token(self, index: int):
+        """
+        Func that creates a Token object of a single token, this is only used when a Token is needed for debugging
+        or by code that works with tokens
+        :param index:
+        :return: Token
+        """
+        from CalcParts.Tokenizer import Token
+        type_code = self.types[index]
+        if self.IS_OPERATOR[type_code]:
+            value = self.OP_CLASSES[type_code]
+        elif type_code == self.NUMBER:
+            value = self.values[index]
+        elif type_code in (self.OPEN_PAREN, self.CLOSE_PAREN):
+            value = self.TYPE_NAMES[type_code]
+        else:
+            value = self.get_text(index)
+        return Token(self.TYPE_NAMES[type_code], value, self.starts[index], self.ends[index])
+
+    def copy(self):
+        """
+        :return: a new stream with copies of the arrays
+        """
+        token_stream = TokenStream()
+        token_stream.types = array('b', self.types)
+        token_stream.values = array('d', self.values)
+        token_stream.starts = array('i', self.starts)
+        token_stream.ends = array('i', self.ends)
+        token_stream.texts = list(self.texts)
+        token_stream.source = self.source
+        return token_stream
+
+    def truncate(self, count: int):
+        """
+        Func that keeps only the first tokens of the stream
+        :param count: the amount of tokens to keep
+        """
+        if self.texts:
+            # the texts are added in the order of their tokens
+            self.texts = self.texts[:sum(1 for type_code in self.types[:count] if self.HAS_TEXT[type_code])]
+        del self.types[count:]
+        del self.values[count:]
+        del self.starts[count:]
+        del self.ends[count:]
+
+    def clear(self):
+        """
+        Func that removes all the tokens, the arrays are cleared in place so they are reused
+        """
+        del self.types[:]
+        del self.values[:]
+        del self.starts[:]
+        del self.ends[:]
+        self.texts.clear()
+
+
+OpRegistry.on_freeze(TokenStream.build_tables)
@@ -1,6 +1,53 @@
+import re
+from functools import partial
 from ErrorParts.ErrorHandler import ErrorHandler
 from ErrorParts.Errors import BaseCalcError
-from CalcParts.Operators import OpData, IRightSidedOp
+from CalcParts.OpRegistry import OpRegistry
+from CalcParts.TokenStream import TokenStream
+
+
+def _create_syntax(op_chars: str, as_bytes: bool) -> dict:
+    """
+    Func that compiles the patterns and the char tables of the scan, once for str expressions and once for ascii
+    bytes expressions, the bytes patterns match the same tokens as the str patterns
+    :param op_chars: the escaped chars of all the single char operators
+    :param as_bytes:
+    :return: dict of the patterns and the tables
+    """
+    def compile_pattern(pattern: str):
+        return re.compile(pattern.encode() if as_bytes else pattern)
+
+    # a char of a bytes expression is an int
+    def char_key(char: str):
+        return ord(char) if as_bytes else char
+
+    # in str patterns \x1c-\x1f are white spaces too, so they are added to the ascii white spaces of bytes patterns
+    spaces = r"\t-\r\x1c-\x20" if as_bytes else r"\s"
+    # chars that can't be a part of any valid token
+    invalid_chars = rf"[^0-9.(){op_chars}{spaces}]"
+    # every group is a token kind and the white spaces after a token are skipped with it, white spaces are ignored in
+    # the expression so numbers and invalid chars can have white spaces inside them
+    token_kinds = (
+        rf"(?P<Operator>[{op_chars}])",
+        r"(?P<Paren>[()])",
+        rf"(?P<Number>[0-9.]+(?P<Number_Space>(?:[{spaces}]+[0-9.]+)+)?)",
+        rf"(?P<Invalid_Char>{invalid_chars}+(?:[{spaces}]+{invalid_chars}+)*)",
+    )
+    return {
+        "scanner": compile_pattern(rf"(?:{'|'.join(token_kinds)})[{spaces}]*"),
+        # scanner that is used when there are variables, names are tried before invalid chars
+        "names_scanner": compile_pattern(rf"(?:{'|'.join(token_kinds[:3])}|(?P<Name>[A-Za-z_][A-Za-z0-9_]*)|"
+                                         rf"{token_kinds[3]})[{spaces}]*"),
+        "invalid_pattern": compile_pattern(rf"({invalid_chars}+(?:[{spaces}]+{invalid_chars}+)*)[{spaces}]*"),
+        "space_pattern": compile_pattern(rf"[{spaces}]*"),
+        "close_paren_pattern": compile_pattern(rf"[{spaces}]*\)"),
+        "remove_spaces": partial(compile_pattern(rf"[{spaces}]+").sub, b"" if as_bytes else ""),
+        "op_codes": {char_key(op_key): op_code for op_key, op_code in TokenStream.OP_CODES.items()
+                     if len(op_key) == 1},
+        "paren_codes": {char_key('('): TokenStream.OPEN_PAREN, char_key(')'): TokenStream.CLOSE_PAREN},
+        "minus": char_key('-'),
+        "dot": char_key('.'),
+    }
 
 
 class Tokenizer:
@@ -11,216 +58,272 @@ class Tokenizer:
     1. Invalid chars used in expression (any char that is not in the valid tokens string)
     2. Invalid Number format in expression ie 1234.. or 123.
     3. Invalid Empty expression
+    When the names of variables are passed, a name made of letters, digits and _ that is in the names is turned into a
+    Variable token instead of an invalid chars error.
+    The expression is scanned once with a precompiled pattern, white spaces are skipped and the positions of the tokens
+    are the positions in the original expression.
+    The tokens are saved in a TokenStream, numbers are turned into floats while they are tokenized
     """
+    # the patterns and the tables of str expressions and of ascii bytes expressions, set by build_syntax
+    _str_syntax = None
+    _bytes_syntax = None
+
+    @staticmethod
+    def build_syntax():
+        """
+        Func that compiles the patterns of the operators of the OpRegistry, the bytes patterns are only compiled when
+        the first bytes expression is tokenized so the startup of the calc doesn't pay for them
+        """
+        Tokenizer._str_syntax = _create_syntax(re.escape(OpRegistry.OP_CHARS), as_bytes=False)
+        Tokenizer._bytes_syntax = None
 
     def __init__(self, error_handler: ErrorHandler):
-        # string of all valid chars
-        self._valid_tokens = "1234567890.+-*/&^%$@~!()#"
-        # list to hold all tokens, valid and invalid
-        self._token_list = []
-        # pattern for all valid numbers
-        self._number_pattern = "1234567890."
-        # dict to hold operator and token type values except for minus
-        self._errors = {"Invalid_Chars_Error": "Invalid Chars found: ",
-                        "Invalid_Char_Error": "Invalid Char found: ",
-                        "Number_Error": "Invalid Number Format: ",
-                        "Empty_Input_Error": "Invalid Input, The input must contain an expression",
-                        }
+        # stream to hold all tokens, valid and invalid
+        self._token_stream = TokenStream()
         self._error_handler = error_handler
-        # func dict to handle all the input types
-        self._funcs_dict = {
-            "Number": self._handle_number,
-            "Operator": self._handle_operator,
-            "Paren": self._handle_paren,
-            "Invalid_Char": self._handle_invalid_char,
-        }
+        # the names of the variables that can be used in the current expression
+        self._variables = ()
+        # the patterns and the tables of the expression that is scanned
+        self._syntax = self._str_syntax
 
-    def tokenize_expression(self, exp):
+    def tokenize_expression(self, exp, variables=(), groups: dict = None) -> bool:
         """
         This is the main tokenize func it will create a list of tokens that are in the string
         including error tokens and will catch any errors in the process
         :param exp:
+        :param variables: the names of the variables that can be used in the expression
+        :param groups: dict of the position of a ( to (the position of its ), value), every group is added as a single
+        number token with the value instead of being scanned, see SubtreeCache
+        :return: True if the expression has no errors, see ErrorHandler.check_errors
         """
-        # remove all white spaces and turn the expression into a list
-        cleaned_exp = ''.join(exp.split())
-        cur_pos = 0
-        # check for an empty expression
-        if cleaned_exp:
-            while cur_pos != len(cleaned_exp):
-                starting_index = cur_pos
-                # get the char type and func that handles that type
-                char_type = self._get_cur_char_type(cleaned_exp[cur_pos])
-                func = self._funcs_dict[char_type]
-                # get the data from the handler
-                current_token_value, current_token_type, cur_pos = func(cleaned_exp, cur_pos)
-                # add the token to the list
-                self._token_list.append(Token(current_token_type, current_token_value, starting_index, cur_pos))
-                # check if I need to add an error
-                if current_token_type in self._errors.keys():
-                    self._error_handler.add_error(
-                        BaseCalcError(current_token_type, self._errors[current_token_type] + current_token_value))
-                cur_pos += 1
-        else:
-            # add an empty input error
-            self._error_handler.add_error(BaseCalcError("Empty_Input_Error", self._errors["Empty_Input_Error"]))
-        # check if we need to show errors
-        self._error_handler.check_errors()
+        return self._scan(exp, variables, self._str_syntax, 0, groups)
 
-    def _get_cur_char_type(self, char: str) -> str:
+    def tokenize_bytes(self, exp: bytes) -> bool:
         """
-        Func that decides the current token type based on the char
-        :param char:
-        :return: string that represents the token type
+        Func that tokenizes an expression that is still encoded, ie a line sliced out of a memory mapped file.
+        An ascii expression is scanned as bytes without decoding it, the numbers are turned into floats straight from
+        the bytes and only the text of error tokens is decoded. Any other expression is decoded as utf-8 and
+        tokenized as a string, so the tokens and the errors are always the same as the ones of the decoded expression
+        :param exp: bytes of a single expression without its line break
+        :return: True if the expression has no errors
         """
-        if char in self._number_pattern:
-            return "Number"
-        elif char in OpData.get_op_keys():
-            return "Operator"
-        elif char in "()":
-            return "Paren"
-        else:
-            return "Invalid_Char"
+        if not exp.isascii():
+            return self.tokenize_expression(exp.decode("utf-8", errors="replace"))
+        bytes_syntax = Tokenizer._bytes_syntax
+        if bytes_syntax is None:
+            bytes_syntax = Tokenizer._bytes_syntax = _create_syntax(re.escape(OpRegistry.OP_CHARS), as_bytes=True)
+        return self._scan(exp, (), bytes_syntax)
 
-    def _handle_number(self, cleaned_exp: str, cur_pos: int):
+    def tokenize_from(self, exp, token_count: int, groups: dict = None) -> bool:
         """
-        Func that handles the number tokens
-        :param cleaned_exp:
-        :param cur_pos:
-        :return: current_token_value, current_token_type, cur_pos
+        Func that tokenizes an expression that starts like the last tokenized expression, the first tokens of the
+        stream are kept and only the rest of the expression is scanned, from the start of the first token that isn't
+        kept. The caller makes sure the kept tokens are the same in the new expression, a token is only the same if
+        the start of the token after it wasn't changed, as the next chars can extend a token or change a minus
+        :param exp:
+        :param token_count: the amount of tokens to keep
+        :param groups: the groups that are added as number tokens, only the groups after the kept tokens are added
+        :return: True if the expression has no errors
         """
-        starting_pos = cur_pos
-        current_token_value, cur_pos = self._get_number_token(cleaned_exp, cur_pos)
-        # check if the number was valid
-        current_token_type = self._check_number(current_token_value)
-        # create the error type if needed
-        if current_token_type == "Number_Error":
-            current_token_value = \
-                self._create_error_msg_with_pos(current_token_value, current_token_type, (starting_pos, cur_pos))
-        return current_token_value, current_token_type, cur_pos
-
-    def _handle_operator(self, cleaned_exp: str, cur_pos: int):
-        """
-        Func to tokenize the different operators, including unary minus
-        :param cleaned_exp:
-        :param cur_pos:
-        :return: current_token_value, current_token_type, cur_pos
-        """
-        char = cleaned_exp[cur_pos]
-        if char == '-':
-            # check if the minus is unary or not
-            current_token_value = self._check_unary_minus(cleaned_exp, cur_pos)
-            current_token_type = current_token_value
+        token_stream = self._token_stream
+        start_pos = 0
+        if 0 < token_count < len(token_stream):
+            start_pos = token_stream.starts[token_count]
+            token_stream.truncate(token_count)
         else:
-            current_token_value = char
-            current_token_type = char
-        current_token_value = OpData.get_op_class(current_token_value)
-        return current_token_value, current_token_type, cur_pos
+            token_stream.clear()
+        return self._scan(exp, (), self._str_syntax, start_pos, groups)
 
-    def _handle_paren(self, cleaned_exp: str, cur_pos: int):
+    def _scan(self, exp, variables, syntax: dict, start_pos: int = 0, groups: dict = None) -> bool:
         """
-        Func to tokenize the parentheses
-        :param cleaned_exp:
-        :param cur_pos:
-        :return: current_token_value, current_token_type, cur_pos
+        Func that scans the expression into the token stream and checks the errors
+        :param exp: str expression or ascii bytes expression
+        :param variables:
+        :param syntax: the patterns and the tables that match the type of the expression
+        :param start_pos: the position the scan starts from, the tokens before it are already in the stream
+        :param groups: the groups that are added as number tokens, see tokenize_expression
+        :return: True if the expression has no errors
         """
-        return cleaned_exp[cur_pos], cleaned_exp[cur_pos], cur_pos
+        self._variables = variables
+        self._syntax = syntax
+        token_stream = self._token_stream
+        token_stream.source = exp
+        # the arrays of the stream are filled directly, this is the hottest loop of the tokenizer
+        add_type = token_stream.types.append
+        add_value = token_stream.values.append
+        add_start = token_stream.starts.append
+        add_end = token_stream.ends.append
+        op_codes = syntax["op_codes"]
+        paren_codes = syntax["paren_codes"]
+        minus = syntax["minus"]
+        match = syntax["names_scanner"].match if variables else syntax["scanner"].match
+        # skip the white spaces at the start, every match skips the white spaces after its token
+        cur_pos = syntax["space_pattern"].match(exp, start_pos).end()
+        exp_len = len(exp)
+        while cur_pos < exp_len:
+            cur_match = match(exp, cur_pos)
+            token_kind = cur_match.lastgroup
+            if token_kind == "Operator":
+                char = exp[cur_pos]
+                if char == minus:
+                    # check if the minus is unary or not
+                    add_type(TokenStream.OP_CODES[self._check_unary_minus(exp, cur_pos)])
+                else:
+                    add_type(op_codes[char])
+                add_value(0)
+                add_start(cur_pos)
+                add_end(cur_pos)
+            elif token_kind == "Paren":
+                if groups and cur_pos in groups:
+                    # the group is a single number that ends at its )
+                    close_pos, value = groups[cur_pos]
+                    add_type(TokenStream.NUMBER)
+                    add_value(value)
+                    add_start(cur_pos)
+                    add_end(close_pos)
+                    cur_pos = syntax["space_pattern"].match(exp, close_pos + 1).end()
+                    continue
+                add_type(paren_codes[exp[cur_pos]])
+                add_value(0)
+                add_start(cur_pos)
+                add_end(cur_pos)
+            elif token_kind == "Number":
+                if self._handle_number(cur_match, cur_pos):
+                    # fail fast has its error
+                    break
+            elif token_kind == "Name" and cur_match.group("Name") in variables:
+                token_stream.append_text(TokenStream.VARIABLE, cur_match.group("Name"), cur_pos,
+                                         cur_match.end("Name") - 1)
+            else:
+                # a name that isn't a variable is a part of the invalid chars
+                cur_match = self._handle_invalid_char(exp, cur_pos)
+                if self._error_handler.is_stopped():
+                    break
+            cur_pos = cur_match.end()
+        # check for an empty expression
+        if not token_stream:
+            # add an empty input error
+            self._error_handler.add_error(BaseCalcError("Empty_Input_Error"))
+        # check if we need to show errors
+        return self._error_handler.check_errors()
 
-    def _get_number_token(self, cleaned_exp: str, starting_index: int):
+    def _handle_number(self, cur_match, starting_pos: int) -> bool:
         """
-        Func that returns the number token, even if it is invalid, this func doesn't check the token
-        :param cleaned_exp:
-        :param starting_index:
-        :return: returns the number token, also returns the next index to start from
+        Func that handles the number tokens
+        :param cur_match:
+        :param starting_pos:
+        :return: True if the number is invalid and the scan must stop, see ErrorHandler.add_error
         """
-        cur_index = starting_index
-        current_token = cleaned_exp[cur_index]
-        cur_index += 1
-        while cur_index < len(cleaned_exp) and cleaned_exp[cur_index] in self._number_pattern:
-            current_token += cleaned_exp[cur_index]
-            cur_index += 1
-        return current_token, cur_index - 1
+        current_token_value = cur_match.group("Number")
+        if cur_match.start("Number_Space") != -1:
+            # the number has white spaces in it
+            current_token_value = self._syntax["remove_spaces"](current_token_value)
+        cur_pos = cur_match.end("Number") - 1
+        # check if the number was valid
+        current_token_type = self._check_number(current_token_value)
+        if current_token_type == "Number":
+            # float takes the number both as str and as bytes
+            self._token_stream.append(TokenStream.NUMBER, float(current_token_value), starting_pos, cur_pos)
+        else:
+            if isinstance(current_token_value, bytes):
+                current_token_value = current_token_value.decode()
+            # create the error
+            self._token_stream.append_text(TokenStream.NUMBER_ERROR, current_token_value, starting_pos, cur_pos)
+            return self._add_token_error(current_token_value, current_token_type, (starting_pos, cur_pos))
+        return False
 
-    def _check_number(self, number_value: str):
+    def _check_number(self, number_value):
         """
         Func that checks the number token to see if it is valid
-        :param number_value:
+        :param number_value: str or bytes
         :return: "Number" if the number token is valid else it returns "Number_Error"
         """
-        if number_value.count('.') <= 1 and not number_value.startswith('.') and not number_value.endswith('.'):
+        dot = self._syntax["dot"]
+        if dot not in number_value:
+            return "Number"
+        if number_value.count(dot) <= 1 and number_value[0] != dot and number_value[-1] != dot:
             return "Number"
         return "Number_Error"
 
+    def get_token_stream(self) -> TokenStream:
+        """
+        Func that returns the token stream
+        :return: the TokenStream of the expression
+        """
+        return self._token_stream
+
     def get_tokens(self) -> list:
         """
-        Func that returns the token list
+        Func that returns the tokens as Token objects, used for debugging
         :return: list of tokens
         """
-        return self._token_list
+        return [self._token_stream.get_token(index) for index in range(len(self._token_stream))]
 
     def clear_tokenizer(self):
         """
-        Func that clears the used token list
+        Func that clears the used token stream, the stream is cleared in place so it is reused between expressions
         """
-        self._token_list = []
+        self._token_stream.clear()
 
-    def _check_unary_minus(self, cleaned_exp: str, cur_pos: int):
+    def _check_unary_minus(self, exp: str, cur_pos: int):
         """
         Func that checks if a minus is unary or binary
         :return: minus type
         """
+        types = self._token_stream.types
         # make sure that (-) is a binary minus for future error handling
-        if len(self._token_list) >= 1 and self._token_list[-1].get_token_type() == '(' and \
-                len(cleaned_exp) >= 3 and cleaned_exp[cur_pos + 1] == ')':
+        if len(types) >= 1 and types[-1] == TokenStream.OPEN_PAREN and \
+                self._syntax["close_paren_pattern"].match(exp, cur_pos + 1):
             return '-'
-        if len(self._token_list) == 0 or (
-                self._token_list[-1].get_token_type() not in ["Number", ")"] and
-                not isinstance(self._token_list[-1].get_token_value(), IRightSidedOp)):
+        if len(types) == 0 or (
+                not TokenStream.IS_OPERAND[types[-1]] and types[-1] != TokenStream.CLOSE_PAREN and
+                not TokenStream.IS_RIGHT_SIDED[types[-1]]):
             return "U-"
         else:
             return '-'
 
-    def _handle_invalid_char(self, cleaned_exp: str, cur_pos: int):
+    def _handle_invalid_char(self, exp: str, starting_pos: int):
         """
         Func that collects an invalid token and decides the correct error type
-        :param cleaned_exp:
-        :param cur_pos:
-        :return: current_token, current_token_type, cur_pos
-        """
-        # save the starting pos
-        starting_pos = cur_pos
-        current_token_type = "Invalid_Char_Error"
-        current_token_value = cleaned_exp[cur_pos]
-        cur_pos += 1
-        while cur_pos < len(cleaned_exp) and cleaned_exp[cur_pos] not in self._valid_tokens:
-            current_token_type = "Invalid_Chars_Error"
-            current_token_value += cleaned_exp[cur_pos]
-            cur_pos += 1
-        cur_pos -= 1
-        current_token_value = \
-            self._create_error_msg_with_pos(current_token_value, current_token_type, (starting_pos, cur_pos))
-        return current_token_value, current_token_type, cur_pos
-
-    def _create_error_msg_with_pos(self, token_value: str, error_type: str, error_pos: tuple) -> str:
-        """
-        This func creates an informative error msg for the invalid chars errors
+        :param exp:
+        :param starting_pos:
+        :return: the match of the invalid chars
+        """
+        cur_match = self._syntax["invalid_pattern"].match(exp, starting_pos)
+        # remove the white spaces inside the invalid chars
+        current_token_value = self._syntax["remove_spaces"](cur_match.group(1))
+        if isinstance(current_token_value, bytes):
+            current_token_value = current_token_value.decode()
+        current_token_type = "Invalid_Char_Error" if len(current_token_value) == 1 else "Invalid_Chars_Error"
+        cur_pos = cur_match.end(1) - 1
+        self._token_stream.append_text(TokenStream.TYPE_CODES[current_token_type], current_token_value, starting_pos,
+                                       cur_pos)
+        self._add_token_error(current_token_value, current_token_type, (starting_pos, cur_pos))
+        return cur_match
+
+    def _add_token_error(self, token_value: str, error_type: str, error_pos: tuple) -> bool:
+        """
+        Func that adds the error of an invalid token, its msg is only created when it is shown
         :param token_value:
         :param error_type:
-        :return: string that represents the ending part of the error msg
+        :param error_pos: (start, end) of the token
+        :return: True if the scan must stop
         """
-        if error_type == "Invalid_Chars_Error" or error_type == "Number_Error":
-            token_value += f" ,at position: {error_pos[0]} -> {error_pos[1]}"
-        else:
-            token_value += f" ,at position: {error_pos[0]}"
-        return token_value
+        return self._error_handler.add_error(BaseCalcError(error_type, None, error_pos, (token_value,)))
+
+
+OpRegistry.on_freeze(Tokenizer.build_syntax)
 
 
 class Token:
     """
-    This class is used to hold information about the different tokens
-    the token value can be a string if the token is a number or parentheses, it can also be an operator class instance
-    if the token is an operator
+    This class is used to hold information about a single token of a TokenStream, it is used for debugging
+    the token value is a float if the token is a number, it can be a string if the token is a variable name, an invalid
+    token or parentheses, it can also be an operator class instance if the token is an operator
     """
 
+    __slots__ = ("_token_type", "_token_value", "_starting_index", "_ending_index")
+
     def __init__(self, token_type: str, token_value, starting_index: int, ending_index: int):
         self._token_type = token_type
         self._token_value = token_value
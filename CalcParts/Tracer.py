@@ -0,0 +1,124 @@
+import threading
+from abc import ABC, abstractmethod
+
+
+class StageTracer(ABC):
+    """
+    Tracer interface that gets callbacks around the stages (tokenize / convert / eval) of every expression.
+    begin_expression is called once for every expression that runs through the stages, only if it returns True the
+    stage callbacks are called and the stages are timed, so a tracer can sample the expressions it traces
+    """
+
+    @abstractmethod
+    def begin_expression(self, input_exp: str) -> bool:
+        """
+        :param input_exp: the expression, bytes when it is evaluated from an encoded buffer
+        :return: True if the stages of the expression should be traced
+        """
+        pass
+
+    @abstractmethod
+    def stage_start(self, stage: str):
+        """
+        Called right before a stage starts
+        :param stage: tokenize, convert or eval
+        """
+        pass
+
+    @abstractmethod
+    def stage_end(self, stage: str, elapsed_ns: int, token_count: int, post_fix_length: int, error_count: int):
+        """
+        Called right after a stage ended, also when the stage found errors
+        :param stage: tokenize, convert or eval
+        :param elapsed_ns: the run time of the stage in nano seconds
+        :param token_count: amount of tokens of the expression
+        :param post_fix_length: length of the postfix list, 0 before the convert stage
+        :param error_count: amount of errors the stage found
+        """
+        pass
+
+
+class NullTracer(StageTracer):
+    """
+    The default tracer, it doesn't trace any expression so the stages run without any timing
+    """
+
+    def begin_expression(self, input_exp: str) -> bool:
+        return False
+
+    def stage_start(self, stage: str):
+        pass
+
+    def stage_end(self, stage: str, elapsed_ns: int, token_count: int, post_fix_length: int, error_count: int):
+        pass
+
+
+class SamplingCollector(StageTracer):
+    """
+    Tracer that traces one of every sample_every expressions and aggregates the stage callbacks into a breakdown of
+    the run time of every stage, the collector can be shared by a handler that is used from many threads
+    """
+    STAGES = ("tokenize", "convert", "eval")
+
+    def __init__(self, sample_every: int = 1):
+        self._sample_every = sample_every
+        self._expression_count = 0
+        self._stage_data = {}
+        self._lock = threading.Lock()
+        self.clear()
+
+    def begin_expression(self, input_exp: str) -> bool:
+        with self._lock:
+            self._expression_count += 1
+            return self._expression_count % self._sample_every == 0
+
+    def stage_start(self, stage: str):
+        pass
+
+    def stage_end(self, stage: str, elapsed_ns: int, token_count: int, post_fix_length: int, error_count: int):
+        with self._lock:
+            data = self._stage_data[stage]
+            data[0] += 1
+            data[1] += elapsed_ns
+            if elapsed_ns > data[2]:
+                data[2] = elapsed_ns
+            data[3] += token_count
+            data[4] += post_fix_length
+            data[5] += error_count
+
+    def get_stats(self) -> dict:
+        """
+        Func that returns the aggregated breakdown of the traced stages
+        :return: dict of stage to dict with the count, mean / max time in micro seconds, share of the total time and
+        the mean token count, mean postfix length and total error count
+        """
+        with self._lock:
+            stage_data = {stage: list(data) for stage, data in self._stage_data.items()}
+        total_ns = sum(data[1] for data in stage_data.values())
+        stats = {}
+        for stage, (count, stage_ns, max_ns, tokens, post_fix_length, errors) in stage_data.items():
+            stats[stage] = {
+                "count": count,
+                "mean_us": stage_ns / count / 1e3 if count else 0.0,
+                "max_us": max_ns / 1e3,
+                "share": stage_ns / total_ns if total_ns else 0.0,
+                "tokens": tokens / count if count else 0.0,
+                "post_fix": post_fix_length / count if count else 0.0,
+                "errors": errors,
+            }
+        return stats
+
+    def get_expression_count(self) -> int:
+        """
+        :return: amount of expressions seen, traced or not
+        """
+        return self._expression_count
+
+    def clear(self):
+        """
+        Func that resets all the collected data
+        """
+        with self._lock:
+            self._expression_count = 0
+            # count, total ns, max ns, tokens, postfix length, errors of every stage
+            self._stage_data = {stage: [0, 0, 0, 0, 0, 0] for stage in self.STAGES}
@@ -0,0 +1,197 @@
+from CalcParts.Operators import *
+from CalcParts.Kernels import OpKernels
+from CalcParts.TokenStream import TokenStream
+from CalcParts.Evaluator import Evaluator
+
+try:
+    import numpy as np
+except ImportError:
+    # numpy is only needed for the vectorized evaluation
+    np = None
+
+
+class VectorEvaluator:
+    """
+    This class evaluates a postfix list once over whole columns of values, every variable in the postfix list is
+    bound to a numpy array and every operator is applied element wise on the arrays.
+    An error in a single element doesn't stop the evaluation, the element gets the code of its first error in the error
+    code array and its value is set to nan, the errors are the same errors the evaluator gives for a single value
+    """
+    # the error type of every error code, code 0 means there was no error
+    ERROR_TYPES = (
+        None,
+        "Zero_Div_Error",
+        "Zero_Pow_Error",
+        "Pow_Overflow_Error",
+        "Invalid_Factorial_Error",
+        "Large_Number_Error",
+        "Invalid_Hash_Error",
+        "Small_Number_Error",
+        "Safe_Guard_Error",
+    )
+
+    def __init__(self):
+        if np is None:
+            raise ImportError("numpy is needed for the vectorized evaluation, install it with: pip install numpy")
+        self._error_codes = None
+        self._binary_kernels = {
+            Plus: self._plus,
+            Minus: self._minus,
+            Multiplication: self._multiplication,
+            Division: self._division,
+            Power: self._power,
+            Max: self._max,
+            Min: self._min,
+            Modulo: self._modulo,
+            Avg: self._avg,
+        }
+        self._unary_kernels = {
+            UMinus: self._negative,
+            Negative: self._negative,
+            Factorial: self._factorial,
+            Hash: self._hash,
+        }
+        # table of all the factorials that fit in a float
+        self._factorial_table = np.array([float(value) for value in OpKernels.FACTORIAL_TABLE])
+
+    @staticmethod
+    def get_error_type(error_code: int):
+        """
+        :param error_code:
+        :return: the error type of an error code, None for code 0
+        """
+        return VectorEvaluator.ERROR_TYPES[error_code]
+
+    def eval(self, token_stream: TokenStream, post_fix, columns: dict) -> tuple:
+        """
+        Main eval func that evaluates the postfix list over the bound columns
+        :param token_stream: the token stream the postfix indexes point into
+        :param post_fix: the indexes of the tokens in postfix order
+        :param columns: dict of variable name to array like value
+        :return: (values, error_codes) arrays in the broadcast shape of the columns
+        """
+        arrays = {name: np.asarray(column, dtype=float) for name, column in columns.items()}
+        shape = np.broadcast_shapes(*(array.shape for array in arrays.values())) if arrays else ()
+        self._error_codes = np.zeros(shape, dtype=np.int8)
+        calculation_stack = []
+        with np.errstate(all="ignore"):
+            for index in post_fix:
+                type_code = token_stream.types[index]
+                if type_code == TokenStream.NUMBER:
+                    calculation_stack.append(np.float64(token_stream.values[index]))
+                elif type_code == TokenStream.VARIABLE:
+                    calculation_stack.append(arrays[token_stream.get_text(index)])
+                else:
+                    op = TokenStream.OP_CLASSES[type_code]
+                    if TokenStream.IS_UNARY[type_code]:
+                        num = calculation_stack.pop()
+                        kernel = self._unary_kernels.get(type(op))
+                        calculation_stack.append(kernel(num) if kernel is not None else
+                                                 self._apply_scalar(op.unary_evaluate, num))
+                    else:
+                        second_operand = calculation_stack.pop()
+                        first_operand = calculation_stack.pop()
+                        kernel = self._binary_kernels.get(type(op))
+                        calculation_stack.append(kernel(first_operand, second_operand) if kernel is not None else
+                                                 self._apply_scalar(op.binary_evaluate, first_operand, second_operand))
+            values = np.array(np.broadcast_to(calculation_stack.pop(), shape), dtype=float)
+        values[self._error_codes != 0] = np.nan
+        return values, self._error_codes
+
+    def _set_errors(self, condition, error_type: str, values):
+        """
+        Func that gives the elements that hit an error the error code, an element keeps the code of its first error
+        :param condition: bool array of the elements that hit the error
+        :param error_type:
+        :param values: the values of the op
+        :return: the values with nan in the elements that have an error
+        """
+        new_errors = np.broadcast_to(condition, self._error_codes.shape) & (self._error_codes == 0)
+        self._error_codes[new_errors] = self.ERROR_TYPES.index(error_type)
+        return np.where(self._error_codes != 0, np.nan, values)
+
+    def _apply_scalar(self, op_func, *operands):
+        """
+        Func that applies an op without a vector kernel (ie an op of a plugin) on every element, the elements that
+        already have an error are skipped
+        :param op_func: the evaluate func of the op
+        :param operands: the arrays of the operands
+        :return: the values of the op
+        """
+        operands = np.broadcast_arrays(*operands, self._error_codes)
+        values = np.full(self._error_codes.shape, np.nan)
+        for position in np.ndindex(self._error_codes.shape):
+            if self._error_codes[position]:
+                continue
+            try:
+                values[position] = op_func(*(float(operand[position]) for operand in operands[:-1]))
+            except Exception as e:
+                error_type = Evaluator.exception_to_error(e).get_error_type()
+                if error_type not in self.ERROR_TYPES:
+                    error_type = "Safe_Guard_Error"
+                self._error_codes[position] = self.ERROR_TYPES.index(error_type)
+        return values
+
+    def _plus(self, num1, num2):
+        return num1 + num2
+
+    def _minus(self, num1, num2):
+        return num1 - num2
+
+    def _multiplication(self, num1, num2):
+        return num1 * num2
+
+    def _division(self, num1, num2):
+        return self._set_errors(num2 == 0, "Zero_Div_Error", num1 / num2)
+
+    def _modulo(self, num1, num2):
+        # np.mod uses the python sign rules for %
+        return self._set_errors(num2 == 0, "Zero_Div_Error", np.mod(num1, num2))
+
+    def _power(self, num1, num2):
+        result = np.power(num1, num2)
+        # math.pow fails for a negative base with a non int power and for 0 to a negative power
+        invalid = np.isfinite(num1) & np.isfinite(num2) & \
+            (((num1 < 0) & (num2 % 1 != 0)) | ((num1 == 0) & (num2 < 0)))
+        result = self._set_errors(invalid, "Zero_Pow_Error", result)
+        overflow = np.isinf(result) & np.isfinite(num1) & np.isfinite(num2)
+        return self._set_errors(overflow, "Pow_Overflow_Error", result)
+
+    def _max(self, num1, num2):
+        return np.where(num1 > num2, num1, num2)
+
+    def _min(self, num1, num2):
+        return np.where(num1 < num2, num1, num2)
+
+    def _avg(self, num1, num2):
+        return (num1 + num2) / 2
+
+    def _negative(self, num):
+        return num * -1
+
+    def _factorial(self, num):
+        num = self._set_errors((num % 1 != 0) | (num < 0), "Invalid_Factorial_Error", num)
+        num = self._set_errors(num >= Factorial.MAX_FLOAT_SIZE, "Large_Number_Error", num)
+        valid = np.isfinite(num)
+        indexes = np.where(valid, num, 0).astype(np.int64)
+        return np.where(valid, self._factorial_table[indexes], np.nan)
+
+    def _hash(self, num):
+        num = self._set_errors(num < 0, "Invalid_Hash_Error", num)
+        num = self._set_errors((num < 1e-10) & (num != 0), "Small_Number_Error", num)
+        num = self._set_errors(num > 1e15, "Large_Number_Error", num)
+        num = np.asarray(np.broadcast_to(num, self._error_codes.shape), dtype=float)
+        valid = np.isfinite(num)
+        is_int = valid & (num % 1 == 0)
+        # the digit sum of whole numbers is done with arithmetic on all the elements at once
+        remaining = np.where(is_int, num, 0).astype(np.int64)
+        output = np.zeros(remaining.shape, dtype=np.int64)
+        while remaining.any():
+            output += remaining % 10
+            remaining //= 10
+        output = np.where(valid, output, np.nan)
+        # numbers with a decimal part use the digits of their str, same as the scalar operator
+        not_int = valid & ~is_int
+        if not_int.any():
+            output[not_int] = [OpKernels.digit_sum(value) for value in num[not_int].tolist()]
+        return output
@@ -5,19 +5,57 @@ from CalcParts.OutputHandler import OutputHandler
 class ErrorHandler:
     """
     Class that handles all error handler funcs, this class will hold a list of the found errors and will be
-    able to show the errors to the user by using the OutputHandler
+    able to show the errors to the user by using the OutputHandler.
+    In fail fast mode the first added error stops the current stage right away, so only one error is found.
+    By default a stage with errors is stopped by a stop iteration error, a handler that gives result codes never
+    raises, the stages return False when they have errors and stop their loops when is_stopped is True, this is the
+    path the pipelines use as raising and catching on every invalid expression is slow
     """
 
-    def __init__(self):
+    def __init__(self, fail_fast: bool = False, raise_errors: bool = True):
         # this is the error list that will hold all the errors
         self._errorList = []
+        self._fail_fast = fail_fast
+        # False gives result codes instead of stop iteration errors
+        self._raise_errors = raise_errors
+        # True after the first error in fail fast mode
+        self._stopped = False
 
-    def add_error(self, error: BaseCalcError):
+    def add_error(self, error: BaseCalcError) -> bool:
         """
-        Func that adds an error to the error list
+        Func that adds an error to the error list, in fail fast mode it raises a stop iteration error or only keeps
+        the first error if the handler gives result codes
         :param error:
+        :return: True if the stage must stop
         """
+        if self._stopped:
+            return True
         self._errorList.append(error)
+        if self._fail_fast:
+            self._stopped = True
+            if self._raise_errors:
+                raise StopIteration
+            return True
+        return False
+
+    def is_stopped(self) -> bool:
+        """
+        :return: True if the fail fast mode has its error and the stage must stop
+        """
+        return self._stopped
+
+    def set_fail_fast(self, fail_fast: bool):
+        """
+        Func that sets if the handler stops at the first error or collects all the errors
+        :param fail_fast:
+        """
+        self._fail_fast = fail_fast
+
+    def is_fail_fast(self) -> bool:
+        """
+        :return: True if the handler stops at the first error
+        """
+        return self._fail_fast
 
     def has_errors(self) -> bool:
         """
@@ -35,16 +73,24 @@ class ErrorHandler:
 
     def clear_errors(self):
         """
-        Func that will clear all the errors
+        Func that will clear all the errors, a returned error list is given to the caller so a new list is only
+        created if the old one holds errors
         """
-        self._errorList = []
+        if self._errorList:
+            self._errorList = []
+        self._stopped = False
 
-    def check_errors(self):
+    def check_errors(self) -> bool:
         """
-        Func that will raise a stop iteration error if there are any errors
+        Func that checks the errors at the end of a stage, it will raise a stop iteration error if there are any
+        errors unless the handler gives result codes
+        :return: True if there are no errors
         """
-        if self.has_errors():
-            raise StopIteration
+        if self._errorList:
+            if self._raise_errors:
+                raise StopIteration
+            return False
+        return True
 
     def get_errors(self):
         """
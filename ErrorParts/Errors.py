@@ -1,18 +1,69 @@
+# the msg templates of the errors by their type, a template is formatted with the operands of the error and its
+# positions as pos, an error type without a template shows its first operand (ie the exception of an operator)
+ERROR_TEMPLATES = {
+    "Invalid_Chars_Error": "Invalid Chars found: {0} ,at position: {pos[0]} -> {pos[1]}",
+    "Invalid_Char_Error": "Invalid Char found: {0} ,at position: {pos[0]}",
+    "Number_Error": "Invalid Number Format: {0} ,at position: {pos[0]} -> {pos[1]}",
+    "Empty_Input_Error": "Invalid Input, The input must contain an expression",
+    "Missing_Open_Paren_Error": "Missing Opening parentheses to closing parentheses at position: {pos[0]}",
+    "Missing_Close_Paren_Error": "Missing Closing parentheses to opening parentheses at position: {pos[0]}",
+    "Invalid_Before_Open_Paren_Error": "Invalid token before ( at position: {pos[0]}",
+    "Invalid_After_Close_Paren_Error": "Invalid token after ) at position: {pos[0]}",
+    "Invalid_Empty_Paren_Error": "Invalid empty parentheses at position: {pos[0]} -> {pos[1]}",
+    "Missing_Operands_Error": "Missing operands for: {0} at position: {pos[0]}",
+    "Missing_Operand_Error": "Missing operand for: {0} at position: {pos[0]}",
+    "Invalid_Unary_Usage_Error": "Invalid usage of: {0} at position: {pos[0]} cannot come {1}: {2}",
+    "Zero_Div_Error": "Cannot divide value by 0",
+    # the msgs of the exceptions of the operators and the limits by their msg key, see CalcException
+    "Factorial_Not_Int": "Cannot perform factorial on non int number",
+    "Factorial_Negative": "Cannot perform factorial on negative number",
+    "Factorial_Size": "Invalid factorial size, factorial of: {0} is too large",
+    "Hash_Negative": "Cannot perform hash on negative num: {0}",
+    "Hash_Small": "Invalid small number for # operator, cannot preform function on: {0}",
+    "Hash_Large": "Invalid large number for # operator, cannot preform function on: {0}",
+    "Modulo_Large": "Invalid large number for % operator, cannot preform {0}%{1} with a precision of {2} digits",
+    "Float_Large": "Invalid large number, the number is too large to be a float",
+    "Result_Size": "Invalid result size, the result has more than {0} digits",
+    "Invalid_Power": "Invalid power operation, cannot raise: {0} to the power of: {1}",
+    "Power_Overflow": "Power operation result is too large, cannot preform {0}^{1}",
+    "Cost_Budget": "The expression is too expensive, its values can have about {0:.6g} digits and the budget is {1:g} "
+                   "digits",
+    "Operation_Limit": "The expression is too long, it has more than {0} numbers and operators",
+    "Time_Limit": "The evaluation took more than {0} seconds",
+}
+
+
 class BaseCalcError:
     """
     Base error class used to hold the error msg for errors in the tokenizer and converter so that the user will get
     multiple errors if there are, in the evaluator every error is critical as we can't continue to evaluate if we hit
     one so the evaluator uses custom exceptions to catch errors.
+    An error is a record of its type, the positions in the expression it points at and its operands (ie the invalid
+    token or the exception of an operator), the msg is only created from the template of the type (ERROR_TEMPLATES)
+    when it is asked for, so invalid input doesn't pay for msgs that are never shown
     """
+    __slots__ = ("_error_type", "_error_msg", "_positions", "_operands")
 
-    def __init__(self, error_type, error_msg):
-        self._error_msg = error_msg
+    def __init__(self, error_type: str, error_msg: str = None, positions: tuple = (), operands: tuple = ()):
+        """
+        :param error_type:
+        :param error_msg: the msg of the error, None creates it from the template of the type when it is asked for
+        :param positions: the start (and end) position of the error in the expression
+        :param operands: the values the msg is formatted with
+        """
         self._error_type = error_type
+        self._error_msg = error_msg
+        self._positions = positions
+        self._operands = operands
 
     def get_msg(self) -> str:
         """
         :return: returns the error msg
         """
+        if self._error_msg is None:
+            template = ERROR_TEMPLATES.get(self._error_type)
+            self._error_msg = template.format(*self._operands, pos=self._positions) if template is not None else \
+                str(self._operands[0])
         return self._error_msg
 
     def get_error_type(self):
@@ -21,47 +72,100 @@ class BaseCalcError:
         """
         return self._error_type
 
+    def get_positions(self) -> tuple:
+        """
+        :return: the start (and end) position of the error in the expression, empty if the error has no position
+        """
+        return self._positions
+
+    def get_operands(self) -> tuple:
+        """
+        :return: the values the msg of the error is created from
+        """
+        return self._operands
+
+    def __str__(self):
+        return f"Error: {self.get_msg()}"
+
+
+def _show_operand(operand):
+    """
+    :param operand: an operand of a msg
+    :return: the operand, or a text instead of it if it is a number with more digits than python turns into a str
+    """
+    try:
+        str(operand)
+    except ValueError:
+        return "a number with too many digits to show"
+    return operand
+
+
+class CalcException(Exception):
+    """
+    Base class of the custom exceptions of the operators and the limits. An exception raised with a msg key of
+    ERROR_TEMPLATES and the operands of the msg (ie raise LargeNumberError("Factorial_Size", num)) only formats its
+    msg when it is shown, so an error whose msg is never shown doesn't turn its (maybe huge) operands into text.
+    An exception raised with a msg (ie by an operator plugin) is shown as is
+    """
+
     def __str__(self):
-        return f"Error: {self._error_msg}"
+        template = ERROR_TEMPLATES.get(self.args[0]) if self.args and isinstance(self.args[0], str) else None
+        if template is None:
+            return super().__str__()
+        return template.format(*map(_show_operand, self.args[1:]))
 
 
-class InvalidFactorialError(Exception):
+class InvalidFactorialError(CalcException):
     """
     Class for the invalid factorial attempt error
     """
     pass
 
 
-class LargeNumberError(Exception):
+class LargeNumberError(CalcException):
     """
     Class for the large number error
     """
     pass
 
 
-class SmallNumberError(Exception):
+class SmallNumberError(CalcException):
     """
     Class for the small number error
     """
     pass
 
 
-class InvalidHashError(Exception):
+class InvalidHashError(CalcException):
     """
     Class for the invalid hash attempt error
     """
     pass
 
 
-class InvalidPowerError(Exception):
+class InvalidPowerError(CalcException):
     """
     Class for the invalid power attempt error
     """
     pass
 
 
-class PowerOverflowError(Exception):
+class PowerOverflowError(CalcException):
     """
     Class for the power overflow error
     """
     pass
+
+
+class CostBudgetError(CalcException):
+    """
+    Class for the error of an expression whose estimated values are larger than the budget
+    """
+    pass
+
+
+class EvalLimitError(CalcException):
+    """
+    Class for the error of an evaluation that ran over its operation count or time limit
+    """
+    pass
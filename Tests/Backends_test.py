@@ -0,0 +1,88 @@
+"""
+Numeric backend tests, the exact and decimal backends must keep whole numbers exact and raise the same errors as the
+float backend
+"""
+from decimal import Decimal
+from fractions import Fraction
+import pytest
+from CalcHandler import CalcHandler
+from CalcParts.EvalPipeline import EvalPipeline
+from CalcParts.NumericBackends import NumericBackend
+from Tests.conftest import error_types
+
+
+def test_exact_ints():
+    calc_handler = CalcHandler(backend="exact")
+    assert calc_handler.run_single_exp("2^64+1") == (2 ** 64 + 1, None)
+    assert calc_handler.run_single_exp("9007199254740993+0") == (9007199254740993, None)
+    assert calc_handler.run_single_exp("200!#") == (1404, None)
+    assert calc_handler.run_single_exp("12/4") == (3, None)
+    assert type(calc_handler.run_single_exp("12/4*1")[0]) is int
+
+
+def test_exact_huge_exponents():
+    calc_handler = CalcHandler(backend="exact")
+    # the exponents are too large to be floats
+    assert calc_handler.run_single_exp("1^(2^1100)") == (1, None)
+    assert calc_handler.run_single_exp("(0-1)^(2^1100)") == (1, None)
+    assert calc_handler.run_single_exp("(0-1)^(2^1100+1)") == (-1, None)
+    assert calc_handler.run_single_exp("0^(2^1100)") == (0, None)
+    assert calc_handler.run_single_exp("(0-1)^(0-3)") == (-1, None)
+    # a fraction to the power of 0 is a whole number like in the float backend
+    for expression, expected in [("2.5^0", 1), ("(2.5^0)!", 1), ("(1/3)^0*7", 7)]:
+        result = calc_handler.run_single_exp(expression)
+        assert result == (expected, None) and result[0].__class__ is int, expression
+        assert CalcHandler().run_single_exp(expression) == (expected, None)
+    for expression in ["(2^3000)^(2^3000)", "(1/2)^(2^1100)", "(2^3000)^(0-2^3000)"]:
+        assert error_types(calc_handler.run_single_exp(expression)) == ["Pow_Overflow_Error"], expression
+
+
+def test_exact_fractions():
+    calc_handler = CalcHandler(backend="exact")
+    assert calc_handler.run_single_exp("1/3") == (Fraction(1, 3), None)
+    assert calc_handler.run_single_exp("(1/3)*3") == (1, None)
+    assert calc_handler.run_single_exp("0.1+0.2") == (Fraction(3, 10), None)
+    assert calc_handler.run_single_exp("1 2.5@1") == (Fraction(27, 4), None)
+    # a power with an exponent that isn't whole can't be exact
+    assert calc_handler.run_single_exp("2^0.5") == (2 ** 0.5, None)
+
+
+def test_decimal_precision():
+    calc_handler = CalcHandler(backend="decimal", precision=50)
+    assert calc_handler.run_single_exp("0.1+0.2") == (Decimal("0.3"), None)
+    assert calc_handler.run_single_exp("1/3") == (Decimal("0." + "3" * 50), None)
+    assert calc_handler.run_single_exp("2^64+1") == (2 ** 64 + 1, None)
+    assert calc_handler.run_single_exp("-7%3") == (-1, None) and calc_handler.run_single_exp("7%-3") == (-2, None)
+    assert CalcHandler(backend="decimal", precision=5).run_single_exp("1/3")[0] == Decimal("0.33333")
+
+
+@pytest.mark.parametrize("backend", ["exact", "decimal"])
+def test_backend_errors(backend):
+    float_handler = CalcHandler()
+    calc_handler = CalcHandler(backend=backend)
+    for expression in ["7/0", "7%0", "0^-1", "(-8)^0.5", "3.5!", "(-3)!", "(-2)#", "1+", "2(3)", "1..2+a"]:
+        assert error_types(calc_handler.run_single_exp(expression)) == \
+            error_types(float_handler.run_single_exp(expression)), expression
+    assert error_types(calc_handler.run_single_exp("1450!")) == ["Large_Number_Error"]
+    assert calc_handler.run_single_exp("0^0") == (1, None)
+
+
+def test_backends_with_the_pipelines():
+    for backend, engine in [(backend, engine) for backend in NumericBackend.NAMES for engine in EvalPipeline.ENGINES]:
+        # the incremental pipeline, the prepared expressions and the pratt parser use the backend too
+        calc_handler = CalcHandler(backend=backend, incremental=engine == "shunting_yard", engine=engine,
+                                   subtree_cache_size=64)
+        expected = 2 ** 60 if backend == "float" else 2 ** 60 + 1
+        for expression in ["(2^60+1-1+1-1+1)*1", "(2^60+1-1+1-1+1)*1+0", "(2^60+1-1+1-1+1)*1"]:
+            assert calc_handler.run_single_exp(expression) == (expected, None)
+        prepared = calc_handler.prepare("2^70+1")
+        for _ in range(3):
+            assert prepared.evaluate()[0] == (2 ** 70 if backend == "float" else 2 ** 70 + 1)
+    with pytest.raises(ValueError):
+        CalcHandler(backend="complex")
+
+
+def test_main_choices():
+    import main
+    # main has its own choices so the -e path doesn't import the backends, see Startup_test
+    assert main.ENGINES == EvalPipeline.ENGINES and main.BACKENDS == NumericBackend.NAMES
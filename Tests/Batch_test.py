@@ -0,0 +1,118 @@
+"""
+Batch evaluation tests
+"""
+import io
+import json
+
+
+def test_evaluate_many(calc_handler):
+    expressions = ["1+2", "(2+2", "4!", "5/0"]
+    outputs = list(calc_handler.evaluate_many(expressions))
+    assert [index for index, _, _ in outputs] == [0, 1, 2, 3]
+    assert outputs[0][1:] == (3, None)
+    assert outputs[1][2][0].get_error_type() == "Missing_Close_Paren_Error"
+    assert outputs[2][1:] == (24, None)
+    assert outputs[3][2][0].get_error_type() == "Zero_Div_Error"
+
+
+def test_evaluate_many_is_lazy(calc_handler):
+    def expressions():
+        yield "1+1"
+        raise AssertionError("the generator was consumed too early")
+
+    outputs = calc_handler.evaluate_many(expressions())
+    assert next(outputs) == (0, 2, None)
+
+
+def test_errors_survive_next_expression(calc_handler):
+    outputs = calc_handler.evaluate_many(["1++2", "3*3"])
+    _, _, error_list = next(outputs)
+    next(outputs)
+    assert error_list[0].get_error_type() == "Missing_Operands_Error"
+
+
+def test_parallel_ordered():
+    from CalcParts.ParallelExecutor import ParallelExecutor
+    expressions = [f"{num}*2" for num in range(50)] + ["1/0"]
+    with ParallelExecutor(workers=2, chunk_size=7) as executor:
+        outputs = list(executor.map(expressions))
+    assert [index for index, _, _ in outputs] == list(range(51))
+    assert [result for _, result, _ in outputs[:50]] == [num * 2 for num in range(50)]
+    assert outputs[50][2][0].get_error_type() == "Zero_Div_Error"
+
+
+def test_parallel_unordered_and_recycled():
+    from CalcParts.ParallelExecutor import ParallelExecutor
+    expressions = [f"{num}+1" for num in range(40)]
+    with ParallelExecutor(workers=2, chunk_size=5, max_exps_per_worker=10) as executor:
+        outputs = list(executor.map(expressions, ordered=False))
+    assert sorted(outputs) == [(num, num + 1, None) for num in range(40)]
+
+
+def test_batch_runner_jsonl():
+    from CalcParts.BatchRunner import BatchRunner
+    input_file = io.StringIO("1+2\n(2+2\r\n\n3!")
+    output_file = io.StringIO()
+    assert BatchRunner("jsonl", buffer_lines=2).run(input_file, output_file) == 4
+    lines = [json.loads(line) for line in output_file.getvalue().splitlines()]
+    assert lines[0] == {"line": 1, "value": 3}
+    assert lines[1]["errors"][0]["type"] == "Missing_Close_Paren_Error"
+    assert lines[2]["errors"][0]["type"] == "Empty_Input_Error"
+    assert lines[3] == {"line": 4, "value": 6}
+    # json has no inf, the lines are strict json
+    output_file = io.StringIO()
+    BatchRunner("jsonl").run(io.StringIO("9" * 400 + "\n" + "-" + "9" * 400 + "\n"), output_file)
+    assert "Infinity" not in output_file.getvalue()
+    lines = [json.loads(line) for line in output_file.getvalue().splitlines()]
+    assert lines == [{"line": 1, "value": "inf"}, {"line": 2, "value": "-inf"}]
+
+
+def test_batch_runner_tsv():
+    from CalcParts.BatchRunner import BatchRunner
+    output_file = io.StringIO()
+    BatchRunner("tsv", fail_fast=True).run(io.StringIO("2^3\n1**2//3\n"), output_file)
+    assert output_file.getvalue() == "1\tvalue\t8\n2\tMissing_Operands_Error\tMissing operands for: * at position: 1\n"
+
+
+def test_tokenize_bytes_matches_str(calc_handler):
+    expressions = ["1 + 2 * 3", "-(4-5)!", "1 2.5+3", "2+abc", "1..2*3", "(2", "  ", "5\x1c+1", "2+é"]
+    for input_exp in expressions:
+        outputs = []
+        for exp in (input_exp, input_exp.encode()):
+            result, error_list = calc_handler.run_single_exp(exp)
+            outputs.append((result, [(error.get_error_type(), str(error.get_msg())) for error in error_list or ()]))
+        assert outputs[0] == outputs[1]
+
+
+def test_evaluate_buffer_range(calc_handler):
+    buffer = b"1+2\n(2+2\r\n\n3!\n4*4"
+    outputs = list(calc_handler.evaluate_buffer(buffer, 0, len(buffer) - 3))
+    assert [(index, result) for index, result, _ in outputs] == [(0, 3), (1, None), (2, None), (3, 6)]
+    assert outputs[1][2][0].get_error_type() == "Missing_Close_Paren_Error"
+    assert list(calc_handler.evaluate_buffer(buffer, 14)) == [(0, 16, None)]
+
+
+def test_mapped_input_ranges(tmp_path):
+    from CalcParts.MappedInput import MappedInput
+    path = tmp_path / "input.txt"
+    path.write_bytes(b"1+1\n22+22\n3\n\n4444")
+    with MappedInput(str(path)) as mapped_input:
+        buffer = mapped_input.get_buffer()
+        ranges = list(mapped_input.split_ranges(4))
+        assert [buffer[start:end] for start, end in ranges] == [b"1+1\n", b"22+22\n", b"3\n\n4444"]
+    path.write_bytes(b"")
+    with MappedInput(str(path)) as mapped_input:
+        assert list(mapped_input.split_ranges(4)) == []
+
+
+def test_batch_runner_file(tmp_path):
+    from CalcParts.BatchRunner import BatchRunner
+    text = "".join(f"{num}*{num}\n" for num in range(30)) + "1/0\n2+x\n"
+    path = tmp_path / "input.txt"
+    path.write_text(text)
+    expected = io.StringIO()
+    BatchRunner("tsv").run(io.StringIO(text), expected)
+    for workers in (1, 2):
+        output_file = io.StringIO()
+        assert BatchRunner("tsv", workers=workers).run_file(str(path), output_file) == 32
+        assert output_file.getvalue() == expected.getvalue()
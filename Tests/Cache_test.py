@@ -0,0 +1,74 @@
+"""
+Result cache tests
+"""
+from CalcHandler import CalcHandler
+
+
+def test_cache_hit(calc_handler):
+    calc_handler.run_single_exp("12*3")
+    result, error_list = calc_handler.run_single_exp("12 * 3")
+    assert error_list is None
+    assert result == 36
+    stats = calc_handler.get_cache_stats()
+    assert stats["hits"] == 1
+    assert stats["misses"] == 1
+
+
+def test_cached_errors(calc_handler):
+    calc_handler.run_single_exp("1++2")
+    result, error_list = calc_handler.run_single_exp("1++2")
+    assert result is None
+    assert error_list[0].get_error_type() == "Missing_Operands_Error"
+    assert calc_handler.get_cache_stats()["hits"] == 1
+
+
+def test_hit_keeps_error_handler(calc_handler):
+    calc_handler.run_single_exp("5/0")
+    calc_handler.run_single_exp("2+2")
+    # the error handler holds the errors of the last evaluated expression, a hit must not change it
+    calc_handler.run_single_exp("5/0")
+    assert not calc_handler._pipelines[-1].get_error_handler().has_errors()
+
+
+def test_cached_list_is_a_copy(calc_handler):
+    _, error_list = calc_handler.run_single_exp("(2+2")
+    error_list.clear()
+    _, error_list = calc_handler.run_single_exp("(2+2")
+    assert error_list[0].get_error_type() == "Missing_Close_Paren_Error"
+
+
+def test_size_eviction():
+    calc_handler = CalcHandler(cache_size=2)
+    calc_handler.run_single_exp("1+1")
+    calc_handler.run_single_exp("1+2")
+    calc_handler.run_single_exp("1+3")
+    stats = calc_handler.get_cache_stats()
+    assert stats["evictions"] == 1
+    assert stats["size"] == 2
+    # the oldest expression was evicted
+    calc_handler.run_single_exp("1+1")
+    assert calc_handler.get_cache_stats()["misses"] == 4
+
+
+def test_memory_eviction():
+    calc_handler = CalcHandler(cache_size=None, cache_max_bytes=400)
+    for num in range(10):
+        calc_handler.run_single_exp(f"{num}+1")
+    stats = calc_handler.get_cache_stats()
+    assert stats["evictions"] > 0
+    assert stats["bytes"] <= 400
+
+
+def test_disabled_cache():
+    calc_handler = CalcHandler(cache_size=0)
+    calc_handler.run_single_exp("1+1")
+    result, error_list = calc_handler.run_single_exp("1+1")
+    assert result == 2
+    assert calc_handler.get_cache_stats()["hits"] == 0
+
+
+def test_cached_error_positions(calc_handler):
+    calc_handler.run_single_exp("1+a")
+    _, error_list = calc_handler.run_single_exp("1 + a")
+    # the error position refers to the original expression so the cached errors can't be used
+    assert error_list[0].get_msg() == "Invalid Char found: a ,at position: 4"
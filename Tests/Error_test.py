@@ -1,6 +1,12 @@
 """
 Error tests for all the errors in the calc
 """
+import pytest
+from ErrorParts.ErrorHandler import ErrorHandler
+from CalcHandler import CalcHandler
+from ErrorParts.Errors import InvalidFactorialError, LargeNumberError
+from CalcParts.Tokenizer import Tokenizer
+from CalcParts.Converter import Converter
 
 
 def test_factorial_negative(calc_handler):
@@ -125,3 +131,62 @@ def test_missing_operand_error(calc_handler):
     for error in error_list:
         assert error.get_error_type() == "Missing_Operand_Error"
 
+
+
+def test_error_positions_with_spaces(calc_handler):
+    result, error_list = calc_handler.run_single_exp("1 +  a b + 1..2")
+    assert result is None
+    assert error_list[0].get_msg() == "Invalid Chars found: ab ,at position: 5 -> 7"
+    assert error_list[1].get_msg() == "Invalid Number Format: 1..2 ,at position: 11 -> 14"
+
+
+def test_trailing_open_paren(calc_handler):
+    result, error_list = calc_handler.run_single_exp("1+(")
+    assert result is None
+    assert error_list[0].get_msg() == "Missing Closing parentheses to opening parentheses at position: 2"
+
+
+def test_structured_errors(calc_handler):
+    result, error_list = calc_handler.run_single_exp("1 +  a b + 1..2 + ~")
+    assert [(error.get_error_type(), error.get_positions(), error.get_operands()) for error in error_list] == [
+        ("Invalid_Chars_Error", (5, 7), ("ab",)), ("Number_Error", (11, 14), ("1..2",))]
+    result, error_list = calc_handler.run_single_exp("2+~")
+    assert error_list[0].get_positions() == (2,) and error_list[0].get_operands() == ('~',)
+    assert str(error_list[0]) == "Error: Missing operand for: ~ at position: 2"
+    result, error_list = calc_handler.run_single_exp("(-3)!")
+    assert isinstance(error_list[0].get_operands()[0], InvalidFactorialError)
+    assert error_list[0].get_msg() == str(error_list[0].get_operands()[0])
+
+
+def test_lazy_exception_msgs():
+    # the exception holds the operands of its msg, the msg is only formatted when it is shown
+    result, error_list = CalcHandler(backend="exact").run_single_exp("(7^3000)!")
+    exception = error_list[0].get_operands()[0]
+    assert isinstance(exception, LargeNumberError) and exception.args == ("Factorial_Size", 7 ** 3000)
+    assert error_list[0].get_msg() == f"Invalid factorial size, factorial of: {7 ** 3000} is too large"
+    # a number that python can't turn into a str is shown without its digits
+    result, error_list = CalcHandler(backend="exact").run_single_exp("((10^3999)*(10^3999))#")
+    assert error_list[0].get_error_type() == "Large_Number_Error"
+    assert error_list[0].get_msg().endswith("a number with too many digits to show")
+    # an exception raised with a msg shows it as is
+    assert str(InvalidFactorialError("Cannot perform gcd on non int numbers")) == \
+        "Cannot perform gcd on non int numbers"
+
+
+def test_result_codes():
+    for fail_fast in (False, True):
+        error_handler = ErrorHandler(fail_fast, raise_errors=False)
+        tokenizer = Tokenizer(error_handler)
+        converter = Converter(error_handler)
+        # the stages don't raise, they give False and fail fast keeps only the first error
+        assert not tokenizer.tokenize_expression("1+a+2..3+b")
+        assert len(error_handler.get_errors()) == (1 if fail_fast else 3)
+        error_handler.clear_errors()
+        tokenizer.clear_tokenizer()
+        assert tokenizer.tokenize_expression("(1+)*(")
+        assert not converter.convert(tokenizer.get_token_stream())
+        assert len(error_handler.get_errors()) == (1 if fail_fast else 2)
+    # by default the stages raise a stop iteration error
+    tokenizer = Tokenizer(ErrorHandler())
+    with pytest.raises(StopIteration):
+        tokenizer.tokenize_expression("1+a")
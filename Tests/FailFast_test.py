@@ -0,0 +1,40 @@
+"""
+Fail fast mode tests
+"""
+from CalcHandler import CalcHandler
+
+
+def test_single_error():
+    calc_handler = CalcHandler(fail_fast=True)
+    result, error_list = calc_handler.run_single_exp("1++2+2**3")
+    assert result is None
+    assert len(error_list) == 1
+    assert error_list[0].get_msg() == "Missing operands for: + at position: 1"
+
+
+def test_first_tokenizer_error():
+    calc_handler = CalcHandler(fail_fast=True)
+    _, error_list = calc_handler.run_single_exp("1+a+b+1..2")
+    assert [error.get_error_type() for error in error_list] == ["Invalid_Char_Error"]
+
+
+def test_per_call_mode(calc_handler):
+    _, error_list = calc_handler.run_single_exp("(1++2", fail_fast=True)
+    assert len(error_list) == 1
+    # the default mode of the handler still collects all the errors
+    _, error_list = calc_handler.run_single_exp("(1++2")
+    assert len(error_list) == 2
+
+
+def test_modes_cached_apart(calc_handler):
+    calc_handler.run_single_exp("1**2//3", fail_fast=True)
+    _, error_list = calc_handler.run_single_exp("1**2//3")
+    assert len(error_list) == 2
+    _, error_list = calc_handler.run_single_exp("1**2//3", fail_fast=True)
+    assert len(error_list) == 1
+    assert calc_handler.get_cache_stats()["hits"] == 1
+
+
+def test_valid_expression():
+    calc_handler = CalcHandler(fail_fast=True)
+    assert calc_handler.run_single_exp("2^3!") == (64, None)
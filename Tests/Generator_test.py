@@ -0,0 +1,54 @@
+"""
+Benchmark expression generator tests
+"""
+from CalcParts.Evaluator import Evaluator
+from Benchmarks.ExpressionGenerator import ExpressionGenerator
+
+EVAL_ERRORS = ("Zero_Div_Error", "Zero_Pow_Error", "Pow_Overflow_Error", "Invalid_Factorial_Error",
+               "Large_Number_Error", "Invalid_Hash_Error", "Small_Number_Error")
+
+
+def max_nesting(input_exp):
+    depth = max_depth = 0
+    for char in input_exp:
+        if char == '(':
+            depth += 1
+            max_depth = max(max_depth, depth)
+        elif char == ')':
+            depth -= 1
+    return max_depth
+
+
+def test_seeded():
+    assert ExpressionGenerator(3).build_corpus(20, 10) == ExpressionGenerator(3).build_corpus(20, 10)
+    assert ExpressionGenerator(3).build_corpus(20, 10) != ExpressionGenerator(4).build_corpus(20, 10)
+
+
+def test_valid_expressions_keep_their_meaning(calc_handler):
+    generator = ExpressionGenerator(1, paren_ratio=0.2)
+    for length in (0, 1, 3, 8, 20):
+        for max_depth in (0, 1, 4):
+            for _ in range(40):
+                input_exp, value = generator.generate_with_value(length, max_depth)
+                result, error_list = calc_handler.run_single_exp(input_exp)
+                assert max_nesting(input_exp) <= max_depth
+                if value is None:
+                    assert error_list[0].get_error_type() in EVAL_ERRORS
+                else:
+                    assert error_list is None
+                    assert result == Evaluator.format_final(value)
+
+
+def test_invalid_expressions(calc_handler):
+    generator = ExpressionGenerator(2)
+    for input_exp in generator.build_corpus(300, 6, invalid_ratio=1.0):
+        result, error_list = calc_handler.run_single_exp(input_exp)
+        assert result is None
+        assert error_list[0].get_error_type() not in EVAL_ERRORS
+
+
+def test_length_and_op_mix():
+    generator = ExpressionGenerator(5, op_mix={'*': 1, '!': 1})
+    for input_exp in generator.build_corpus(50, 12):
+        assert input_exp.count('*') + input_exp.count('!') == 12
+        assert set(input_exp) <= set("0123456789.*!()")
@@ -0,0 +1,40 @@
+"""
+Incremental evaluation tests, every edit must give the same outcome as a full run
+"""
+import pytest
+from CalcHandler import CalcHandler
+from Tests.conftest import describe
+
+
+@pytest.fixture
+def incremental_handler():
+    return CalcHandler(cache_size=0, incremental=True)
+
+
+def run_edits(calc_handler, expressions):
+    full_handler = CalcHandler(cache_size=0)
+    for input_exp in expressions:
+        assert describe(calc_handler.run_single_exp(input_exp)) == describe(full_handler.run_single_exp(input_exp))
+
+
+def test_appended_terms_reuse_work(incremental_handler):
+    expression = "1"
+    expressions = []
+    for num in range(2, 80):
+        expression += f"+{num}*2"
+        expressions.append(expression)
+    run_edits(incremental_handler, expressions)
+    tokens, post_fix = incremental_handler._incremental_pipeline.get_reused()
+    assert tokens > 200 and post_fix > 200
+
+
+def test_edits_and_errors(incremental_handler):
+    base = "(" * 10 + "+".join(str(num) for num in range(40)) + ")" * 10
+    run_edits(incremental_handler, [
+        base, base + "!", base + "*", base + "*-3", base[:-3], base + "3", base[:5] + "7" + base[5:],
+        base.replace("25", "2 5"), base + "+a", base + "+1", "", base, base + "/0", base + "/02",
+    ])
+
+
+def test_number_extended_by_edit(incremental_handler):
+    run_edits(incremental_handler, ["12", "123", "123.", "123.4", "1 2", "-(", "-()", "-(-)", "5!!", "5!!!"])
@@ -0,0 +1,39 @@
+"""
+Operator kernel tests, the kernels must give the same values as the plain implementations
+"""
+import random
+import pytest
+from CalcParts.Kernels import OpKernels
+from CalcParts.Operators import OpData
+from ErrorParts.Errors import InvalidFactorialError, LargeNumberError
+
+
+def plain_digit_sum(num):
+    return sum(int(char) for char in str(num).split('e')[0] if char.isdigit())
+
+
+def test_factorial_table():
+    factorial = 1
+    for num in range(OpKernels.MAX_FACTORIAL):
+        assert OpKernels.factorial(float(num)) == factorial
+        factorial *= num + 1
+
+
+def test_digit_sum():
+    generator = random.Random(7)
+    numbers = [0.0, 1.0, 1e15, 123.0, 0.5, 1e-5, 1.5e-7, 2 ** 0.5, 120]
+    numbers += [generator.uniform(0, 1e15) for _ in range(1000)]
+    numbers += [float(generator.randint(0, 10 ** 15)) for _ in range(1000)]
+    for num in numbers:
+        assert OpKernels.digit_sum(num) == plain_digit_sum(num)
+
+
+def test_factorial_errors():
+    factorial = OpData.get_op_class('!')
+    with pytest.raises(InvalidFactorialError):
+        factorial.unary_evaluate(2.5)
+    with pytest.raises(InvalidFactorialError):
+        factorial.unary_evaluate(-1.0)
+    with pytest.raises(LargeNumberError):
+        factorial.unary_evaluate(170.0)
+    assert factorial.unary_evaluate(169.0) == OpKernels.FACTORIAL_TABLE[169]
@@ -0,0 +1,84 @@
+"""
+Evaluation limit tests, an expression over the budget is rejected before anything is computed and the limits give
+their own errors
+"""
+from CalcHandler import CalcHandler
+from CalcParts.CostModel import CostModel
+from CalcParts.NumericBackends import FloatBackend
+from CalcParts.Tokenizer import Tokenizer
+from CalcParts.Converter import Converter
+from ErrorParts.ErrorHandler import ErrorHandler
+from Tests.conftest import error_types
+
+
+def estimate(expression: str, backend=None) -> float:
+    error_handler = ErrorHandler()
+    tokenizer = Tokenizer(error_handler)
+    converter = Converter(error_handler)
+    tokenizer.tokenize_expression(expression)
+    converter.convert(tokenizer.get_token_stream())
+    return CostModel.estimate_digits(tokenizer.get_token_stream(), converter.get_post_fix(), (), backend)
+
+
+def test_estimates_are_upper_bounds():
+    calc_handler = CalcHandler(backend="exact")
+    for expression in ["2^100", "3^200*7", "99!", "(25!+17)*3!", "1449!", "123456789*987654321", "(2^60)@(3^40)",
+                       "1/7^50", "0.5^300", "12#"]:
+        result = calc_handler.run_single_exp(expression)[0]
+        assert CostModel.get_digits(result) <= estimate(expression) + 1e-9, expression
+    assert estimate("9999!^9999") > 1e8
+    assert estimate("1+2*3") < 2
+
+
+def test_float_estimates():
+    # a float only keeps the magnitude of a number and the ops that return floats are bounded by the size of a float
+    calc_handler = CalcHandler(max_digits=1e9)
+    assert calc_handler.run_single_exp("10^--10#!") == (10, None)
+    assert calc_handler.run_single_exp("((2%0.5)!!)") == (1, None)
+    for expression in ["44/~0.2*37.2", "9.9#", "(0.7/6)#", "0.001^-3", "150!/0.5", "2.5*10^300", "(1/3)#!"]:
+        result = CalcHandler().run_single_exp(expression)[0]
+        assert CostModel.get_digits(result) <= estimate(expression, FloatBackend()) + 1e-9, expression
+    assert estimate("((2%0.5)!!)", FloatBackend()) < 1 and estimate("10^--10#!", FloatBackend()) < 309
+
+
+def test_budget():
+    calc_handler = CalcHandler(backend="exact", max_digits=1000)
+    assert error_types(calc_handler.run_single_exp("9999!^9999")) == ["Cost_Budget_Error"]
+    assert error_types(calc_handler.run_single_exp("2^10000")) == ["Cost_Budget_Error"]
+    assert error_types(calc_handler.run_single_exp("1/0+9999!")) == ["Cost_Budget_Error"]
+    assert calc_handler.run_single_exp("2^3000") == (2 ** 3000, None)
+    assert error_types(calc_handler.run_single_exp("2^3000*2^3000")) == ["Cost_Budget_Error"]
+    # the float backend gives the same errors under a budget that the values fit in
+    float_handler = CalcHandler(max_digits=400)
+    for expression in ["170!", "2^1023", "5/0", "3!!", "(-1)#"]:
+        assert error_types(float_handler.run_single_exp(expression)) == \
+            error_types(CalcHandler().run_single_exp(expression))
+
+
+def test_operation_and_time_limits():
+    calc_handler = CalcHandler(max_operations=101)
+    assert calc_handler.run_single_exp("1+" * 50 + "1") == (51, None)
+    assert error_types(calc_handler.run_single_exp("1+" * 51 + "1")) == ["Eval_Limit_Error"]
+    calc_handler = CalcHandler(time_limit=0)
+    assert error_types(calc_handler.run_single_exp("1+" * 3000 + "1")) == ["Eval_Limit_Error"]
+    assert error_types(calc_handler.prepare("2^3").evaluate()) == ["Eval_Limit_Error"]
+    assert CalcHandler(time_limit=60).run_single_exp("1+" * 3000 + "1") == (3001, None)
+
+
+def test_limits_with_the_pipelines():
+    for handler_kwargs in ({"incremental": True}, {"subtree_cache_size": 64}, {"fail_fast": True}):
+        calc_handler = CalcHandler(backend="exact", max_digits=1000, cache_size=0, **handler_kwargs)
+        assert calc_handler.run_single_exp("(2^100+1+1+1+1+1+1)*2") == ((2 ** 100 + 6) * 2, None)
+        assert error_types(calc_handler.run_single_exp("(2^100+1+1+1+1+1+1)*2^5000")) == ["Cost_Budget_Error"]
+
+
+def test_limits_with_incremental_edits():
+    # an edited expression counts the operations and the time of the part that is reused too
+    calc_handler = CalcHandler(max_operations=101, incremental=True, cache_size=0)
+    assert calc_handler.run_single_exp("1+" * 50 + "1") == (51, None)
+    assert error_types(calc_handler.run_single_exp("1+" * 51 + "1")) == ["Eval_Limit_Error"]
+    assert calc_handler._incremental_pipeline.get_reused()[1] > 0
+    assert calc_handler.run_single_exp("1+" * 49 + "1") == (50, None)
+    calc_handler = CalcHandler(time_limit=60, incremental=True, cache_size=0)
+    for count in range(2000, 2010):
+        assert calc_handler.run_single_exp("1+" * count + "1") == (count + 1, None)
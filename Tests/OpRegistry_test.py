@@ -0,0 +1,98 @@
+"""
+Operator registry tests, a registered operator is tokenized, converted and evaluated like the built in operators and
+the registry rejects operators it can't add
+"""
+from decimal import Decimal
+from math import gcd
+import pytest
+from CalcHandler import CalcHandler
+from CalcParts.NumericBackends import NumericBackend
+from CalcParts.OpRegistry import OpRegistry
+from CalcParts.Operators import Operator, IBinaryOperator, IUnaryOperator, IRightSidedOp, Plus, Factorial
+from CalcParts.TokenStream import TokenStream
+from CalcParts.VectorEvaluator import VectorEvaluator
+from ErrorParts.Errors import InvalidFactorialError
+from Tests.conftest import error_types
+
+
+class Gcd(IBinaryOperator, Operator):
+    def binary_evaluate(self, num1: float, num2: float) -> int:
+        if num1 % 1 != 0 or num2 % 1 != 0:
+            raise InvalidFactorialError("Cannot perform gcd on non int numbers")
+        return gcd(int(num1), int(num2))
+
+
+class Square(IUnaryOperator, Operator, IRightSidedOp):
+    def unary_evaluate(self, num: float) -> float:
+        return num * num
+
+
+@pytest.fixture(scope="module", autouse=True)
+def registered_ops():
+    # the registry is global, the ops are removed after the tests of this module so the other tests don't get them
+    op_codes = dict(OpRegistry.OP_CODES)
+    OpRegistry.register(Gcd(5, '|', "mid", "This operator gives the greatest common divisor of two operands"))
+    OpRegistry.register(Square(6, "'", "right", "This operator gives the square of the operand"))
+    yield
+    OpRegistry.unregister("'")
+    OpRegistry.unregister('|')
+    assert OpRegistry.OP_CODES == op_codes
+
+
+def test_registered_ops():
+    calc_handler = CalcHandler()
+    assert calc_handler.run_single_exp("12|18") == (6, None)
+    assert calc_handler.run_single_exp("2+12|18*2") == (14, None)
+    assert calc_handler.run_single_exp("3'!") == (362880, None)
+    assert calc_handler.run_single_exp("-3'") == (-9, None)
+    assert calc_handler.run_single_exp("(12|8)'") == (16, None)
+    assert error_types(calc_handler.run_single_exp("1.5|3")) == ["Invalid_Factorial_Error"]
+    assert error_types(calc_handler.run_single_exp("|3")) == error_types(calc_handler.run_single_exp("*3"))
+    for handler_kwargs in ({"engine": "pratt"}, {"incremental": True}, {"backend": "exact"}, {"max_digits": 100}):
+        assert CalcHandler(**handler_kwargs).run_single_exp("2+12|18*2'") == (26, None)
+
+
+def test_registered_ops_with_backends():
+    # the gcd kernel returns ints and the square kernel returns the type of its operand
+    for backend in NumericBackend.NAMES:
+        calc_handler = CalcHandler(backend=backend)
+        assert calc_handler.run_single_exp("12|18") == (6, None), backend
+        assert calc_handler.run_single_exp("2+12|18*2'") == (26, None), backend
+        assert calc_handler.run_single_exp("(12|18)/4") == (1.5, None), backend
+        assert calc_handler.run_single_exp("0.5'") == (0.25, None), backend
+        assert error_types(calc_handler.run_single_exp("1.5|3")) == ["Invalid_Factorial_Error"], backend
+    assert CalcHandler(backend="exact").run_single_exp("(2^60+1)|(2^60+1)") == (2 ** 60 + 1, None)
+    assert type(CalcHandler(backend="decimal").run_single_exp("(12|18)/4")[0]) is Decimal
+
+
+def test_registered_ops_over_columns(calc_handler):
+    np = pytest.importorskip("numpy")
+    # the ops without a vector kernel are applied on every element
+    (values, error_codes), error_list = calc_handler.evaluate_columns("x|12'", {"x": np.array([8.0, 9.0, 1.5])})
+    assert error_list is None
+    assert list(values[:2]) == [8, 9] and np.isnan(values[2])
+    assert [VectorEvaluator.get_error_type(code) for code in error_codes] == [None, None, "Invalid_Factorial_Error"]
+
+
+def test_tables():
+    type_code = OpRegistry.OP_CODES['|']
+    assert TokenStream.OP_CODES['|'] == type_code and TokenStream.TYPE_CODES['|'] == type_code
+    assert isinstance(TokenStream.OP_CLASSES[type_code], Gcd) and TokenStream.PRECEDENCES[type_code] == 5
+    assert TokenStream.IS_RIGHT_SIDED[OpRegistry.OP_CODES["'"]] and TokenStream.IS_UNARY[OpRegistry.OP_CODES["'"]]
+    # the codes of the built in ops don't change
+    assert OpRegistry.OP_CODES['+'] == OpRegistry.FIRST_OP_CODE
+    assert '|' in OpRegistry.OP_CHARS and "'" in OpRegistry.OP_CHARS
+
+
+def test_invalid_registrations():
+    for operator, op_key in [(Gcd(5, '|', "mid", ""), None), (Gcd(5, 'g', "mid", ""), None),
+                             (Gcd(5, '(', "mid", ""), None), (Gcd(9, ';', "mid", ""), None),
+                             (Gcd(5, ';', "left", ""), None), (Gcd(5, ';', "up", ""), None),
+                             (Plus(1, '+', "mid", ""), ";;"), (Factorial, ';')]:
+        with pytest.raises(ValueError):
+            OpRegistry.register(operator, op_key)
+    assert ';' not in OpRegistry.OP_CODES
+    # only the registered ops can be removed
+    for op_key in ['+', ';']:
+        with pytest.raises(ValueError):
+            OpRegistry.unregister(op_key)
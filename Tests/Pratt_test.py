@@ -0,0 +1,54 @@
+"""
+Pratt parser tests, the pratt engine must give the same results and errors as the shunting yard engine
+"""
+import pytest
+from CalcHandler import CalcHandler
+from CalcParts.PrattParser import BinaryNode, UnaryNode, OperandNode
+from Benchmarks.ExpressionGenerator import ExpressionGenerator
+from Tests.conftest import describe
+
+expressions = [
+    "((1+1*3^-2)$8*9!+~--3)%3@2", "(91#*21^3---2!+15)@1/19", "-2^2", "2^-2", "2*-3!", "~-3", "--3*2", "2^3^2",
+    "-3!", "~3!", "2+(--3)", "1-(---2)", "((--3))", "5*--2", "-(2)", "-2#", "(1)(2)",
+    "-~3", "~~3", "(-)", "()", "(1+2", "1+2)", "2(3)", "(3)2", "3!2", "3#(2)", "+", "1+", "*-", "2 3", "1++2", "1!!",
+    "(" * 2000 + "1" + ")" * 2000,
+]
+
+
+@pytest.mark.parametrize("fail_fast", [False, True])
+def test_engines_match(fail_fast):
+    shunting_yard_handler = CalcHandler(cache_size=0, fail_fast=fail_fast)
+    pratt_handler = CalcHandler(cache_size=0, fail_fast=fail_fast, engine="pratt")
+    generator = ExpressionGenerator(7, paren_ratio=0.3)
+    corpus = expressions + generator.build_corpus(300, 12, max_depth=4, invalid_ratio=0.3)
+    for expression in corpus:
+        assert describe(pratt_handler.run_single_exp(expression)) == \
+               describe(shunting_yard_handler.run_single_exp(expression))
+
+
+def test_syntax_tree():
+    pratt_handler = CalcHandler(engine="pratt")
+    pipeline = pratt_handler._pipelines[-1]
+    assert pipeline.convert("-1+2*3!") is None
+    syntax_tree = pipeline._converter.get_syntax_tree()
+    assert isinstance(syntax_tree, BinaryNode) and isinstance(syntax_tree.left, UnaryNode)
+    assert isinstance(syntax_tree.right, BinaryNode) and isinstance(syntax_tree.right.right, UnaryNode)
+    assert isinstance(syntax_tree.right.right.operand, OperandNode)
+    assert list(pipeline.get_post_fix()) == [1, 0, 3, 5, 6, 4, 2]
+
+
+def test_unknown_engine():
+    with pytest.raises(ValueError):
+        CalcHandler(engine="recursive")
+
+
+def test_interactive_engine():
+    import main
+    # the interactive loop runs the engine it was given, the pratt engine isn't incremental
+    pratt_handler = main.create_interactive_handler(main.parse_args(["--engine", "pratt"]))
+    assert pratt_handler._incremental_pipeline is None
+    assert pratt_handler.run_single_exp("-1+2*3!") == (11, None)
+    assert isinstance(pratt_handler._pipelines[-1]._converter.get_syntax_tree(), BinaryNode)
+    assert main.create_interactive_handler(main.parse_args([]))._incremental_pipeline is not None
+    with pytest.raises(ValueError):
+        CalcHandler(engine="pratt", incremental=True)
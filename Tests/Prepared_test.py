@@ -0,0 +1,70 @@
+"""
+Prepared expression tests, the compiled path must give the same values and errors as the interpreter path
+"""
+import pytest
+from CalcParts.ExpressionDag import ExpressionDag
+
+expressions = [
+    "((1+1*3^-2)$8*9!+~--3)%3@2",
+    "(91#*21^3---2!+15)@1/19",
+    "((3$-2+15!#)#--(-43)%34)+(0.1-0.56)",
+    "((12#-3!)$23)^(2*13+~26)%3",
+    "(((3^4.5-12.2)@3.21)##!)#^0.2*100",
+    "-9999##",
+    "2^-2",
+    "5/0",
+    "4%0",
+    "0^-1",
+    "(-2)^0.5",
+    "10^400",
+    "2.5!",
+    "(~3)!",
+    "200!",
+    "(~1)#",
+    "0.000000000001#",
+    "(2.5*3-1)^2+(2.5*3-1)*3",
+    "(5/0)+(5/0)",
+    "(3!)!+(2.5!)+(3!)!",
+    "((4$2)@1)-((4$2)@1)*~((4$2)@1)",
+]
+
+
+@pytest.mark.parametrize("expression", expressions)
+def test_compiled_matches_interpreter(calc_handler, expression):
+    expected_result, expected_errors = calc_handler.run_single_exp(expression)
+    prepared = calc_handler.prepare(expression)
+    for _ in range(3):
+        result, error_list = prepared.evaluate()
+        assert result == expected_result
+        if expected_errors is None:
+            assert error_list is None
+        else:
+            assert [error.get_error_type() for error in error_list] == \
+                   [error.get_error_type() for error in expected_errors]
+    assert prepared.is_compiled()
+
+
+def test_tiered_compilation(calc_handler):
+    prepared = calc_handler.prepare("2*3+4")
+    assert prepared.evaluate() == (10, None)
+    # an expression that was evaluated once stays on the interpreter path
+    assert not prepared.is_compiled()
+    assert prepared.evaluate() == (10, None)
+    assert prepared.is_compiled()
+
+
+def test_prepare_errors(calc_handler):
+    prepared = calc_handler.prepare("(1+2")
+    result, error_list = prepared.evaluate()
+    assert result is None
+    assert error_list[0].get_error_type() == "Missing_Close_Paren_Error"
+    assert not prepared.is_compiled()
+
+
+def test_repeated_subterms_are_shared(calc_handler):
+    pipeline = calc_handler._pipelines[-1]
+    assert pipeline.convert("(2+3)*(2+3)-2") is None
+    dag = ExpressionDag.build(pipeline.get_token_stream(), pipeline.get_post_fix())
+    # 2, 3, +, * and - are the only unique subterms
+    assert len(dag) == 5
+    assert dag.evaluate() == 23
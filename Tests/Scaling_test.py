@@ -0,0 +1,73 @@
+"""
+Scaling tests, the time of a 10 times larger expression must grow about 10 times (a quadratic stage would grow about
+100 times), the bound is loose so the tests don't fail on a noisy machine
+"""
+import time
+import pytest
+from CalcHandler import CalcHandler
+from ErrorParts.ErrorHandler import ErrorHandler
+from CalcParts.Tokenizer import Tokenizer
+from CalcParts.Converter import Converter
+
+MAX_GROWTH = 30
+
+
+def convert_time(input_exp: str) -> float:
+    # best of 3 runs of the tokenizer and converter
+    best = float("inf")
+    for _ in range(3):
+        error_handler = ErrorHandler()
+        tokenizer = Tokenizer(error_handler)
+        converter = Converter(error_handler)
+        start = time.perf_counter()
+        try:
+            tokenizer.tokenize_expression(input_exp)
+            converter.convert(tokenizer.get_token_stream())
+        except StopIteration:
+            pass
+        best = min(best, time.perf_counter() - start)
+    return best
+
+
+@pytest.mark.parametrize("build_expression", [
+    # depth
+    lambda size: "(" * size + "1" + ")" * size,
+    # length
+    lambda size: "1+" * size + "1",
+    # operator density
+    lambda size: "1*" + "-" * size + "1",
+    # closing parentheses over a large op stack
+    lambda size: "1*" + "-" * size + "(" * 10 + "1" + ")" * 10,
+    # missing closing parentheses
+    lambda size: "(1+" * size + "1",
+])
+def test_linear_conversion(build_expression):
+    small_time = convert_time(build_expression(2000))
+    large_time = convert_time(build_expression(20000))
+    assert large_time / small_time < MAX_GROWTH
+
+
+def incremental_time(input_exp: str) -> float:
+    # best of 3 runs of an incremental handler, the first run saves the states and the edit resumes from them
+    best = float("inf")
+    for _ in range(3):
+        calc_handler = CalcHandler(cache_size=0, incremental=True)
+        start = time.perf_counter()
+        calc_handler.run_single_exp(input_exp)
+        calc_handler.run_single_exp(input_exp + "+1")
+        best = min(best, time.perf_counter() - start)
+    return best
+
+
+@pytest.mark.parametrize("build_expression", [
+    # depth, the states copy the op stack
+    lambda size: "(" * size + "1" + ")" * size,
+    # depth with values, the states copy the op stack and the values of the evaluator
+    lambda size: "1+(" * size + "1" + ")" * size,
+    # length
+    lambda size: "1+" * size + "1",
+])
+def test_linear_incremental(build_expression):
+    small_time = incremental_time(build_expression(2000))
+    large_time = incremental_time(build_expression(20000))
+    assert large_time / small_time < MAX_GROWTH
@@ -0,0 +1,76 @@
+"""
+JSON lines server tests
+"""
+import asyncio
+import json
+from CalcParts.CalcServer import CalcServer
+
+
+def run_session(frames: list, **server_kwargs) -> list:
+    """
+    Func that starts a server, sends all the frames without waiting (pipelined) and reads a response per frame
+    :param frames: list of frame lines
+    :param server_kwargs:
+    :return: list of the parsed responses
+    """
+    async def session():
+        server = CalcServer(port=0, **server_kwargs)
+        await server.start()
+        try:
+            reader, writer = await asyncio.open_connection(*server.get_address())
+            writer.write(''.join(frame + "\n" for frame in frames).encode())
+            await writer.drain()
+            responses = [json.loads(await reader.readline()) for _ in frames]
+            writer.close()
+            await writer.wait_closed()
+            return responses
+        finally:
+            await server.close()
+
+    return asyncio.run(session())
+
+
+def test_single_and_batch_frames():
+    responses = run_session(['{"id": 1, "exp": "1+2"}', '[{"exp": "4!"}, {"id": "b", "exp": "(2"}]',
+                             '{"exp": "1++2", "fail_fast": true}'])
+    assert responses[0] == {"id": 1, "value": 3}
+    assert responses[1][0] == {"value": 24}
+    assert responses[1][1]["id"] == "b"
+    assert responses[1][1]["errors"][0]["type"] == "Missing_Close_Paren_Error"
+    assert len(responses[2]["errors"]) == 1
+
+
+def test_bad_frames():
+    responses = run_session(['not json', '{"id": 7}', '[]'])
+    assert responses[0]["errors"][0]["type"] == "Request_Error"
+    assert responses[1]["id"] == 7 and responses[1]["errors"][0]["type"] == "Request_Error"
+    assert responses[2] == []
+
+
+def test_strict_json():
+    big_number = "9" * 400
+    responses = run_session([f'{{"id": 1, "exp": "{big_number}"}}', f'{{"exp": "-{big_number}*2"}}',
+                             '{"exp": "1++2", "fail_fast": "false"}', '{"exp": "1++2", "fail_fast": 0}',
+                             '{"id": NaN, "exp": "1"}'])
+    # the values that json numbers can't hold are strings
+    assert responses[0] == {"id": 1, "value": "inf"} and responses[1] == {"value": "-inf"}
+    # only a json bool is a fail_fast and NaN isn't json
+    for response in responses[2:]:
+        assert response["errors"][0]["type"] == "Request_Error"
+
+
+def test_pipelined_order_with_backpressure():
+    frames = [json.dumps({"id": index, "exp": f"{index}*2"}) for index in range(200)]
+    responses = run_session(frames, max_pending=4, slice_size=1)
+    assert responses == [{"id": index, "value": index * 2} for index in range(200)]
+
+
+def test_worker_processes():
+    frames = [json.dumps([{"exp": f"{index}+1"} for index in range(start, start + 10)]) for start in range(0, 50, 10)]
+    responses = run_session(frames, workers=2)
+    assert [response["value"] for frame in responses for response in frame] == [index + 1 for index in range(50)]
+
+
+def test_frame_over_limit():
+    responses = run_session(['{"exp": "' + "1+" * 50 + '1"}'], max_frame_bytes=64)
+    assert responses[0]["errors"][0]["type"] == "Request_Error"
@@ -0,0 +1,45 @@
+"""
+Startup tests, a single expression (-e) must only import the parts it uses
+"""
+import inspect
+import os
+import subprocess
+import sys
+import main
+from CalcHandler import CalcHandler
+
+# the modules that a float expression without any other args doesn't use
+UNUSED_MODULES = ("argparse", "threading", "decimal", "fractions", "CalcParts.ExactBackends",
+                  "CalcParts.IncrementalPipeline", "CalcParts.PrattParser", "CalcParts.SubtreeCache",
+                  "CalcParts.ResultCache", "CalcParts.Compiler", "CalcParts.ExpressionDag", "CalcParts.Tracer")
+
+
+def run_main(*args) -> subprocess.CompletedProcess:
+    # the unused modules are printed after the output of main
+    code = f"import sys, main\ntry:\n    main.main()\n" \
+           f"finally:\n    print(sorted(set({UNUSED_MODULES}) & set(sys.modules)))"
+    return subprocess.run([sys.executable, "-c", code, *args], capture_output=True, text=True,
+                          cwd=os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+
+def test_single_expression_imports():
+    for args in (["-e", "2^0.5+1"], ["--exp=2^0.5+1"]):
+        output = run_main(*args)
+        assert output.returncode == 0 and output.stdout.splitlines() == [str(2 ** 0.5 + 1), "[]"], args
+    output = run_main("-e", "2^0.5+")
+    assert output.returncode == 1 and output.stdout.splitlines() == ["[]"] and output.stderr
+    # the other args still go through argparse
+    output = run_main("-e", "(1/3)*3", "--backend", "exact")
+    assert output.returncode == 0 and output.stdout.splitlines()[0] == "1" and "argparse" in output.stdout
+
+
+def test_single_expression_args():
+    for argv in (["-e", "1+2"], ["--exp", "1+2"], ["-e=-1+2"], ["--exp=1+2"], ["-e", ""], ["-e="], ["-e", "-5"],
+                 ["-e", "1", "--fail-fast"], ["-e1+2"], ["--ex", "1+2"], []):
+        input_exp = main.get_single_expression(argv)
+        assert input_exp is None or input_exp == main.parse_args(argv).exp, argv
+    assert main.get_single_expression(["-e", "1+2"]) == "1+2"
+    # the fast path uses the defaults of the handler, they must be the defaults of the args
+    handler_defaults = inspect.signature(CalcHandler).parameters
+    for name, value in main.get_handler_kwargs(main.parse_args([])).items():
+        assert handler_defaults[name].default == value, name
@@ -0,0 +1,65 @@
+"""
+Subtree cache tests, an expression with cached groups must give the same results and errors as without them
+"""
+from CalcHandler import CalcHandler
+from Tests.conftest import describe
+
+GROUP = "(12.5*3-4/8+7@9)"
+
+
+def run_both(expressions, **handler_kwargs):
+    plain_handler = CalcHandler(cache_size=0)
+    cached_handler = CalcHandler(cache_size=0, subtree_cache_size=64, **handler_kwargs)
+    for expression in expressions:
+        assert describe(cached_handler.run_single_exp(expression)) == describe(plain_handler.run_single_exp(expression))
+    return cached_handler.get_subtree_cache_stats()
+
+
+def test_shared_group_hits():
+    stats = run_both([f"{GROUP}*{num}+1" for num in range(10)])
+    assert stats["hits"] == 9 and stats["misses"] == 1 and stats["size"] == 1
+
+
+def test_errors_around_cached_groups():
+    stats = run_both([GROUP, "2" + GROUP, GROUP + "3", "3!" + GROUP, GROUP + "(1)", GROUP + "+", "(" + GROUP,
+                      GROUP + ")", GROUP + "/0", "1 2+" + GROUP, GROUP + "^9999"])
+    assert stats["hits"] > 0
+
+
+def test_context_dependent_groups():
+    # a leading unary minus chain depends on what came before it and ! returns exact ints
+    stats = run_both(["1+(--3+10000000)", "(--3+10000000)", "2+(--3+10000000)", "(20!+1-1+1-1)*(20!+1-1+1-1)",
+                      "(20!+1-1+1-1)*(20!+1-1+1-1)"])
+    assert stats["size"] == 0
+
+
+def test_fail_fast_and_pratt():
+    run_both([f"{GROUP}*{num}+~" for num in range(3)] + [f"-{GROUP}-{GROUP}"] * 2, fail_fast=True, engine="pratt")
+
+
+def test_eviction():
+    calc_handler = CalcHandler(cache_size=0, subtree_cache_size=2)
+    for num in range(4):
+        calc_handler.run_single_exp(f"(12.5*3-4/8+{num}@9)+1")
+    stats = calc_handler.get_subtree_cache_stats()
+    assert stats["evictions"] == 2 and stats["size"] == 2
+    calc_handler.clear_cache()
+    assert calc_handler.get_subtree_cache_stats()["size"] == 0
+
+
+def test_incremental_edits():
+    # the edits reuse the tokens and states of the last expression, the kept group tokens are the same groups
+    expressions = [GROUP, GROUP + "*2", GROUP + "*2+" + GROUP, "1+" + GROUP, "1+" + GROUP + "+(1+2)",
+                   "1+" + GROUP[:-1], "1+" + GROUP, "1+" + GROUP + "+" + GROUP + "!", "1+" + GROUP + "+" + GROUP,
+                   "(" + GROUP + "+" + GROUP + ")*3", "(" + GROUP + "+" + GROUP + ")*3/0", "2" + GROUP]
+    expressions += ["+".join([GROUP.replace("7", str(num))] * 3) + "*" * (num % 2) for num in range(12)]
+    stats = run_both(expressions, incremental=True)
+    assert stats["hits"] > 0
+    # a group (and the group in it) is looked up again after it was evicted while its number token was kept
+    nested_group = "((12.5*3-4/8+7.25)@9+100)"
+    plain_handler = CalcHandler(cache_size=0)
+    small_handler = CalcHandler(cache_size=0, subtree_cache_size=1, incremental=True)
+    for expression in [nested_group, "5+" + nested_group, "5+" + nested_group + "+" + GROUP,
+                       "5+" + nested_group + "+" + GROUP + "*3", "5+" + nested_group + "+" + GROUP + "*3-1"]:
+        assert describe(small_handler.run_single_exp(expression)) == describe(plain_handler.run_single_exp(expression))
+    assert small_handler._incremental_pipeline.get_reused()[0] > 0
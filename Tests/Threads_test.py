@@ -0,0 +1,37 @@
+"""
+Tests of a single calc handler that is shared between threads
+"""
+import sys
+from concurrent.futures import ThreadPoolExecutor
+import pytest
+from CalcHandler import CalcHandler
+from Benchmarks.ExpressionGenerator import ExpressionGenerator
+from Tests.conftest import describe
+
+
+@pytest.fixture
+def fast_switching():
+    # switch between the threads as often as possible so unsafe shared state would show up
+    interval = sys.getswitchinterval()
+    sys.setswitchinterval(1e-6)
+    yield
+    sys.setswitchinterval(interval)
+
+
+@pytest.mark.parametrize("cache_size", [0, 64])
+def test_shared_handler(fast_switching, cache_size):
+    corpus = ExpressionGenerator(7).build_corpus(400, 8, invalid_ratio=0.4)
+    expected = [describe(CalcHandler(cache_size=0).run_single_exp(input_exp)) for input_exp in corpus]
+    calc_handler = CalcHandler(cache_size=cache_size)
+    with ThreadPoolExecutor(8) as executor:
+        outputs = list(executor.map(calc_handler.run_single_exp, corpus * 3))
+    assert [describe(output) for output in outputs] == expected * 3
+
+
+def test_thread_executor(fast_switching):
+    from CalcParts.ParallelExecutor import ThreadExecutor
+    expressions = [f"{num}^2" for num in range(100)] + ["2+(3"]
+    with ThreadExecutor(workers=4, chunk_size=9, fail_fast=True) as executor:
+        outputs = list(executor.map(expressions))
+    assert [(index, result) for index, result, _ in outputs[:100]] == [(num, num ** 2) for num in range(100)]
+    assert outputs[100][2][0].get_error_type() == "Missing_Close_Paren_Error"
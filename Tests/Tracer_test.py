@@ -0,0 +1,61 @@
+"""
+Stage tracing tests
+"""
+from CalcHandler import CalcHandler
+from CalcParts.Tracer import StageTracer, SamplingCollector
+
+
+class RecordingTracer(StageTracer):
+    def __init__(self):
+        self.calls = []
+
+    def begin_expression(self, input_exp):
+        self.calls.append(("begin", input_exp))
+        return True
+
+    def stage_start(self, stage):
+        self.calls.append(("start", stage))
+
+    def stage_end(self, stage, elapsed_ns, token_count, post_fix_length, error_count):
+        self.calls.append(("end", stage, token_count, post_fix_length, error_count))
+
+
+def test_stage_callbacks():
+    tracer = RecordingTracer()
+    calc_handler = CalcHandler(tracer=tracer)
+    assert calc_handler.run_single_exp("2*3!") == (12, None)
+    assert tracer.calls == [("begin", "2*3!"),
+                            ("start", "tokenize"), ("end", "tokenize", 4, 0, 0),
+                            ("start", "convert"), ("end", "convert", 4, 4, 0),
+                            ("start", "eval"), ("end", "eval", 4, 4, 0)]
+
+
+def test_failed_stage_is_traced():
+    tracer = RecordingTracer()
+    calc_handler = CalcHandler(tracer=tracer)
+    calc_handler.run_single_exp("(1++2")
+    assert tracer.calls[-1] == ("end", "convert", 5, 3, 2)
+
+
+def test_sampling_collector():
+    collector = SamplingCollector(sample_every=2)
+    calc_handler = CalcHandler(cache_size=0, tracer=collector)
+    for num in range(10):
+        calc_handler.run_single_exp(f"{num}/0")
+    stats = calc_handler.get_stage_stats()
+    assert collector.get_expression_count() == 10
+    assert stats["tokenize"]["count"] == 5
+    assert stats["eval"]["errors"] == 5
+    assert abs(sum(stage["share"] for stage in stats.values()) - 1) < 1e-9
+
+
+def test_cache_hits_are_not_traced():
+    calc_handler = CalcHandler(tracer=SamplingCollector())
+    calc_handler.run_single_exp("1+1")
+    calc_handler.run_single_exp("1+1")
+    assert calc_handler.get_stage_stats()["tokenize"]["count"] == 1
+
+
+def test_default_tracer(calc_handler):
+    calc_handler.run_single_exp("1+1")
+    assert calc_handler.get_stage_stats() is None
@@ -0,0 +1,75 @@
+"""
+Variable and vectorized evaluation tests
+"""
+import pytest
+from ErrorParts.ErrorHandler import ErrorHandler
+from CalcParts.Tokenizer import Tokenizer
+from CalcParts.Converter import Converter
+from CalcParts.VectorEvaluator import VectorEvaluator
+
+
+def convert_with_variables(input_exp, variables):
+    error_handler = ErrorHandler()
+    tokenizer = Tokenizer(error_handler)
+    converter = Converter(error_handler)
+    try:
+        tokenizer.tokenize_expression(input_exp, variables)
+        converter.convert(tokenizer.get_token_stream())
+        return [token.get_token_type() for token in converter.get_post_fix_tokens()], None
+    except StopIteration:
+        return None, error_handler.get_errors()
+
+
+def test_variable_tokens():
+    post_fix, error_list = convert_with_variables("a*b@c!", ("a", "b", "c"))
+    assert error_list is None
+    assert post_fix == ["Variable", "Variable", "Variable", "!", "@", "*"]
+
+
+def test_variable_unary_minus():
+    post_fix, error_list = convert_with_variables("-x-y_1", ("x", "y_1"))
+    assert error_list is None
+    assert post_fix == ["Variable", "U-", "Variable", "-"]
+
+
+def test_unknown_variable():
+    _, error_list = convert_with_variables("a+d", ("a", "b"))
+    assert error_list[0].get_error_type() == "Invalid_Char_Error"
+
+
+def test_variable_placement():
+    _, error_list = convert_with_variables("a(b)", ("a", "b"))
+    assert error_list[0].get_error_type() == "Invalid_Before_Open_Paren_Error"
+
+
+def test_columns(calc_handler):
+    np = pytest.importorskip("numpy")
+    (values, error_codes), error_list = calc_handler.evaluate_columns(
+        "a*b@c!", {"a": np.array([1.0, 2.0, 3.0]), "b": np.array([4.0, 5.0, 6.0]), "c": np.array([3.0, 2.5, 4.0])})
+    assert error_list is None
+    assert values[0] == calc_handler.run_single_exp("1*4@3!")[0]
+    assert values[2] == calc_handler.run_single_exp("3*6@4!")[0]
+    assert np.isnan(values[1])
+    assert [VectorEvaluator.get_error_type(code) for code in error_codes] == [None, "Invalid_Factorial_Error", None]
+
+
+def test_columns_match_scalar(calc_handler):
+    np = pytest.importorskip("numpy")
+    numbers = [0.0, 1.0, 2.0, 3.5, 12.0, 123.25, 171.0]
+    for expression in ("x#", "x!", "10/x", "10%x", "(~x)^0.5", "x^x^x", "x$3&2@x", "0^(~x)"):
+        (values, error_codes), _ = calc_handler.evaluate_columns(expression, {"x": np.array(numbers)})
+        for index, num in enumerate(numbers):
+            result, error_list = calc_handler.run_single_exp(expression.replace("x", f"({num})"))
+            if error_list is None:
+                assert error_codes[index] == 0
+                # numpy's pow can differ from math.pow in the last bit
+                assert values[index] == pytest.approx(result, rel=1e-12)
+            else:
+                assert VectorEvaluator.get_error_type(error_codes[index]) == error_list[0].get_error_type()
+
+
+def test_columns_invalid_expression(calc_handler):
+    np = pytest.importorskip("numpy")
+    result, error_list = calc_handler.evaluate_columns("a+", {"a": np.array([1.0])})
+    assert result is None
+    assert error_list[0].get_error_type() == "Missing_Operands_Error"
@@ -6,3 +6,13 @@ from CalcHandler import CalcHandler
 def calc_handler():
     # fixture used in all the tests
     return CalcHandler()
+
+
+def describe(output) -> tuple:
+    # the result and the types and msgs of the errors of run_single_exp, the error objects aren't compared
+    result, error_list = output
+    return result, [(error.get_error_type(), str(error.get_msg())) for error in error_list or ()]
+
+
+def error_types(output) -> list:
+    return [error.get_error_type() for error in output[1] or ()]
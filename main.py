@@ -1,9 +1,168 @@
-from CalcHandler import CalcHandler
+import sys
+
+# every mode imports only the parts it uses so a single expression (-e) starts fast
+# the choices of the args, the same as EvalPipeline.ENGINES and NumericBackend.NAMES without importing them
+ENGINES = ("shunting_yard", "pratt")
+BACKENDS = ("float", "exact", "decimal")
+
+
+def parse_args(args=None):
+    import argparse
+    parser = argparse.ArgumentParser(description="OmegaCalc, runs the interactive calculator if -e, --batch or "
+                                                 "--serve isn't passed")
+    parser.add_argument("-e", "--exp", metavar="EXPR",
+                        help="evaluate a single expression, print its value and exit with status 0, or print its "
+                             "errors to stderr and exit with status 1 (use -e=EXPR for an expression that starts "
+                             "with -)")
+    parser.add_argument("--batch", nargs='?', const='-', metavar="FILE",
+                        help="evaluate an expression per line of FILE (stdin if FILE isn't passed or is -)")
+    parser.add_argument("-o", "--output", default='-', help="output file of the batch mode, stdout by default")
+    parser.add_argument("--format", default="jsonl", choices=("jsonl", "tsv"), help="output format of the batch mode")
+    parser.add_argument("--fail-fast", action="store_true", help="stop at the first error of every expression")
+    parser.add_argument("--workers", type=int, default=1,
+                        help="amount of worker processes of the batch mode and of the server")
+    parser.add_argument("--cache-size", type=int,
+                        help="size of the result cache of the batch mode and of the server, 0 disables it")
+    parser.add_argument("--subtree-cache", type=int, default=0, metavar="SIZE",
+                        help="amount of groups in parentheses whose values are cached between expressions")
+    parser.add_argument("--serve", type=int, metavar="PORT", help="run a json lines server on PORT")
+    parser.add_argument("--host", default="127.0.0.1", help="host of the server")
+    parser.add_argument("--engine", default="shunting_yard", choices=ENGINES,
+                        help="the front end that parses the expressions")
+    parser.add_argument("--backend", default="float", choices=BACKENDS,
+                        help="the type of the values, exact keeps whole numbers as ints and the rest as fractions")
+    parser.add_argument("--precision", type=int, default=28, help="amount of significant digits of the decimal backend")
+    parser.add_argument("--max-digits", type=float,
+                        help="reject the expressions whose values are estimated to have more digits than this")
+    parser.add_argument("--max-ops", type=int, help="max amount of numbers and operators that an expression evaluates")
+    parser.add_argument("--time-limit", type=float, metavar="SECONDS", help="max evaluation time of an expression")
+    return parser.parse_args(args)
+
+
+def get_single_expression(argv: list):
+    """
+    Func that finds the expression of -e without argparse when -e is the only arg, importing argparse takes more
+    time than evaluating the expression. The CalcHandler has the same defaults as the args
+    :param argv: the args without the name of the program
+    :return: the expression, None if the args are parsed by argparse
+    """
+    if len(argv) == 2 and argv[0] in ("-e", "--exp") and not argv[1].startswith('-'):
+        return argv[1]
+    if len(argv) == 1 and argv[0].startswith(("-e=", "--exp=")):
+        return argv[0].split('=', 1)[1]
+    return None
+
+
+def get_handler_kwargs(args) -> dict:
+    """
+    :param args:
+    :return: the args of the CalcHandler of the batch mode and of the server
+    """
+    handler_kwargs = {"fail_fast": args.fail_fast, "engine": args.engine, "subtree_cache_size": args.subtree_cache,
+                      "backend": args.backend, "precision": args.precision, "max_digits": args.max_digits,
+                      "max_operations": args.max_ops, "time_limit": args.time_limit}
+    if args.cache_size is not None:
+        handler_kwargs["cache_size"] = args.cache_size
+    return handler_kwargs
+
+
+def run_expression(args) -> int:
+    """
+    Func that evaluates the single expression of -e
+    :param args:
+    :return: the exit status, 0 if the expression has a value and 1 if it has errors
+    """
+    return evaluate_expression(args.exp, get_handler_kwargs(args))
+
+
+def evaluate_expression(input_exp: str, handler_kwargs: dict) -> int:
+    """
+    Func that evaluates a single expression and prints its value or its errors
+    :param input_exp:
+    :param handler_kwargs: the args of the CalcHandler, see get_handler_kwargs
+    :return: the exit status, 0 if the expression has a value and 1 if it has errors
+    """
+    from CalcHandler import CalcHandler
+    # a single expression doesn't use the result cache
+    handler_kwargs["cache_size"] = 0
+    result, error_list = CalcHandler(**handler_kwargs).run_single_exp(input_exp)
+    if error_list:
+        for error in error_list:
+            print(f"{error.get_error_type()}: {error.get_msg()}", file=sys.stderr)
+        return 1
+    print(result)
+    return 0
+
+
+def run_batch(args):
+    import os
+    from contextlib import nullcontext
+    from CalcParts.BatchRunner import BatchRunner
+    handler_kwargs = get_handler_kwargs(args)
+    batch_runner = BatchRunner(args.format, workers=args.workers, **handler_kwargs)
+    # stdin and stdout aren't closed at the end
+    output_context = nullcontext(sys.stdout) if args.output == '-' else open(args.output, 'w', encoding="utf-8")
+    if args.batch != '-' and os.path.isfile(args.batch):
+        # a regular file is memory mapped instead of being read line by line
+        with output_context as output_file:
+            batch_runner.run_file(args.batch, output_file)
+        return
+    input_context = nullcontext(sys.stdin) if args.batch == '-' else \
+        open(args.batch, encoding="utf-8", errors="replace")
+    with input_context as input_file, output_context as output_file:
+        batch_runner.run(input_file, output_file)
+
+
+def run_server(args):
+    import asyncio
+    from CalcParts.CalcServer import CalcServer
+    handler_kwargs = get_handler_kwargs(args)
+    handler_kwargs.setdefault("cache_size", CalcServer.DEFAULT_CACHE_SIZE)
+    # a single worker runs in the event loop
+    server = CalcServer(args.host, args.serve, workers=args.workers if args.workers > 1 else 0, **handler_kwargs)
+
+    async def serve():
+        await server.start()
+        host, port = server.get_address()
+        print(f"Serving on {host}:{port}", flush=True)
+        await server.serve_forever()
+
+    try:
+        asyncio.run(serve())
+    except KeyboardInterrupt:
+        print("\nThe server was closed, goodbye")
+
+
+def create_interactive_handler(args):
+    """
+    Func that creates the CalcHandler of the interactive loop, the stages are traced for the stats command and the
+    edited expressions are incremental when the engine can resume (see IncrementalPipeline)
+    :param args:
+    :return: the CalcHandler
+    """
+    from CalcHandler import CalcHandler
+    from CalcParts.Tracer import SamplingCollector
+    return CalcHandler(fail_fast=args.fail_fast, tracer=SamplingCollector(),
+                       incremental=args.engine == "shunting_yard", engine=args.engine,
+                       subtree_cache_size=args.subtree_cache, backend=args.backend, precision=args.precision,
+                       max_digits=args.max_digits, max_operations=args.max_ops, time_limit=args.time_limit)
 
 
 def main():
+    input_exp = get_single_expression(sys.argv[1:])
+    if input_exp is not None:
+        sys.exit(evaluate_expression(input_exp, {}))
+    args = parse_args()
+    if args.exp is not None:
+        sys.exit(run_expression(args))
+    if args.batch is not None:
+        run_batch(args)
+        return
+    if args.serve is not None:
+        run_server(args)
+        return
     # create the calc Handler and run the calc
-    Calculator = CalcHandler()
+    Calculator = create_interactive_handler(args)
     Calculator.run_calc()
 
 